@@ -7,7 +7,11 @@ NAME
 
 SYNOPSIS
 	netSort metadataFile...
-	netSort [group <src | dest | connect | proto>] [sort <packets | bytes>] [order <low | high>] metadataFile...
+	netSort [group <src | dest | connect | proto | srcport | destport | flow | biflow | src-prefix N[/M] | dest-prefix N[/M] | subnet FILE | dest-subnet FILE | all>] [sort <packets | bytes | peers>] [order <low | high>] [top N] [stream] [jobs N] [input <csv | csv-header | pcap | pcapng>]
+		[output <tsv | tsv-simple | csv | json>] [data <sort | packets | bytes | peers>[,...]] [stats <- | FILE>] [profile FILE] metadataFile...
+	netSort window SECONDS [slide SECONDS] [group ...] [sort ...] [order ...] [top N] [follow] metadataFile...
+	netSort follow [interval SECONDS] [batch N] [group ...] [sort ...] [order ...] [top N] [input <csv | csv-header>] [metadataFile | -]
+	netSort snapshot metadataFile...
 	netSort help
 
 DESCRIPTION
@@ -22,22 +26,139 @@ DESCRIPTION
 		dest : Group packets by destination address.
 		connect : Group packets by source and destination pairing permutations, a -> b is separate from b -> a.
 		proto : Group packets by protocol.
+		srcport : Group packets by source port, packets without ports are grouped with an empty port.
+		destport : Group packets by destination port, as srcport.
+		flow : Group packets by source, destination, source port, destination port, and protocol, as 'a:p -> b:q proto'.
+			IPv6 addresses are bracketed, '[a]:p', empty ports are omitted.
+		biflow : Group packets by flow regardless of direction, as 'a:p <-> b:q proto' with the lesser (address, port) first.
+		src-prefix N[/M] : Group packets by network of source address, N bits of IPv4 and M bits of IPv6 addresses.
+			M defaults to N, and N is then at most 32 for IPv4, e.g. 'src-prefix 24/48'. Other addresses are their own group.
+		dest-prefix N[/M] : Group packets by network of destination address, as src-prefix.
+		subnet FILE : Group packets by longest matching subnet of source address, subnets read from FILE.
+			FILE has one network in CIDR notation per line, optionally followed by its group name, '#' starts a comment line.
+			Addresses in no subnet are grouped as 'unmatched'. Match cost does not grow with the number of subnets.
+		dest-subnet FILE : Group packets by longest matching subnet of destination address, as subnet.
+		all : Group packets by each of src, dest, connect, and proto in a single pass, output one report per group.
 
 	sort : Sort packets per below argument, repeats overwrite previous setting.
 		packets : (default) Sort by number of packets for group.
 		bytes : Sort by total bytes sent for group.
+		peers : Sort by estimated number of distinct peers of group, destinations of src and srcport, sources of dest, destport, and proto.
+			Not for connect, flow, and biflow, nor with 'window' or 'approx'.
+			Prefix and subnet groups count peers as their source or destination address group does.
+			Estimated per group with a HyperLogLog sketch of fixed size, about 3% error.
 
 	order : Order packet sorting per below argument, repeats overwrite previous setting.
 		low : (default) Order output numerical low to high (i.e. normal sorting).
 		high : Order output numerical high to low (i.e. reverse sorting).
 
+	top : Output only the first N groups per sort and order, selected without sorting all groups.
+		N : Positive integer number of groups.
+
+	stream : Fold each packet into its group as it is read instead of retaining raw packets, memory scales with number of groups.
+
+	jobs : Parse and aggregate metadataFile byte ranges in N worker processes, implies stream.
+		N : Positive integer number of worker processes.
+
+	approx : Find the largest groups per 'sort' in fixed memory with a Space-Saving summary of 1/EPSILON groups, implies stream.
+		Each output line gets a third column, the error by which its 'sort' count may be overestimated, at most EPSILON of the total.
+		Any group above EPSILON of the total is output, use 'order high' and 'top N' for the heavy hitters.
+		Not with prefix or subnet groups, summarized address groups can not be rolled up.
+		EPSILON : Error bound, number between 0 and 1 exclusive.
+
+	input : Read metadataFile per below argument, repeats overwrite previous setting.
+		Without 'input', pcap and pcapng files are detected by magic bytes, other files are read as csv.
+		Files compressed with gzip, bzip2, or xz are detected by magic bytes and decompressed while read, in any format.
+		csv : (default) CSV without header line.
+		csv-header : CSV with header line.
+		pcap : Packet capture (libpcap), decoded to the CSV fields, length is the original frame length.
+		pcapng : Packet capture next generation, as pcap.
+
+	output : Output results per below argument, repeats overwrite previous setting.
+		Results are rendered in batches, one write per batch. Report lines starting with '#' precede results in TSV formats, csv and json rows instead start with columns naming their group mode (mode), window (start, end), or report (report), csv has one header row.
+		tsv : (default) Tab separated group and data columns.
+		tsv-simple : As tsv, preceded by a header line of column names.
+		csv : CSV with header line of column names, groups quoted as needed.
+		json : JSON lines, one object per group, keyed by column name.
+
+	data : Output data columns per below comma separated arguments after the group, in order packets, bytes, peers, repeats overwrite previous setting.
+		Approximate results add the error column last.
+		sort : (default) Data sorted by.
+		packets : Number of packets of group.
+		bytes : Total bytes of group.
+		peers : Estimated number of distinct peers of group, as 'sort peers', not with 'window'.
+
+	window : Output a report per window of relative time instead of one report, each preceded by '# window [start, end)'.
+		Windows are reported as they close, memory holds only the groups of open windows, windows without packets are skipped.
+		Each metadataFile is windowed on its own, in relative time order, pcap and pcapng are not supported, nor 'approx'.
+		SECONDS : Positive number of seconds per window, tumbling windows unless 'slide' is given.
+
+	slide : Start a sliding window every SECONDS, requires 'window' and SECONDS evenly dividing its SECONDS.
+		SECONDS : Positive number of seconds between window starts.
+
+	follow : Follow metadataFile as it grows, or standard input if '-' or no metadataFile, and output a report periodically.
+		Packets are folded into their groups as they arrive (as stream), each report is the current output preceded by '# report R, P packets'.
+		Reports repeat every 'interval' seconds and every 'batch' packets, every second if neither is given, and once more at end of standard input.
+		With 'approx', groups are kept in its fixed size summary.
+
+	interval : Seconds between follow reports.
+		SECONDS : Positive number of seconds.
+
+	batch : Packets between follow reports.
+		N : Positive integer number of packets.
+
+	snapshot : Only write snapshot sidecar of each metadataFile, no report.
+		A snapshot (metadataFile.nsnap) holds the parsed packets in binary form, later runs load it instead of parsing metadataFile.
+		Snapshots are also written on first parse, and ignored once metadataFile changes size or modification time.
+
+	stats : Record statistics of the run and write them when it ends, also when it fails.
+		Wall seconds of each stage (parse, group, sort, output) and in total, lines parsed, malformed lines, packets, groups, and peak memory.
+		Malformed CSV lines, short or with a relTime or length that is not a number, are counted and skipped instead of aborting the run.
+		Streamed packets are grouped while parsed, and the NumPy and incremental engines sort while grouping, their time counts as the earlier stage.
+		Packets loaded from snapshots are not lines parsed.
+		- : Write statistics to standard error, one tab separated name and value per line.
+		FILE : Write statistics to FILE as a JSON object.
+
+	profile : Run under cProfile and write the profile to FILE, read with 'python -m pstats FILE'.
+		FILE : Name of profile file.
+
 	help : Print this help file.
 """
 
 
 # Required imports
+import array  # Array Module: array()
+import bz2  # Bzip2 Module: open()
+import cProfile  # C Profiler Module: Profile()
+import collections  # Collections Module: Counter()
+import csv  # CSV Module: writer()
 import enum  # Enumeration Module: Enum()
-import sys   # System Module: argv
+import gzip  # Gzip Module: open()
+import hashlib  # Hash Library Module: blake2b()
+import heapq  # Heap Queue Module: nlargest(), nsmallest()
+import io  # I/O Module: BufferedReader()
+import ipaddress  # IP Address Module: ip_address()
+import itertools  # Iteration Tools Module: islice()
+import json  # JSON Module: dumps()
+import lzma  # LZMA Module: open()
+import math  # Math Module: floor()
+import mmap  # Memory Map Module: mmap()
+import multiprocessing  # Multiprocessing Module: Pool()
+import os  # Operating System Module: cpu_count(), fstat(), path.getsize()
+import operator  # Operator Module: attrgetter()
+import select  # Select Module: select()
+import struct  # Structure Module: Struct()
+import socket  # Socket Module: inet_ntop()
+import sys   # System Module: argv, byteorder
+import time  # Time Module: monotonic(), perf_counter(), sleep()
+try :
+	import numpy  # NumPy Module (optional): unique(), bincount(), lexsort()
+except ImportError :
+	numpy = None
+try :
+	import resource  # Resource Module (optional, Unix only): getrusage()
+except ImportError :
+	resource = None
 
 
 # Declare Required Constants (Immutables)
@@ -50,14 +171,32 @@ GROUP_BY_SRC_ADDR    = 0o01
 GROUP_BY_DEST_ADDR   = 0o02
 GROUP_BY_CONNECT     = 0o03
 GROUP_BY_PROTO       = 0o04
+GROUP_BY_SRC_PREFIX  = 0o05
+GROUP_BY_DEST_PREFIX = 0o06
+GROUP_BY_SRC_SUBNET  = 0o07
+GROUP_BY_DEST_SUBNET = 0o10
+GROUP_BY_SRC_PORT    = 0o11
+GROUP_BY_DEST_PORT   = 0o12
+GROUP_BY_FLOW        = 0o13
+GROUP_BY_BIFLOW      = 0o14
+GROUP_BY_ALL         = 0o16
 GROUP_BY_EXTEND_01   = 0o17
 GROUP_BY_DEFAULT     = GROUP_BY_SRC_ADDR
+GROUP_BY_ALL_MODES   = (GROUP_BY_SRC_ADDR, GROUP_BY_DEST_ADDR, GROUP_BY_CONNECT, GROUP_BY_PROTO)  # Served by GROUP_BY_ALL
+GROUP_BY_ROLLUPS     = {  # Rolled up group mode -> address group mode aggregated and rolled up from
+	GROUP_BY_SRC_PREFIX : GROUP_BY_SRC_ADDR
+	, GROUP_BY_DEST_PREFIX : GROUP_BY_DEST_ADDR
+	, GROUP_BY_SRC_SUBNET : GROUP_BY_SRC_ADDR
+	, GROUP_BY_DEST_SUBNET : GROUP_BY_DEST_ADDR
+}
+GROUP_BY_FLOWS       = (GROUP_BY_FLOW, GROUP_BY_BIFLOW)  # Keyed by (src, dest, src port, dest port, proto), bidirectional flows canonically ordered
 # Sort - Value Style
 # 11|11 0|000
 SORT_MASK        = 0o360  # Bits 4-7
 SORT_USE_DEFAULT = 0o000
 SORT_PACKETS     = 0o020
 SORT_BYTES       = 0o040
+SORT_PEERS       = 0o060
 SORT_EXTEND_01   = 0o360
 SORT_DEFAULT     = SORT_PACKETS
 # Order - Value Style
@@ -75,16 +214,20 @@ IN_FORMAT_USE_DEFAULT   = 0o000000
 IN_FORMAT_CSV_HEADER    = 0o010000
 IN_FORMAT_CSV_NO_HEADER = 0o020000
 IN_FORMAT_FILE_OBJ      = 0o030000
+IN_FORMAT_PCAP          = 0o040000
+IN_FORMAT_PCAPNG        = 0o100000
 IN_FORMAT_EXTEND_01     = 0o170000
 IN_FORMAT_DEFAULT       = IN_FORMAT_CSV_NO_HEADER
 # Output Data - Flag Style
+# 1| 000|0 00|00 0|000| 000|0 00|00 0|000 (bit 24, see OUT_DATA_PEERS)
 # 11|11 0|000| 000|0 00|00 0|000
-OUT_DATA_MASK        = 0o3600000  # Bits 16-19
-OUT_DATA_USE_DEFAULT = 0o0000000
-OUT_DATA_TRACK_SORT  = 0o0200000
-OUT_DATA_PACKETS     = 0o0400000
-OUT_DATA_BYTES       = 0o1000000
-OUT_DATA_EXTEND_01   = 0o2000000
+OUT_DATA_MASK        = 0o103600000  # Bits 16-19 and 24
+OUT_DATA_USE_DEFAULT = 0o000000000
+OUT_DATA_TRACK_SORT  = 0o000200000
+OUT_DATA_PACKETS     = 0o000400000
+OUT_DATA_BYTES       = 0o001000000
+OUT_DATA_EXTEND_01   = 0o002000000
+OUT_DATA_PEERS       = 0o100000000  # Bit 24, past OUT_FORMAT_MASK, bits 16-19 are taken
 OUT_DATA_DEFAULT     = OUT_DATA_TRACK_SORT
 # Output Format - Value Style
 # 111|1 00|00 0|000| 000|0 00|00 0|000
@@ -93,8 +236,72 @@ OUT_FORMAT_USE_DEFAULT = 0o00000000
 OUT_FORMAT_TSV_HUMAN   = 0o04000000
 OUT_FORMAT_TSV_SIMPLE  = 0o10000000
 OUT_FORMAT_CSV         = 0o14000000
+OUT_FORMAT_JSON_LINES  = 0o20000000
 OUT_FORMAT_EXTEND_01   = 0o74000000
 OUT_FORMAT_DEFAULT     = OUT_FORMAT_TSV_HUMAN
+# Output Writer
+OUT_DATA_COLUMNS       = ( (OUT_DATA_PACKETS, "packets", "count"), (OUT_DATA_BYTES, "bytes", "bytes"), (OUT_DATA_PEERS, "peers", "peers") )  # Output data flag, column name, ProcPacket attribute, in column order
+SORT_OUT_DATA          = {SORT_PACKETS : OUT_DATA_PACKETS, SORT_BYTES : OUT_DATA_BYTES, SORT_PEERS : OUT_DATA_PEERS}  # Sort mode -> output data flag of OUT_DATA_TRACK_SORT
+OUTPUT_BATCH_ROWS      = 0o20000  # Result rows rendered per write
+# Result Cache
+RESULT_CACHE_SIZE  = 16  # Processed results retained per ProcPackets
+# Snapshot Sidecar
+SNAPSHOT_SUFFIX    = ".nsnap"     # Appended to input file name
+SNAPSHOT_MAGIC     = b"NETSORT\x00"
+SNAPSHOT_VERSION   = 2
+SNAPSHOT_HEADER    = struct.Struct("<8sHHIqqQI")  # Magic, version, byte order, format, source size, source mtime (ns), packets, strings
+SNAPSHOT_COLUMNS   = ("ID", "relTime", "srcAddr", "destAddr", "srcPort", "destPort", "proto", "bytes")  # RawPacketColumns attributes, in file order
+# Prefix and Subnet Groups
+PREFIX_DEFAULT          = (24, 48)  # Prefix length of IPv4, IPv6 address groups
+PREFIX_STRIDE_BITS      = 8  # Address bits matched per PrefixTrie node
+SUBNET_UNMATCHED        = "unmatched"  # Group of addresses in no subnet
+# Distinct Peers
+HLL_PRECISION           = 10  # Register index bits of HyperLogLog hash, about 3.3% standard error
+HLL_REGISTERS           = 1 << HLL_PRECISION
+HLL_SPARSE_MAX          = 16  # Registers held sparse until exceeded, groups with few peers stay small
+PEER_COLUMNS            = {  # Group mode -> (group column, peer column) of RawPacketColumns
+	GROUP_BY_SRC_ADDR : ("srcAddr", "destAddr")
+	, GROUP_BY_DEST_ADDR : ("destAddr", "srcAddr")
+	, GROUP_BY_PROTO : ("proto", "srcAddr")
+	, GROUP_BY_SRC_PORT : ("srcPort", "destAddr")
+	, GROUP_BY_DEST_PORT : ("destPort", "srcAddr")
+}
+# Approximate Heavy Hitters
+APPROX_BATCH_PACKETS    = 0o200000  # Packets aggregated exactly before merging into Space-Saving summary
+# Time Windows
+WINDOW_BATCH_LINES      = 0o200000  # Packet lines folded into a pane per aggregation call
+# Follow Mode
+FOLLOW_READ_BYTES       = 0o4000000  # 1 MiB maximum read per poll
+FOLLOW_POLL_SECONDS     = 0.1  # Wait for new input before checking report deadline
+FOLLOW_INTERVAL_DEFAULT = 1.0  # Seconds between reports if neither interval nor batch given
+# Compressed Input
+COMPRESSION_MAGIC       = ( (b"\x1f\x8b", gzip), (b"BZh", bz2), (b"\xfd7zXZ\x00", lzma) )  # File magic -> decompression module
+COMPRESSION_MAGIC_BYTES = 6
+DECOMPRESS_BUFFER_BYTES = 0o4000000  # 1 MiB read buffer
+# Packet Capture Decoding
+PCAP_MAGIC         = {  # File magic -> (byte order, timestamp fraction per second)
+	b"\xd4\xc3\xb2\xa1" : ("<", 1000000)
+	, b"\xa1\xb2\xc3\xd4" : (">", 1000000)
+	, b"\x4d\x3c\xb2\xa1" : ("<", 1000000000)
+	, b"\xa1\xb2\x3c\x4d" : (">", 1000000000)
+}
+PCAPNG_MAGIC       = b"\x0a\x0d\x0d\x0a"  # Section Header Block type
+LINKTYPE_ETHERNET  = 1
+LINKTYPE_RAW       = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4      = 228
+LINKTYPE_IPV6      = 229
+ETHERTYPE_IPV4     = 0x0800
+ETHERTYPE_ARP      = 0x0806
+ETHERTYPE_IPV6     = 0x86dd
+ETHERTYPE_VLAN     = (0x8100, 0x88a8, 0x9100)
+IP_PROTOCOL_NAMES  = {1 : "ICMP", 2 : "IGMP", 6 : "TCP", 17 : "UDP", 47 : "GRE", 50 : "ESP", 51 : "AH", 58 : "ICMPv6", 132 : "SCTP"}
+IPV6_EXTENSIONS    = (0, 43, 60)  # Hop-by-Hop, Routing, Destination Options, length in 8 octet units
+# Run Statistics
+STATS_STAGES       = ("parse", "group", "sort", "output")  # Stages timed by RunStats, in run order
+# Parallel Ingestion
+CHUNK_BYTES_MIN    = 0o40000000  # Smallest byte range parsed by one worker, 8 MiB
+CHUNKS_PER_JOB     = 4           # Byte ranges per worker process, balances uneven ranges
 
 
 # Declare Required Variables (Mutables)
@@ -149,12 +356,17 @@ class RawPacket :
 	def fromCSV(
 			self
 			, lineCSV
+			, mode = None
 		) :
 		"""
 		Description: Populate RawPacket from CSV representation, CSV field indexing per SPLTcsv enumeration.
 		Arguments:
 			lineCSV : Single line packet fields in CSV format
+			mode : Populate only fields needed per mode, see neededFields(), all fields if None
 		"""
+		if mode is not None :
+			self.fromCSVFields(lineCSV, neededFields(mode))
+			return
 		try :
 			fields = lineCSV.split(",")
 		except :
@@ -169,6 +381,39 @@ class RawPacket :
 		self.bytes    = int( fields[SPLTcsv.length.value].strip('"') )
 		self.info     = fields[SPLTcsv.info.value].strip('"')
 
+	def fromCSVFields(
+			self
+			, lineCSV
+			, fieldIndices
+		) :
+		"""
+		Description: Populate only listed fields of RawPacket from CSV representation, line split only up to last listed field.
+		Arguments:
+			lineCSV : Single line packet fields in CSV format
+			fieldIndices : Ascending sequence of SPLTcsv field values to populate
+		"""
+		fields = lineCSV.split(",", fieldIndices[-1] + 1)
+		for fieldIndex in fieldIndices :
+			field = fields[fieldIndex].strip('"')
+			if fieldIndex == SPLTcsv.frame.value :
+				self.ID = field
+			elif fieldIndex == SPLTcsv.relTime.value :
+				self.relTime = float(field)
+			elif fieldIndex == SPLTcsv.srcAddr.value :
+				self.srcAddr = field
+			elif fieldIndex == SPLTcsv.destAddr.value :
+				self.destAddr = field
+			elif fieldIndex == SPLTcsv.srcPort.value :
+				self.srcPort = field
+			elif fieldIndex == SPLTcsv.destPort.value :
+				self.destPort = field
+			elif fieldIndex == SPLTcsv.protocol.value :
+				self.proto = field
+			elif fieldIndex == SPLTcsv.length.value :
+				self.bytes = int(field)
+			elif fieldIndex == SPLTcsv.info.value :
+				self.info = field
+
 	def toCSV(
 			self
 		) :
@@ -192,6 +437,577 @@ class RawPacket :
 		            + "," + str(self.info)
 		return packetCSV
 
+class RawPacketColumns :
+	"""
+	Description: Columnar store of raw packets, one typed array per RawPacket attribute.
+	Addresses, ports, and protocols are interned, columns hold integer codes into a shared string table.
+	Information fields are not retained.
+	Frame numbers are packed while all are integers, else held as a list, see appendFrame().
+	"""
+
+	def __init__(
+			self
+		) :
+		"""
+		Description: Initialize an empty columnar store.
+		"""
+		self.ID = array.array("q")
+		self.relTime = array.array("d")
+		self.srcAddr = array.array("i")
+		self.destAddr = array.array("i")
+		self.srcPort = array.array("i")
+		self.destPort = array.array("i")
+		self.proto = array.array("i")
+		self.bytes = array.array("q")
+		self.strings = []
+		self.stringCodes = {}
+		self.bytesCodes = {}  # Undecoded string -> code, see extendMapped()
+
+	def __getitem__(
+			self
+			, index
+		) :
+		"""
+		Description: Return RawPacket view of packet at index.
+		Arguments:
+			index : Packet index, insertion order
+		"""
+		packet = RawPacket()
+		packet.ID = str(self.ID[index])
+		packet.relTime = self.relTime[index]
+		packet.srcAddr = self.strings[self.srcAddr[index]]
+		packet.destAddr = self.strings[self.destAddr[index]]
+		packet.srcPort = self.strings[self.srcPort[index]]
+		packet.destPort = self.strings[self.destPort[index]]
+		packet.proto = self.strings[self.proto[index]]
+		packet.bytes = self.bytes[index]
+		packet.info = None
+		return packet
+
+	def __len__(
+			self
+		) :
+		"""
+		Description: Number of packets in store.
+		"""
+		return len(self.bytes)
+
+	def aggregate(
+			self
+			, modeGroup
+			, start = 0
+		) :
+		"""
+		Description: Aggregate packets into group table of group mode.
+		Arguments:
+			modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT)
+			start : Index of first packet to aggregate
+		Returns:
+			[dict] : Dictionary of group to [count, bytes] list, flow groups are flow keys, see flowKey().
+		"""
+		# Select key column(s) of interned codes per group mode
+		columns = self
+		if modeGroup == GROUP_BY_SRC_ADDR :
+			keys = columns.srcAddr[start:]
+		elif modeGroup == GROUP_BY_DEST_ADDR :
+			keys = columns.destAddr[start:]
+		elif modeGroup == GROUP_BY_CONNECT :
+			keys = list(zip(columns.srcAddr[start:], columns.destAddr[start:]))
+		elif modeGroup == GROUP_BY_PROTO :
+			keys = columns.proto[start:]
+		elif modeGroup == GROUP_BY_SRC_PORT :
+			keys = columns.srcPort[start:]
+		elif modeGroup == GROUP_BY_DEST_PORT :
+			keys = columns.destPort[start:]
+		elif modeGroup in GROUP_BY_FLOWS :
+			keys = list(zip(columns.srcAddr[start:], columns.destAddr[start:], columns.srcPort[start:], columns.destPort[start:], columns.proto[start:]))
+		# Traverse and group raw packets by code
+		counts = collections.Counter(keys)
+		byteSums = dict.fromkeys(counts, 0)
+		for key, packetBytes in zip(keys, columns.bytes[start:]) :
+			byteSums[key] += packetBytes
+		# Render group strings from codes, flows are keyed by string tuples, see flowKey()
+		strings = columns.strings
+		groupTable = {}
+		for key, count in counts.items() :
+			if modeGroup == GROUP_BY_CONNECT :
+				group = strings[key[0]] + " -> " + strings[key[1]]
+			elif modeGroup in GROUP_BY_FLOWS :
+				group = flowKey([strings[code] for code in key], modeGroup == GROUP_BY_BIFLOW)
+			else :
+				group = strings[key]
+			totals = groupTable.get(group)
+			if totals is None :
+				groupTable[group] = [count, byteSums[key]]
+			else :  # Both directions of a bidirectional flow
+				totals[0] += count
+				totals[1] += byteSums[key]
+		return groupTable
+
+	def aggregatePeers(
+			self
+			, modeGroup
+			, start = 0
+		) :
+		"""
+		Description: Aggregate distinct peers of packets into HyperLogLog sketch per group of group mode, see PEER_COLUMNS.
+		Arguments:
+			modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT)
+			start : Index of first packet to aggregate
+		Returns:
+			[dict] : Dictionary of group to HyperLogLog.
+		"""
+		if modeGroup not in PEER_COLUMNS :
+			raise ValueError("(netSort) ERROR: Peers are not defined for group mode.")
+		groupColumn, peerColumn = PEER_COLUMNS[modeGroup]
+		strings = self.strings
+		peerHashes = {}
+		sketches = {}
+		# Each distinct group and peer pair hashed into sketch once
+		for key, peer in set( zip(getattr(self, groupColumn)[start:], getattr(self, peerColumn)[start:]) ) :
+			peerHash = peerHashes.get(peer)
+			if peerHash is None :
+				peerHash = peerHashes[peer] = HyperLogLog.hashValue(strings[peer])
+			sketch = sketches.get(key)
+			if sketch is None :
+				sketch = sketches[key] = HyperLogLog()
+			sketch.addHashed(*peerHash)
+		return {strings[key] : sketch for key, sketch in sketches.items()}
+
+	def extendRecords(
+			self
+			, records
+		) :
+		"""
+		Description: Append packets from decoded records, see readPacketRecords().
+		Arguments:
+			records : Iterable of packet tuples in SPLTcsv field order, information field excluded
+		"""
+		intern = self.intern
+		for frame, relTime, srcAddr, destAddr, srcPort, destPort, proto, length in records :
+			self.ID.append(frame)
+			self.relTime.append(relTime)
+			self.srcAddr.append( intern(srcAddr) )
+			self.destAddr.append( intern(destAddr) )
+			self.srcPort.append( intern(srcPort) )
+			self.destPort.append( intern(destPort) )
+			self.proto.append( intern(proto) )
+			self.bytes.append(length)
+
+	def extendColumns(
+			self
+			, other
+		) :
+		"""
+		Description: Append all packets of other columnar store, interned codes of other are remapped to this store.
+		Arguments:
+			other : RawPacketColumns instance
+		"""
+		if len(self) == 0 :
+			for columnName in SNAPSHOT_COLUMNS :
+				setattr(self, columnName, getattr(other, columnName))
+			self.strings = other.strings
+			self.stringCodes = other.stringCodes
+			self.bytesCodes = other.bytesCodes
+			return
+		codeMap = [self.intern(string) for string in other.strings]
+		if isinstance(other.ID, list) and not isinstance(self.ID, list) :
+			self.ID = list(self.ID)
+		self.ID.extend(other.ID)
+		self.relTime.extend(other.relTime)
+		for columnName in ("srcAddr", "destAddr", "srcPort", "destPort", "proto") :
+			getattr(self, columnName).extend( array.array("i", map(codeMap.__getitem__, getattr(other, columnName))) )
+		self.bytes.extend(other.bytes)
+
+	def appendCSV(
+			self
+			, lineCSV
+		) :
+		"""
+		Description: Append packet from CSV representation, CSV field indexing per SPLTcsv enumeration.
+		Arguments:
+			lineCSV : Single line packet fields in CSV format
+		"""
+		fields = lineCSV.split(",", SPLTcsv.length.value + 1)  # Information field is not retained
+		frame = fields[SPLTcsv.frame.value].strip('"')
+		try :
+			self.ID.append( int(frame) )
+		except ValueError :
+			self.appendFrame(frame)
+		self.relTime.append( float( fields[SPLTcsv.relTime.value].strip('"') ) )
+		self.srcAddr.append( self.intern( fields[SPLTcsv.srcAddr.value].strip('"') ) )
+		self.destAddr.append( self.intern( fields[SPLTcsv.destAddr.value].strip('"') ) )
+		self.srcPort.append( self.intern( fields[SPLTcsv.srcPort.value].strip('"') ) )
+		self.destPort.append( self.intern( fields[SPLTcsv.destPort.value].strip('"') ) )
+		self.proto.append( self.intern( fields[SPLTcsv.protocol.value].strip('"') ) )
+		self.bytes.append( int( fields[SPLTcsv.length.value].strip('"') ) )
+
+	def extendMapped(
+			self
+			, packetLines
+		) :
+		"""
+		Description: Append packets from bytes CSV representation, see mapPacketLines().
+		Addresses, ports, and protocols are interned undecoded, each distinct string is decoded once.
+		Arguments:
+			packetLines : Iterable of single line packet fields in CSV format, bytes
+		"""
+		bytesCodes = self.bytesCodes
+		keyColumns = ( (SPLTcsv.srcAddr.value, self.srcAddr), (SPLTcsv.destAddr.value, self.destAddr), (SPLTcsv.srcPort.value, self.srcPort), (SPLTcsv.destPort.value, self.destPort), (SPLTcsv.protocol.value, self.proto) )
+		frameField = SPLTcsv.frame.value
+		relTimeField = SPLTcsv.relTime.value
+		lengthField = SPLTcsv.length.value
+		for packetLine in packetLines :
+			fields = packetLine.split(b",", lengthField + 1)  # Information field is not retained
+			frame = fields[frameField].strip(b'"')
+			try :
+				self.ID.append( int(frame) )
+			except ValueError :
+				self.appendFrame( frame.decode() )
+			self.relTime.append( float( fields[relTimeField].strip(b'"') ) )
+			for keyField, keyColumn in keyColumns :
+				key = fields[keyField].strip(b'"')
+				code = bytesCodes.get(key)
+				if code is None :
+					code = self.intern( key.decode() )
+					bytesCodes[key] = code
+				keyColumn.append(code)
+			self.bytes.append( int( fields[lengthField].strip(b'"\r\n ') ) )
+
+	def appendFrame(
+			self
+			, frame
+		) :
+		"""
+		Description: Append frame number that is not an integer, the packed frame number column is converted to a list first.
+		Arguments:
+			frame : Frame number string
+		"""
+		if not isinstance(self.ID, list) :
+			self.ID = list(self.ID)
+		self.ID.append(frame)
+
+	def clear(
+			self
+		) :
+		"""
+		Description: Remove all packets and interned strings.
+		"""
+		self.__init__()
+
+	def intern(
+			self
+			, string
+		) :
+		"""
+		Description: Return integer code of string, adding to string table if new.
+		Arguments:
+			string : Address, port, or protocol string
+		"""
+		code = self.stringCodes.get(string)
+		if code is None :
+			code = len(self.strings)
+			self.stringCodes[string] = code
+			self.strings.append(string)
+		return code
+
+class HyperLogLog :
+	"""
+	Description: HyperLogLog sketch of distinct values, at most HLL_REGISTERS bytes regardless of values added, mergeable.
+	"""
+
+	def __init__(
+			self
+		) :
+		"""
+		Description: Initialize an empty sketch, registers sparse.
+		"""
+		self.registers = {}  # Register index -> rank while sparse, bytearray once dense
+
+	@staticmethod
+	def hashValue(
+			value
+		) :
+		"""
+		Description: Return (register index, rank) of value, deterministic across processes and runs.
+		Arguments:
+			value : String to hash
+		"""
+		hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+		remainingBits = 64 - HLL_PRECISION
+		remaining = hashed & ((1 << remainingBits) - 1)
+		return hashed >> remainingBits, remainingBits - remaining.bit_length() + 1
+
+	def add(
+			self
+			, value
+		) :
+		"""
+		Description: Add value to sketch.
+		Arguments:
+			value : String to add
+		"""
+		self.addHashed( *self.hashValue(value) )
+
+	def addHashed(
+			self
+			, index
+			, rank
+		) :
+		"""
+		Description: Add hashed value to sketch, see hashValue().
+		Arguments:
+			index : Register index
+			rank : Rank of hash
+		"""
+		registers = self.registers
+		if isinstance(registers, dict) :
+			if rank > registers.get(index, 0) :
+				registers[index] = rank
+				if len(registers) > HLL_SPARSE_MAX :
+					self.__densify()
+		elif rank > registers[index] :
+			registers[index] = rank
+
+	def merge(
+			self
+			, other
+		) :
+		"""
+		Description: Merge other sketch into sketch, union of their values.
+		Arguments:
+			other : HyperLogLog sketch
+		"""
+		if isinstance(other.registers, dict) :
+			for index, rank in other.registers.items() :
+				self.addHashed(index, rank)
+			return
+		if isinstance(self.registers, dict) :
+			self.__densify()
+		self.registers = bytearray( map(max, self.registers, other.registers) )
+
+	def count(
+			self
+		) :
+		"""
+		Description: Return estimated number of distinct values added.
+		"""
+		registers = self.registers
+		if isinstance(registers, dict) :
+			rankCounts = collections.Counter( registers.values() )
+			rankCounts[0] = HLL_REGISTERS - len(registers)
+		else :
+			rankCounts = collections.Counter(registers)
+		harmonicSum = sum(count * 2.0 ** -rank for rank, count in rankCounts.items())
+		estimate = (0.7213 / (1 + 1.079 / HLL_REGISTERS)) * HLL_REGISTERS * HLL_REGISTERS / harmonicSum
+		if (estimate <= 2.5 * HLL_REGISTERS) and rankCounts[0] :
+			estimate = HLL_REGISTERS * math.log(HLL_REGISTERS / rankCounts[0])  # Linear counting for small cardinality
+		return round(estimate)
+
+	def __densify(
+			self
+		) :
+		"""
+		Description: Convert sparse registers to dense registers.
+		"""
+		registers = bytearray(HLL_REGISTERS)
+		for index, rank in self.registers.items() :
+			registers[index] = rank
+		self.registers = registers
+
+class PrefixTrie :
+	"""
+	Description: Longest prefix match of IP addresses against labelled networks, multibit trie of PREFIX_STRIDE_BITS per node.
+	Prefixes are expanded to the stride boundary when inserted, so a match visits at most one node per stride however many networks are held.
+	"""
+
+	def __init__(
+			self
+		) :
+		"""
+		Description: Initialize an empty trie, no address matches.
+		"""
+		self.roots = {4 : ({}, {}), 6 : ({}, {})}  # IP version -> node of (stride value -> child node, stride value -> (prefix length, label))
+		self.defaults = {4 : None, 6 : None}  # IP version -> label of /0 network
+		self.networks = 0
+
+	def __len__(
+			self
+		) :
+		"""
+		Description: Number of networks inserted.
+		"""
+		return self.networks
+
+	def insert(
+			self
+			, network
+			, label = None
+		) :
+		"""
+		Description: Insert network with label, a network inserted again is relabelled.
+		Arguments:
+			network : ipaddress.IPv4Network or ipaddress.IPv6Network
+			label : Group label of addresses matching network, network in CIDR notation if None
+		"""
+		if label is None :
+			label = str(network)
+		self.networks += 1
+		prefixLength = network.prefixlen
+		if prefixLength == 0 :
+			self.defaults[network.version] = label
+			return
+		# Descend to node of last stride, one node per full stride
+		node = self.roots[network.version]
+		networkValue = int(network.network_address)
+		addressBits = network.max_prefixlen
+		lastStride = (prefixLength - 1) // PREFIX_STRIDE_BITS
+		strideMask = (1 << PREFIX_STRIDE_BITS) - 1
+		for stride in range(lastStride) :
+			strideValue = (networkValue >> (addressBits - (stride + 1) * PREFIX_STRIDE_BITS)) & strideMask
+			node = node[0].setdefault(strideValue, ({}, {}))
+		# Expand remaining prefix bits to every stride value they cover, longer prefixes win
+		firstValue = (networkValue >> (addressBits - (lastStride + 1) * PREFIX_STRIDE_BITS)) & strideMask
+		entries = node[1]
+		for strideValue in range(firstValue, firstValue + (1 << ((lastStride + 1) * PREFIX_STRIDE_BITS - prefixLength))) :
+			entry = entries.get(strideValue)
+			if (entry is None) or (entry[0] <= prefixLength) :
+				entries[strideValue] = (prefixLength, label)
+
+	def match(
+			self
+			, address
+		) :
+		"""
+		Description: Return label of longest network containing address, None if no network does.
+		Arguments:
+			address : ipaddress.IPv4Address or ipaddress.IPv6Address
+		"""
+		label = self.defaults[address.version]
+		node = self.roots[address.version]
+		addressValue = int(address)
+		strideMask = (1 << PREFIX_STRIDE_BITS) - 1
+		for shift in range(address.max_prefixlen - PREFIX_STRIDE_BITS, -1, -PREFIX_STRIDE_BITS) :
+			strideValue = (addressValue >> shift) & strideMask
+			entry = node[1].get(strideValue)
+			if entry is not None :
+				label = entry[1]
+			node = node[0].get(strideValue)
+			if node is None :
+				break
+		return label
+
+class FrameDecoder :
+	"""
+	Description: Decode addresses, ports, and protocol of captured frames, Ethernet, Linux cooked, and raw IP link types.
+	Address strings are cached per raw address.
+	"""
+
+	def __init__(
+			self
+		) :
+		"""
+		Description: Initialize decoder with empty address cache.
+		"""
+		self.addresses = {}
+
+	def address(
+			self
+			, rawAddress
+		) :
+		"""
+		Description: Return string form of raw IPv4, IPv6, or MAC address.
+		Arguments:
+			rawAddress : Address bytes
+		"""
+		addressString = self.addresses.get(rawAddress)
+		if addressString is None :
+			if len(rawAddress) == 4 :
+				addressString = socket.inet_ntop(socket.AF_INET, rawAddress)
+			elif len(rawAddress) == 16 :
+				addressString = socket.inet_ntop(socket.AF_INET6, rawAddress)
+			else :
+				addressString = rawAddress.hex(":")
+			self.addresses[rawAddress] = addressString
+		return addressString
+
+	def decode(
+			self
+			, linkType
+			, frame
+		) :
+		"""
+		Description: Decode frame to SPLTcsv source address through protocol fields.
+		Arguments:
+			linkType : Link type of capture interface
+			frame : Captured frame bytes
+		Return:
+			[tuple] : (source address, destination address, source port, destination port, protocol), ports "" if none.
+		"""
+		srcAddr = destAddr = ""
+		srcPort = destPort = ""
+		# Data Link layer
+		if linkType == LINKTYPE_ETHERNET :
+			if len(frame) < 14 :
+				return srcAddr, destAddr, srcPort, destPort, "Ethernet"
+			destAddr = self.address(frame[0:6])
+			srcAddr = self.address(frame[6:12])
+			etherType = (frame[12] << 8) | frame[13]
+			offset = 14
+			while (etherType in ETHERTYPE_VLAN) and (len(frame) >= offset + 4) :
+				etherType = (frame[offset+2] << 8) | frame[offset+3]
+				offset += 4
+		elif linkType == LINKTYPE_LINUX_SLL :
+			if len(frame) < 16 :
+				return srcAddr, destAddr, srcPort, destPort, "SLL"
+			srcAddr = self.address(frame[6:6 + min(frame[5], 8)])
+			etherType = (frame[14] << 8) | frame[15]
+			offset = 16
+		elif linkType in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6) :
+			if len(frame) < 1 :
+				return srcAddr, destAddr, srcPort, destPort, "Raw"
+			etherType = ETHERTYPE_IPV6 if (frame[0] >> 4) == 6 else ETHERTYPE_IPV4
+			offset = 0
+		else :
+			return srcAddr, destAddr, srcPort, destPort, "LINKTYPE_" + str(linkType)
+		# Network layer
+		fragmented = False
+		if (etherType == ETHERTYPE_IPV4) and (len(frame) >= offset + 20) :
+			headerLength = (frame[offset] & 0x0f) * 4
+			ipProtocol = frame[offset+9]
+			fragmented = ( ((frame[offset+6] & 0x1f) << 8) | frame[offset+7] ) != 0
+			srcAddr = self.address(frame[offset+12:offset+16])
+			destAddr = self.address(frame[offset+16:offset+20])
+			networkName = "IPv4"
+			offset += headerLength
+		elif (etherType == ETHERTYPE_IPV6) and (len(frame) >= offset + 40) :
+			ipProtocol = frame[offset+6]
+			srcAddr = self.address(frame[offset+8:offset+24])
+			destAddr = self.address(frame[offset+24:offset+40])
+			networkName = "IPv6"
+			offset += 40
+			while len(frame) >= offset + 8 :
+				if ipProtocol in IPV6_EXTENSIONS :
+					ipProtocol, extensionLength = frame[offset], (frame[offset+1] + 1) * 8
+				elif ipProtocol == 44 :  # Fragment
+					fragmented = ( ((frame[offset+2] << 8) | frame[offset+3]) & 0xfff8 ) != 0
+					ipProtocol, extensionLength = frame[offset], 8
+				elif ipProtocol == 51 :  # Authentication Header
+					ipProtocol, extensionLength = frame[offset], (frame[offset+1] + 2) * 4
+				else :
+					break
+				offset += extensionLength
+		elif etherType == ETHERTYPE_ARP :
+			return srcAddr, destAddr, srcPort, destPort, "ARP"
+		else :
+			return srcAddr, destAddr, srcPort, destPort, "0x%04x" % etherType
+		# Transport layer
+		protocol = IP_PROTOCOL_NAMES.get(ipProtocol, networkName)
+		if (ipProtocol in (6, 17, 132)) and not fragmented and (len(frame) >= offset + 4) :
+			srcPort = str( (frame[offset] << 8) | frame[offset+1] )
+			destPort = str( (frame[offset+2] << 8) | frame[offset+3] )
+		return srcAddr, destAddr, srcPort, destPort, protocol
+
 class ProcPacket :
 	"""
 	Description: Data object for processed packets based on grouping, counting, and ordering mode processed from a RawPacket.
@@ -209,6 +1025,8 @@ class ProcPacket :
 		self.group = None
 		self.count = 0
 		self.bytes = 0
+		self.peers = 0  # Estimated distinct peers, set only when sorted or output per peers
+		self.error = None  # Maximum overestimate of sorted metric, approximate results only
 		if packet is not None :
 			modeGroup = config["mode"] & GROUP_BY_MASK
 			if modeGroup == GROUP_BY_USE_DEFAULT :
@@ -221,6 +1039,17 @@ class ProcPacket :
 				self.group = str(packet.srcAddr) + " -> " + str(packet.destAddr)
 			elif modeGroup == GROUP_BY_PROTO :
 				self.group = packet.proto
+			elif modeGroup == GROUP_BY_SRC_PORT :
+				self.group = packet.srcPort
+			elif modeGroup == GROUP_BY_DEST_PORT :
+				self.group = packet.destPort
+			elif modeGroup in GROUP_BY_FLOWS :
+				self.group = renderFlow( (packet.srcAddr, packet.destAddr, packet.srcPort, packet.destPort, packet.proto), modeGroup == GROUP_BY_BIFLOW )
+			elif modeGroup in GROUP_BY_ROLLUPS :
+				if GROUP_BY_ROLLUPS[modeGroup] == GROUP_BY_SRC_ADDR :
+					self.group = rollupLabel(modeGroup, packet.srcAddr)
+				else :
+					self.group = rollupLabel(modeGroup, packet.destAddr)
 			self.count = 1
 			self.bytes = packet.bytes
 
@@ -247,6 +1076,8 @@ class ProcPacket :
 			return (self.count == other.count) and (self.group == other.group)
 		elif modeSort == SORT_BYTES :
 			return (self.bytes == other.bytes) and (self.group == other.group)
+		elif modeSort == SORT_PEERS :
+			return (self.peers == other.peers) and (self.group == other.group)
 
 	def __ge__(
 			self
@@ -272,6 +1103,13 @@ class ProcPacket :
 				return self.group >= other.group
 			else :
 				return False
+		elif modeSort == SORT_PEERS :
+			if self.peers > other.peers :
+				return True
+			elif self.peers == other.peers :
+				return self.group >= other.group
+			else :
+				return False
 
 	def __gt__(
 			self
@@ -297,6 +1135,13 @@ class ProcPacket :
 				return self.group > other.group
 			else :
 				return False
+		elif modeSort == SORT_PEERS :
+			if self.peers > other.peers :
+				return True
+			elif self.peers == other.peers :
+				return self.group > other.group
+			else :
+				return False
 
 	def __le__(
 			self
@@ -322,6 +1167,13 @@ class ProcPacket :
 				return self.group <= other.group
 			else :
 				return False
+		elif modeSort == SORT_PEERS :
+			if self.peers < other.peers :
+				return True
+			elif self.peers == other.peers :
+				return self.group <= other.group
+			else :
+				return False
 
 	def __lt__(
 			self
@@ -347,6 +1199,13 @@ class ProcPacket :
 				return self.group < other.group
 			else :
 				return False
+		elif modeSort == SORT_PEERS :
+			if self.peers < other.peers :
+				return True
+			elif self.peers == other.peers :
+				return self.group < other.group
+			else :
+				return False
 
 	def __str__(
 			self
@@ -357,6 +1216,69 @@ class ProcPacket :
 		strPacket = str(self.group) + "," + str(self.count) + "," + str(self.bytes)
 		return strPacket
 
+class RunStats :
+	"""
+	Description: Statistics of a run, wall seconds per stage of STATS_STAGES, lines parsed, malformed lines, packets, and groups.
+	Recorded by a ProcPackets given stats, see ProcPackets.__init__(), a ProcPackets without stats does no recording.
+	Malformed CSV lines are counted and skipped while recording, see skipMalformedLines(), else they abort parsing.
+	"""
+
+	def __init__(
+			self
+		) :
+		"""
+		Description: Initialize empty statistics.
+		"""
+		self.seconds = dict.fromkeys(STATS_STAGES, 0.0)  # Stage -> wall seconds, summed over calls
+		self.totalSeconds = 0.0  # Wall seconds of whole run, see main()
+		self.lines = 0  # CSV lines or capture frames parsed into packets, header lines excluded
+		self.malformedLines = 0  # CSV lines skipped as malformed
+		self.packets = 0  # Packets appended, parsed or loaded from snapshots
+		self.groups = 0  # Groups formed, summed over processed group modes, cached results excluded
+
+	def addSeconds(
+			self
+			, stage
+			, start
+		) :
+		"""
+		Description: Add wall seconds since start to stage.
+		Arguments:
+			stage : Stage of STATS_STAGES
+			start : time.perf_counter() at start of stage
+		"""
+		self.seconds[stage] += time.perf_counter() - start
+
+	def addPackets(
+			self
+			, packets
+			, parsed = True
+		) :
+		"""
+		Description: Add packets appended, counted by the appending ProcPackets once parsed.
+		Arguments:
+			packets : Number of packets
+			parsed : Packets were parsed from lines or frames, else loaded from a snapshot
+		"""
+		self.packets += packets
+		if parsed :
+			self.lines += packets
+
+	def toDict(
+			self
+		) :
+		"""
+		Description: Return statistics as a flat dictionary of name to value, peak memory of process included.
+		"""
+		statistics = {stage + "Seconds" : seconds for stage, seconds in self.seconds.items()}
+		statistics["totalSeconds"] = self.totalSeconds
+		statistics["lines"] = self.lines
+		statistics["malformedLines"] = self.malformedLines
+		statistics["packets"] = self.packets
+		statistics["groups"] = self.groups
+		statistics["peakMemoryBytes"] = peakMemory()
+		return statistics
+
 class ProcPackets :
 	"""
 	Description: Container for ProcPacket objects.
@@ -366,6 +1288,11 @@ class ProcPackets :
 			self
 			, file = None
 			, format = IN_FORMAT_USE_DEFAULT
+			, stream = False
+			, project = False
+			, cacheSize = RESULT_CACHE_SIZE
+			, approx = None
+			, stats = None
 		) :
 		"""
 		Description: Initialize an empty packet container, or with specified data from file per format.
@@ -373,10 +1300,33 @@ class ProcPackets :
 		Arguments:
 			file : Name of input file, or file object of raw packets
 			format : Format of file
+			stream : Fold packets into group aggregates as read, raw packets are not retained
+			project : Stream mode parses only fields needed per config["mode"] when appended, bytes are not aggregated unless sorted or output
+			cacheSize : Maximum number of processed results retained per group, sort, order, and limit, 0 disables
+			approx : Stream mode keeps a Space-Saving summary of ceil(1 / approx) groups per group mode, ranked per config["mode"] sort,
+				each count overestimated by at most approx of the total, see mergeAggregate()
+			stats : RunStats to record stage times and counts into, see recallStats(), nothing recorded if None
 		"""
-		self.__rawPackets = []
+		self.__rawPackets = RawPacketColumns()
 		self.__procPackets = {}
 		self.__resultPackets = []
+		self.__stream = stream
+		self.__project = project
+		self.__groupTables = {}  # Group mode -> {group : [count, bytes]}, flows keyed by flowKey(), stream mode only
+		self.__untrackedBytes = set()  # Group modes streamed without length field, bytes not aggregated
+		self.__resultCache = collections.OrderedDict()  # (result mode, limit) -> [ProcPacket], least recently used first, see resultMode()
+		self.__staleResults = {}  # mode -> ([ProcPacket], changed groups), full results outdated by appended packets
+		self.__cacheSize = cacheSize
+		self.__approxCapacity = None if approx is None else math.ceil(1 / approx)
+		self.__peerTables = {}  # Group mode -> {group : HyperLogLog}, derived on demand unless streamed
+		self.__approxErrors = {}  # Group mode -> {group : overestimate}, approximate stream mode only
+		self.__approxSorts = {}  # Group mode -> sort mode ranked by summary
+		self.__approxPruned = set()  # Group modes whose summary dropped groups
+		self.__rollupLabels = {}  # Rolled up group mode -> {address : group}, per config["prefix"] and config["subnets"]
+		self.__rollupParameters = None  # (config["prefix"], config["subnets"]) of rollup labels and cached rolled up results
+		self.__stats = stats
+		if (approx is not None) and not stream :
+			raise ValueError("(netSort) ERROR: Approximate groups require stream mode.")
 		if file is not None :
 			self.appendPackets(file, format)
 
@@ -386,84 +1336,761 @@ class ProcPackets :
 			, format = IN_FORMAT_USE_DEFAULT
 		) :
 		"""
-		Description: Append raw packets from file per format to current raw packets container.
+		Description: Append raw packets from file per format to current raw packets container, see __appendFile().
 		Arguments:
 			file : Name of input file, or file object of raw packets
 			format : Format of file
 		"""
-		# Prepare for opening input file
-		formatIn = format & IN_FORMAT_MASK
-		if formatIn == IN_FORMAT_USE_DEFAULT :
-			formatIn = IN_FORMAT_DEFAULT
-		fileOpenMode = "rt"
-		try :
-			packetsFile = open(file, mode=fileOpenMode)
-		except :
-			raise
-		# Convert input file to packet per line format
-		packetPerLine = []
-		if (formatIn & IN_FORMAT_CSV_HEADER) or (formatIn & IN_FORMAT_CSV_NO_HEADER) :
-			packetPerLine = packetsFile
-		skipFirst = False
-		if formatIn & IN_FORMAT_CSV_HEADER :
-			skipFirst = True
-		# Process packet per line
-		for packetLine in packetPerLine :
-			if skipFirst :
-				skipFirst = False
-				continue
-			pureCSV = packetLine.strip()
-			newPacket = RawPacket()
-			newPacket.fromCSV(pureCSV)
-			self.__rawPackets.append(newPacket)
+		if self.__stats is None :
+			self.__appendFile(file, format)
+		else :
+			self.__recordParse(self.__appendFile, file, format)
 
-	def processPerMode(
+	def __appendFile(
+			self
+			, file
+			, format = IN_FORMAT_USE_DEFAULT
+		) :
+		"""
+		Description: Append raw packets from file per format to current raw packets container.
+		Regular files are loaded from a valid snapshot sidecar if config["snapshot"], else parsed and the snapshot written, see readSnapshot().
+		Stream mode reads but never writes snapshots.
+		Arguments:
+			file : Name of input file, or file object of raw packets
+			format : Format of file
+		"""
+		# Regular files are memory mapped and parsed as bytes, or loaded from snapshot
+		mapped = isinstance(file, (str, os.PathLike)) and os.path.isfile(file)
+		if mapped :
+			format = detectFormat(file, format)
+		formatIn = format & IN_FORMAT_MASK
+		snapshot = None
+		if mapped and config["snapshot"] and (self.__approxCapacity is None) :
+			snapshot = readSnapshot(file, format)
+		records = None
+		if formatIn in (IN_FORMAT_PCAP, IN_FORMAT_PCAPNG) :
+			if not mapped :
+				raise ValueError("(netSort) ERROR: Packet capture input must be a regular file.")
+			records = readPacketRecords(file, formatIn)
+		elif mapped :
+			packetPerLine = mapPacketLines(file, format)
+		else :
+			packetPerLine = readPacketLines(file, format)
+		if self.__stats is not None :
+			if snapshot is not None :
+				self.__stats.addPackets(len(snapshot), parsed=False)
+			elif records is None :
+				packetPerLine = skipMalformedLines(packetPerLine, self.__stats)
+			malformedLines = self.__stats.malformedLines
+		# Process packet per line, fold only new packets into group tables
+		if self.__stream :
+			if snapshot is not None :
+				self.__mergeColumns(snapshot, aggregatedGroup(config["mode"]))
+			elif records is not None :
+				self.__foldPackets(records, records=True)
+			else :
+				self.__foldPackets(packetPerLine, binary=mapped)
+			return
+		start = len(self.__rawPackets)
+		parsed = snapshot is None
+		if (snapshot is None) and mapped and config["snapshot"] :
+			# First parse of file, write snapshot for later runs
+			snapshot = RawPacketColumns()
+			if records is not None :
+				snapshot.extendRecords(records)
+			else :
+				snapshot.extendMapped(packetPerLine)
+			try :
+				if (self.__stats is None) or (self.__stats.malformedLines == malformedLines) :  # Skipped lines would be missing from later runs
+					writeSnapshot(snapshot, file, format)
+			except OSError :
+				pass  # Snapshot is an optimization, unwritable directory is not an error
+		if snapshot is not None :
+			self.__rawPackets.extendColumns(snapshot)
+		elif records is not None :
+			self.__rawPackets.extendRecords(records)
+		elif mapped :
+			self.__rawPackets.extendMapped(packetPerLine)
+		else :
+			for packetLine in packetPerLine :
+				pureCSV = packetLine.strip()
+				self.__rawPackets.appendCSV(pureCSV)
+		if parsed and (self.__stats is not None) :
+			self.__stats.addPackets(len(self.__rawPackets) - start)
+		self.__mergeAppended(start)
+
+	def appendPacketLines(
+			self
+			, packetLines
+		) :
+		"""
+		Description: Append packets from CSV packet lines as bytes, see mapPacketLines(), group tables are kept current.
+		Arguments:
+			packetLines : Iterable of packet lines as bytes, no header line
+		"""
+		if self.__stats is not None :
+			packetLines = skipMalformedLines(packetLines, self.__stats)
+		if self.__stream :
+			self.__foldPackets(packetLines)
+			return
+		start = len(self.__rawPackets)
+		self.__rawPackets.extendMapped(packetLines)
+		if self.__stats is not None :
+			self.__stats.addPackets(len(self.__rawPackets) - start)
+		self.__mergeAppended(start)
+
+	def __foldPackets(
+			self
+			, packets
+			, binary = True
+			, records = False
+		) :
+		"""
+		Description: Fold packets into group aggregates of config["mode"], and into peer sketches if needed, stream mode only.
+		Arguments:
+			packets : Iterable of CSV packet lines, or of decoded packet records if records
+			binary : Lines are bytes, see mapPacketLines(), else str
+			records : Packets are decoded records, see readPacketRecords()
+		"""
+		modeGroup = aggregatedGroup(config["mode"])  # Rolled up when processed
+		withBytes = records or (not self.__project) or (SPLTcsv.length.value in neededFields(config["mode"]))
+		if needsPeers(config["mode"]) :
+			# Peers need group and peer of each packet, batches are parsed into columns
+			for packetBatch in batchPackets(packets, APPROX_BATCH_PACKETS) :
+				batchColumns = RawPacketColumns()
+				if records :
+					batchColumns.extendRecords(packetBatch)
+				elif binary :
+					batchColumns.extendMapped(packetBatch)
+				else :
+					for packetLine in packetBatch :
+						batchColumns.appendCSV( packetLine.strip() )
+				self.__mergeColumns(batchColumns, modeGroup)
+				if self.__stats is not None :
+					self.__stats.addPackets(len(batchColumns))
+			return
+		if self.__approxCapacity is None :
+			packetBatches = (packets,)
+		else :
+			packetBatches = batchPackets(packets, max(APPROX_BATCH_PACKETS, self.__approxCapacity))  # Bounded partial aggregates
+		for packetBatch in packetBatches :
+			if records :
+				partialAggregates = aggregateRecords(packetBatch, modeGroup)
+			elif modeGroup == GROUP_BY_ALL :
+				partialAggregates = aggregateAllLines(packetBatch, None, withBytes, binary)
+			elif binary :
+				partialAggregates = {modeGroup : aggregateMappedLines(packetBatch, modeGroup, None, withBytes)}
+			else :
+				partialAggregates = {modeGroup : aggregateLines(packetBatch, modeGroup, None, withBytes)}
+			if self.__stats is not None :
+				self.__stats.addPackets( aggregatePackets(partialAggregates) )
+			for partialGroup, partialAggregate in partialAggregates.items() :
+				self.mergeAggregate(partialGroup, partialAggregate, withBytes)
+
+	def __mergeAppended(
+			self
+			, start
+		) :
+		"""
+		Description: Merge raw packets appended from index start into group tables and peer sketches kept so far.
+		Arguments:
+			start : Index of first appended packet
+		"""
+		for modeGroup in list(self.__groupTables) :
+			self.__mergeTable(modeGroup, self.__rawPackets.aggregate(modeGroup, start))
+		for modeGroup in list(self.__peerTables) :
+			self.mergePeers(modeGroup, self.__rawPackets.aggregatePeers(modeGroup, start))
+
+	def appendPacketsParallel(
+			self
+			, files
+			, format = IN_FORMAT_USE_DEFAULT
+			, jobs = None
+		) :
+		"""
+		Description: Append raw packets from files per format, parsed and aggregated in worker processes, stream mode only, see __appendFilesParallel().
+		Arguments:
+			files : List of input file names
+			format : Format of files
+			jobs : Number of worker processes, or os.cpu_count() if None
+		"""
+		if self.__stats is None :
+			self.__appendFilesParallel(files, format, jobs)
+		else :
+			self.__recordParse(self.__appendFilesParallel, files, format, jobs)
+
+	def __appendFilesParallel(
+			self
+			, files
+			, format = IN_FORMAT_USE_DEFAULT
+			, jobs = None
+		) :
+		"""
+		Description: Append raw packets from files per format, parsed and aggregated in worker processes, stream mode only.
+		Files are split into newline aligned byte ranges so a single large file is also parsed across workers.
+		Arguments:
+			files : List of input file names
+			format : Format of files
+			jobs : Number of worker processes, or os.cpu_count() if None
+		"""
+		if not self.__stream :
+			raise ValueError("(netSort) ERROR: Parallel ingestion requires stream mode.")
+		modeGroup = aggregatedGroup(config["mode"])  # Rolled up when processed
+		withBytes = (not self.__project) or (SPLTcsv.length.value in neededFields(config["mode"]))
+		withPeers = needsPeers(config["mode"])
+		skipMalformed = self.__stats is not None
+		if jobs is None :
+			jobs = os.cpu_count()
+		fileSizes = [os.path.getsize(file) for file in files]
+		chunkBytes = max(sum(fileSizes) // (jobs * CHUNKS_PER_JOB), CHUNK_BYTES_MIN)
+		tasks = []
+		for file, fileSize in zip(files, fileSizes) :
+			fileFormat = detectFormat(file, format)
+			snapshot = readSnapshot(file, fileFormat) if config["snapshot"] else None
+			if snapshot is not None :
+				self.__mergeColumns(snapshot, modeGroup)
+				if self.__stats is not None :
+					self.__stats.addPackets(len(snapshot), parsed=False)
+				continue
+			if ((fileFormat & IN_FORMAT_MASK) in (IN_FORMAT_PCAP, IN_FORMAT_PCAPNG)) or (compressionOf(file) is not None) :
+				tasks.append( (file, fileFormat, modeGroup, withBytes, 0, None, withPeers, skipMalformed) )  # Records are not line aligned, compressed data can not be split
+				continue
+			for start, end in splitFileRanges(file, (fileSize // chunkBytes) + 1) :
+				tasks.append( (file, fileFormat, modeGroup, withBytes, start, end, withPeers, skipMalformed) )
+		with multiprocessing.Pool(jobs) as pool :
+			for partialAggregate, malformedLines in pool.imap(aggregateFile, tasks) :
+				if self.__stats is not None :
+					self.__stats.malformedLines += malformedLines
+					if withPeers :
+						self.__stats.addPackets( aggregatePackets(partialAggregate[0]) )
+					elif modeGroup == GROUP_BY_ALL :
+						self.__stats.addPackets( aggregatePackets(partialAggregate) )
+					else :
+						self.__stats.addPackets( aggregatePackets({modeGroup : partialAggregate}) )
+				if withPeers :
+					partialAggregates, partialPeers = partialAggregate
+					for partialGroup, partialGroupAggregate in partialAggregates.items() :
+						self.mergeAggregate(partialGroup, partialGroupAggregate)
+					for partialGroup, partialGroupPeers in partialPeers.items() :
+						self.mergePeers(partialGroup, partialGroupPeers)
+				elif modeGroup == GROUP_BY_ALL :
+					for allGroup, partialGroupAggregate in partialAggregate.items() :
+						self.mergeAggregate(allGroup, partialGroupAggregate, withBytes)
+				else :
+					self.mergeAggregate(modeGroup, partialAggregate, withBytes)
+
+	def __recordParse(
+			self
+			, append
+			, *arguments
+		) :
+		"""
+		Description: Call append with arguments, timed as parse stage of stats, packets are counted by append.
+		Arguments:
+			append : Append method of ProcPackets
+			arguments : Arguments of append
+		"""
+		stats = self.__stats
+		start = time.perf_counter()
+		try :
+			append(*arguments)
+		finally :
+			stats.addSeconds("parse", start)
+
+	def mergeAggregate(
+			self
+			, modeGroup
+			, partialAggregate
+			, withBytes = True
+		) :
+		"""
+		Description: Merge partial group aggregate into group aggregate of group mode, stream mode only.
+		Approximate stream mode merges into the Space-Saving summary instead, see __mergeApprox().
+		Arguments:
+			modeGroup : Group mode of partial aggregate
+			partialAggregate : Dictionary of group to [count, bytes] list, see aggregateLines()
+			withBytes : Partial aggregate includes bytes
+		"""
+		if not self.__stream :
+			raise ValueError("(netSort) ERROR: Merging aggregates requires stream mode.")
+		if not withBytes :
+			self.__untrackedBytes.add(modeGroup)
+		if self.__approxCapacity is not None :
+			self.__mergeApprox(modeGroup, partialAggregate)
+		else :
+			self.__mergeTable(modeGroup, partialAggregate)
+
+	def mergePeers(
+			self
+			, modeGroup
+			, partialPeers
+		) :
+		"""
+		Description: Merge partial peer sketches into peer sketches of group mode, sketches from other files or workers merge losslessly.
+		Arguments:
+			modeGroup : Group mode of partial peers
+			partialPeers : Dictionary of group to HyperLogLog, see RawPacketColumns.aggregatePeers()
+		"""
+		self.__retireResults(modeGroup, partialPeers)
+		peerTable = self.__peerTables.setdefault(modeGroup, {})
+		for group, sketch in partialPeers.items() :
+			groupSketch = peerTable.get(group)
+			if groupSketch is None :
+				peerTable[group] = sketch
+			else :
+				groupSketch.merge(sketch)
+
+	def __mergeColumns(
+			self
+			, columns
+			, modeGroup
+		) :
+		"""
+		Description: Merge group aggregates, and peers if needed per config["mode"], of raw packet columns, stream mode only.
+		Arguments:
+			columns : RawPacketColumns
+			modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT)
+		"""
+		partialAggregates, partialPeers = aggregateColumns(columns, modeGroup, needsPeers(config["mode"]))
+		for partialGroup, partialAggregate in partialAggregates.items() :
+			self.mergeAggregate(partialGroup, partialAggregate)
+		for partialGroup, partialGroupPeers in partialPeers.items() :
+			self.mergePeers(partialGroup, partialGroupPeers)
+
+	def __mergeApprox(
+			self
+			, modeGroup
+			, partialAggregate
+		) :
+		"""
+		Description: Merge exact partial group aggregate into Space-Saving summary of group mode, keeping the largest groups per sort metric.
+		Groups new to a full summary start at its smallest count, which becomes their error, so counts are overestimated by at most total / capacity.
+		Arguments:
+			modeGroup : Group mode of partial aggregate
+			partialAggregate : Dictionary of group to [count, bytes] list
+		"""
+		self.__resultCache.clear()
+		self.__staleResults.clear()
+		modeSort = resolveMode(config["mode"]) & SORT_MASK
+		if modeSort == SORT_PEERS :
+			raise ValueError("(netSort) ERROR: Approximate groups can not be ranked by peers.")
+		metric = 1 if modeSort == SORT_BYTES else 0
+		if self.__approxSorts.setdefault(modeGroup, modeSort) != modeSort :
+			raise ValueError("(netSort) ERROR: Approximate groups were ranked by another sort mode.")
+		groupTable = self.__groupTables.setdefault(modeGroup, {})
+		groupErrors = self.__approxErrors.setdefault(modeGroup, {})
+		# Smallest count of a pruned summary bounds every group it no longer holds
+		floor = 0
+		if modeGroup in self.__approxPruned :
+			floor = min(totals[metric] for totals in groupTable.values())
+		for group, (count, packetBytes) in partialAggregate.items() :
+			totals = groupTable.get(group)
+			if totals is None :
+				totals = groupTable[group] = [count, packetBytes]
+				totals[metric] += floor
+				groupErrors[group] = floor
+			else :
+				totals[0] += count
+				totals[1] += packetBytes
+		# Prune to capacity
+		if len(groupTable) > self.__approxCapacity :
+			keptGroups = heapq.nlargest(self.__approxCapacity, groupTable.items(), key=lambda item : item[1][metric])
+			self.__groupTables[modeGroup] = dict(keptGroups)
+			self.__approxErrors[modeGroup] = {group : groupErrors[group] for group, totals in keptGroups}
+			self.__approxPruned.add(modeGroup)
+
+	def __mergeTable(
+			self
+			, modeGroup
+			, partialAggregate
+		) :
+		"""
+		Description: Merge partial group aggregate into group table of group mode.
+		Cached results become stale, full results are retained with the changed groups for incremental re-sorting.
+		Arguments:
+			modeGroup : Group mode of partial aggregate
+			partialAggregate : Dictionary of group to [count, bytes] list
+		"""
+		self.__retireResults(modeGroup, partialAggregate)
+		# Fold partial aggregate
+		groupTable = self.__groupTables.setdefault(modeGroup, {})
+		for group, (count, packetBytes) in partialAggregate.items() :
+			totals = groupTable.get(group)
+			if totals is None :
+				groupTable[group] = [count, packetBytes]
+			else :
+				totals[0] += count
+				totals[1] += packetBytes
+
+	def __retireResults(
+			self
+			, modeGroup
+			, changedGroups
+		) :
+		"""
+		Description: Retire cached results before groups of group mode change, full results are retained with the changed groups for incremental re-sorting.
+		Arguments:
+			modeGroup : Group mode of changing groups
+			changedGroups : Iterable of changing groups
+		"""
+		for (cacheMode, cacheLimit), cachedResults in self.__resultCache.items() :
+			if (cacheLimit is None) and ((cacheMode & GROUP_BY_MASK) not in GROUP_BY_ROLLUPS) :  # Rolled up groups change with any address
+				self.__staleResults[cacheMode] = (cachedResults, set())
+		self.__resultCache.clear()
+		for staleMode, (staleResults, staleGroups) in self.__staleResults.items() :
+			if (staleMode & GROUP_BY_MASK) == modeGroup :
+				staleGroups.update(changedGroups)
+
+	def processPerMode(
 			self
 			, mode = None
+			, limit = None
 		) :
 		"""
 		Description: Lowest level API; process RawPackets based on mode or config["mode"] if None.
 		Arguments:
 			mode : Mode to group, count, and order RawPackets per.
+			limit : Maximum number of ProcPacket objects to return, first per order, or config["limit"] if None.
 		Returns:
 			[list] : List of ProcPacket objects grouped and ordered, each ProcPacket has count and bytes data.
+			ProcPacket objects are shared with the result cache, treat as read only.
 		"""
 		if mode is not None :
 			combinedMasks = GROUP_BY_MASK | SORT_MASK | ORDER_MASK
 			config["mode"] = (combinedMasks & mode) | (config["mode"] & ~combinedMasks)
-		self.__processGroupBy()
-		self.__resultPackets = list(self.__procPackets.values())
-		self.__resultPackets.sort()
-		# Reverse order if needed
-		orderMode = config["mode"] & ORDER_MASK
-		if orderMode == ORDER_NUM_HIGH :
-			self.__resultPackets.reverse()
+		if limit is None :
+			limit = config["limit"]
+		modeGroup = resolveMode(config["mode"]) & GROUP_BY_MASK
+		if modeGroup == GROUP_BY_ALL :
+			raise ValueError("(netSort) ERROR: Group mode 'all' is served by processAllGroups().")
+		# Cached results of projected groups have no bytes
+		if (aggregatedGroup(config["mode"]) in self.__untrackedBytes) and (SPLTcsv.length.value in neededFields(config["mode"])) :
+			raise ValueError("(netSort) ERROR: Bytes were not aggregated while streaming.")
+		# Rolled up results and labels are outdated by new prefix lengths or subnets
+		rollupParameters = (config["prefix"], config["subnets"])
+		if rollupParameters != self.__rollupParameters :
+			self.__rollupParameters = rollupParameters
+			self.__rollupLabels.clear()
+			for cacheKey in [cacheKey for cacheKey in self.__resultCache if (cacheKey[0] & GROUP_BY_MASK) in GROUP_BY_ROLLUPS] :
+				del self.__resultCache[cacheKey]
+		# Serve from result cache if possible
+		cacheKey = (resultMode(config["mode"]), limit)
+		cachedResults = self.__resultCache.get(cacheKey)
+		if cachedResults is not None :
+			self.__resultCache.move_to_end(cacheKey)
+			self.__resultPackets = cachedResults
+			return self.__resultPackets.copy()
+		stats = self.__stats
+		if stats is not None :
+			start = time.perf_counter()
+		staleResults = self.__staleResults.pop(cacheKey[0], None)
+		if staleResults is not None :
+			self.__resultPackets = self.__mergeStaleResults(staleResults, limit)
+			if stats is not None :
+				stats.addSeconds("group", start)
+				stats.groups += len(self.__groupTables[cacheKey[0] & GROUP_BY_MASK])
+		elif (numpy is not None) and config["numpy"] and not self.__stream and (modeGroup not in self.__groupTables) and (modeGroup not in GROUP_BY_ROLLUPS) and (modeGroup not in GROUP_BY_FLOWS) and not needsPeers(config["mode"]) :
+			self.__processNumPy(limit)
+			if stats is not None :
+				stats.addSeconds("group", start)
+				stats.groups += len(self.__groupTables.get(cacheKey[0] & GROUP_BY_MASK, ()))
+		else :
+			self.__processGroupBy()
+			if stats is not None :
+				stats.addSeconds("group", start)
+				stats.groups += len(self.__procPackets)
+				start = time.perf_counter()
+			self.__resultPackets = sortProcPackets(self.__procPackets.values(), config["mode"], limit)
+			if stats is not None :
+				stats.addSeconds("sort", start)
+		# Cache results, evict least recently used
+		if self.__cacheSize > 0 :
+			self.__resultCache[cacheKey] = self.__resultPackets
+			while len(self.__resultCache) > self.__cacheSize :
+				self.__resultCache.popitem(last=False)
 		return self.__resultPackets.copy()
 
+	def processAllGroups(
+			self
+			, mode = None
+			, limit = None
+		) :
+		"""
+		Description: Process RawPackets for every group mode of GROUP_BY_ALL_MODES from a single pass, sort and order per mode or config["mode"] if None.
+		Group aggregates are retained, later calls and processPerMode() for these group modes only sort.
+		Arguments:
+			mode : Mode to sort and order per, group bits are ignored.
+			limit : Maximum number of ProcPacket objects per group mode, or config["limit"] if None.
+		Returns:
+			[dict] : Dictionary of group mode to list of ProcPacket objects grouped and ordered.
+		"""
+		if mode is not None :
+			combinedMasks = SORT_MASK | ORDER_MASK
+			config["mode"] = (combinedMasks & mode) | (config["mode"] & ~combinedMasks)
+		if limit is None :
+			limit = config["limit"]
+		if not self.__stream and any(modeGroup not in self.__groupTables for modeGroup in GROUP_BY_ALL_MODES) :
+			self.__processGroupAll()
+		results = {}
+		for modeGroup in GROUP_BY_ALL_MODES :
+			results[modeGroup] = self.processPerMode((config["mode"] & ~GROUP_BY_MASK) | modeGroup, limit)
+		config["mode"] = (config["mode"] & ~GROUP_BY_MASK) | GROUP_BY_ALL
+		return results
+
+	def __mergeStaleResults(
+			self
+			, staleResults
+			, limit = None
+		) :
+		"""
+		Description: Re-sort stale full results of config["mode"] incrementally, only changed groups are sorted, then merged with unchanged groups.
+		Arguments:
+			staleResults : Tuple of (full results, changed groups), see __mergeTable()
+			limit : Maximum number of ProcPacket objects to return, all if None.
+		Returns:
+			[list] : List of ProcPacket objects grouped and ordered.
+		"""
+		modeGroup = resolveMode(config["mode"]) & GROUP_BY_MASK
+		sortedPackets, changedGroups = staleResults
+		groupTable = self.__groupTables[modeGroup]
+		changedPackets = []
+		peerTable = self.__peerTable(modeGroup) if needsPeers(config["mode"]) else None
+		for group in changedGroups :
+			procPacket = ProcPacket(None)
+			procPacket.group = renderGroup(modeGroup, group)
+			procPacket.count, procPacket.bytes = groupTable[group]
+			if peerTable is not None :
+				procPacket.peers = peerTable[group].count()
+			changedPackets.append(procPacket)
+		# Two sorted runs, merged by one pass of Timsort
+		changedGroups = {changedPacket.group for changedPacket in changedPackets}
+		mergedPackets = [procPacket for procPacket in sortedPackets if procPacket.group not in changedGroups]
+		mergedPackets.extend( sortProcPackets(changedPackets, config["mode"]) )
+		mergedPackets.sort(key=sortKey(config["mode"], True), reverse=(config["mode"] & ORDER_MASK) == ORDER_NUM_HIGH)
+		if self.__cacheSize > 0 :
+			self.__resultCache[ (resultMode(config["mode"]), None) ] = mergedPackets
+		if limit is not None :
+			return mergedPackets[:limit]
+		return mergedPackets
+
 	def __processGroupBy(
 			self
 		) :
 		"""
 		Description: Process RawPackets based on group mode.
 		"""
-		# Set up for processing
+		# Set up for processing, rolled up group modes are processed from groups of their address group mode
 		self.__procPackets.clear()
-		# Traverse and group raw packets
-		for rawPacket in self.__rawPackets :
-			procPacket = ProcPacket(rawPacket)
-			if procPacket.group not in self.__procPackets :
-				self.__procPackets[procPacket.group] = procPacket
+		modeGroup = resolveMode(config["mode"]) & GROUP_BY_MASK
+		rollupGroup = None
+		if modeGroup in GROUP_BY_ROLLUPS :
+			rollupGroup = modeGroup
+			modeGroup = GROUP_BY_ROLLUPS[rollupGroup]
+		if modeGroup not in self.__groupTables :
+			if self.__stream :
+				if self.__groupTables :
+					raise ValueError("(netSort) ERROR: Group mode was not aggregated while streaming.")
+				return
+			self.__groupTables[modeGroup] = self.__rawPackets.aggregate(modeGroup)
+		groupErrors = self.__approxErrors.get(modeGroup)
+		if groupErrors is not None :
+			if self.__approxSorts[modeGroup] != (resolveMode(config["mode"]) & SORT_MASK) :
+				raise ValueError("(netSort) ERROR: Approximate groups were ranked by another sort mode.")
+			if rollupGroup is not None :
+				raise ValueError("(netSort) ERROR: Approximate groups can not be rolled up.")
+		groupTable = self.__groupTables[modeGroup]
+		if rollupGroup is not None :
+			groupTable = self.__rollupTable(rollupGroup, groupTable)
+		for group, (count, packetBytes) in groupTable.items() :
+			procPacket = ProcPacket(None)
+			procPacket.group = renderGroup(modeGroup, group)
+			procPacket.count = count
+			procPacket.bytes = packetBytes
+			if groupErrors is not None :
+				procPacket.error = groupErrors[group]
+			self.__procPackets[procPacket.group] = procPacket
+		if needsPeers(config["mode"]) :
+			peerTable = self.__peerTable(modeGroup)
+			if rollupGroup is not None :
+				peerTable = self.__rollupTable(rollupGroup, peerTable)
+			for group, procPacket in self.__procPackets.items() :
+				procPacket.peers = peerTable[group].count()
+
+	def __peerTable(
+			self
+			, modeGroup
+		) :
+		"""
+		Description: Return peer sketches of group mode, derived from raw packets if not yet aggregated.
+		Arguments:
+			modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT)
+		"""
+		if modeGroup not in self.__peerTables :
+			if self.__stream :
+				raise ValueError("(netSort) ERROR: Peers were not aggregated while streaming.")
+			self.__peerTables[modeGroup] = self.__rawPackets.aggregatePeers(modeGroup)
+		return self.__peerTables[modeGroup]
+
+	def __rollupTable(
+			self
+			, rollupGroup
+			, addressTable
+		) :
+		"""
+		Description: Roll up group table or peer sketches of address groups into groups of rolled up group mode.
+		Addresses are labelled once per rollup parameters, see rollupLabel(), so each call costs one lookup per address group.
+		Arguments:
+			rollupGroup : Rolled up group mode, see GROUP_BY_ROLLUPS
+			addressTable : Dictionary of address to [count, bytes] list, or to HyperLogLog
+		Returns:
+			[dict] : Dictionary of group to [count, bytes] list, or to HyperLogLog, address table is not modified.
+		"""
+		labels = self.__rollupLabels.setdefault(rollupGroup, {})
+		rollupTable = {}
+		for address, totals in addressTable.items() :
+			group = labels.get(address)
+			if group is None :
+				group = labels[address] = rollupLabel(rollupGroup, address)
+			groupTotals = rollupTable.get(group)
+			if groupTotals is None :
+				if isinstance(totals, HyperLogLog) :
+					groupTotals = rollupTable[group] = HyperLogLog()
+				else :
+					groupTotals = rollupTable[group] = [0, 0]
+			if isinstance(totals, HyperLogLog) :
+				groupTotals.merge(totals)
 			else :
-				self.__procPackets[procPacket.group] += procPacket
+				groupTotals[0] += totals[0]
+				groupTotals[1] += totals[1]
+		return rollupTable
+
+	def __processGroupAll(
+			self
+		) :
+		"""
+		Description: Aggregate RawPackets into group tables of every group mode of GROUP_BY_ALL_MODES in a single pass.
+		"""
+		columns = self.__rawPackets
+		srcTable = {}
+		destTable = {}
+		connectTable = {}
+		protoTable = {}
+		for src, dest, proto, packetBytes in zip(columns.srcAddr, columns.destAddr, columns.proto, columns.bytes) :
+			totals = srcTable.get(src)
+			if totals is None :
+				srcTable[src] = [1, packetBytes]
+			else :
+				totals[0] += 1
+				totals[1] += packetBytes
+			totals = destTable.get(dest)
+			if totals is None :
+				destTable[dest] = [1, packetBytes]
+			else :
+				totals[0] += 1
+				totals[1] += packetBytes
+			totals = connectTable.get( (src, dest) )
+			if totals is None :
+				connectTable[ (src, dest) ] = [1, packetBytes]
+			else :
+				totals[0] += 1
+				totals[1] += packetBytes
+			totals = protoTable.get(proto)
+			if totals is None :
+				protoTable[proto] = [1, packetBytes]
+			else :
+				totals[0] += 1
+				totals[1] += packetBytes
+		# Render group strings from codes
+		strings = columns.strings
+		self.__groupTables[GROUP_BY_SRC_ADDR] = {strings[code] : totals for code, totals in srcTable.items()}
+		self.__groupTables[GROUP_BY_DEST_ADDR] = {strings[code] : totals for code, totals in destTable.items()}
+		self.__groupTables[GROUP_BY_CONNECT] = {strings[src] + " -> " + strings[dest] : totals for (src, dest), totals in connectTable.items()}
+		self.__groupTables[GROUP_BY_PROTO] = {strings[code] : totals for code, totals in protoTable.items()}
+
+	def __processNumPy(
+			self
+			, limit = None
+		) :
+		"""
+		Description: Process RawPackets based on group, sort, and order mode with vectorized NumPy operations.
+		Groups are formed from interned codes with unique() and bincount(), ordered with lexsort() on (metric, group).
+		Arguments:
+			limit : Maximum number of ProcPacket objects to create, first per order, all if None.
+		"""
+		# Set up for processing
+		self.__procPackets.clear()
+		self.__resultPackets = []
+		columns = self.__rawPackets
+		if len(columns) == 0 :
+			return
+		modeGroup = resolveMode(config["mode"]) & GROUP_BY_MASK
+		modeSort = resolveMode(config["mode"]) & SORT_MASK
+		# Zero-copy views of key columns
+		srcCodes = numpy.frombuffer(columns.srcAddr, dtype=columns.srcAddr.typecode)
+		destCodes = numpy.frombuffer(columns.destAddr, dtype=columns.destAddr.typecode)
+		if modeGroup == GROUP_BY_SRC_ADDR :
+			keys = srcCodes
+		elif modeGroup == GROUP_BY_DEST_ADDR :
+			keys = destCodes
+		elif modeGroup == GROUP_BY_CONNECT :
+			keys = srcCodes.astype(numpy.int64) * len(columns.strings) + destCodes
+		elif modeGroup == GROUP_BY_PROTO :
+			keys = numpy.frombuffer(columns.proto, dtype=columns.proto.typecode)
+		elif modeGroup == GROUP_BY_SRC_PORT :
+			keys = numpy.frombuffer(columns.srcPort, dtype=columns.srcPort.typecode)
+		elif modeGroup == GROUP_BY_DEST_PORT :
+			keys = numpy.frombuffer(columns.destPort, dtype=columns.destPort.typecode)
+		# Group by code
+		groupKeys, groupIndex, counts = numpy.unique(keys, return_inverse=True, return_counts=True)
+		packetBytes = numpy.frombuffer(columns.bytes, dtype=columns.bytes.typecode)
+		byteSums = numpy.rint( numpy.bincount(groupIndex, weights=packetBytes, minlength=len(groupKeys)) ).astype(numpy.int64)
+		# Render group strings from codes
+		strings = columns.strings
+		if modeGroup == GROUP_BY_CONNECT :
+			srcKeys, destKeys = numpy.divmod(groupKeys, len(strings))
+			groups = [strings[src] + " -> " + strings[dest] for src, dest in zip(srcKeys.tolist(), destKeys.tolist())]
+		else :
+			groups = [strings[key] for key in groupKeys.tolist()]
+		# Order by metric, then group
+		if modeSort == SORT_PACKETS :
+			metric = counts
+		elif modeSort == SORT_BYTES :
+			metric = byteSums
+		reverse = (resolveMode(config["mode"]) & ORDER_MASK) == ORDER_NUM_HIGH
+		if (limit is not None) and (0 < limit < len(metric)) :
+			# Partition on metric in linear time, groups tied with the cutoff metric stay candidates for the group tie breaker
+			kth = len(metric) - limit if reverse else limit - 1
+			cutoff = metric[numpy.argpartition(metric, kth)[kth]]
+			candidates = numpy.flatnonzero( (metric >= cutoff) if reverse else (metric <= cutoff) )
+			order = candidates[numpy.lexsort( (numpy.array([groups[index] for index in candidates.tolist()]), metric[candidates]) )]
+		else :
+			order = numpy.lexsort( (numpy.array(groups), metric) )
+		if reverse :
+			order = order[::-1]
+		if limit is not None :
+			order = order[:limit]
+		counts = counts.tolist()
+		byteSums = byteSums.tolist()
+		# Retain group table, later sorts of this group mode need not regroup
+		self.__groupTables[modeGroup] = {group : [count, packetBytes] for group, count, packetBytes in zip(groups, counts, byteSums)}
+		for index in order.tolist() :
+			procPacket = ProcPacket(None)
+			procPacket.group = groups[index]
+			procPacket.count = counts[index]
+			procPacket.bytes = byteSums[index]
+			self.__procPackets[procPacket.group] = procPacket
+			self.__resultPackets.append(procPacket)
 
 	def connectionByBytes(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -472,16 +2099,18 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_CONNECT | SORT_BYTES
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def connectionByPackets(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -490,16 +2119,18 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_CONNECT | SORT_PACKETS
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def destinationByBytes(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -508,16 +2139,18 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_DEST_ADDR | SORT_BYTES
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def destinationByPackets(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -526,16 +2159,18 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_DEST_ADDR | SORT_PACKETS
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def protocolByBytes(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -544,16 +2179,18 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_PROTO | SORT_BYTES
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def protocolByPackets(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -562,16 +2199,18 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_PROTO | SORT_PACKETS
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def sourceByBytes(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -580,16 +2219,18 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_SRC_ADDR | SORT_BYTES
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def sourceByPackets(
 			self
 			, orderMode = None
+			, limit = None
 		) :
 		"""
 		Description: ...
 		Arguments:
 			orderMode : Ordering mode for processed packets.
+			limit : Maximum number of groups to return, or config["limit"] if None.
 		Returns:
 			[list] : List of tuples per group, count, and order processed packet data.
 		"""
@@ -598,7 +2239,7 @@ class ProcPackets :
 		else :
 			procOrderMode = config["mode"] & ORDER_MASK
 		procMode = procOrderMode | GROUP_BY_SRC_ADDR | SORT_PACKETS
-		return self.processPerMode(procMode)
+		return self.processPerMode(procMode, limit)
 
 	def clear(
 			self
@@ -608,6 +2249,13 @@ class ProcPackets :
 		"""
 		self.clearResults()
 		self.__rawPackets.clear()
+		self.__groupTables.clear()
+		self.__untrackedBytes.clear()
+		self.__peerTables.clear()
+		self.__approxErrors.clear()
+		self.__approxSorts.clear()
+		self.__approxPruned.clear()
+		self.__rollupLabels.clear()
 
 	def clearResults(
 			self
@@ -616,17 +2264,49 @@ class ProcPackets :
 		Description: Clear results from previous processing.
 		"""
 		self.__procPackets.clear()
-		self.__resultPackets.clear()
+		self.__resultPackets = []
+		self.__resultCache.clear()
+		self.__staleResults.clear()
+
+	def recallRawPackets(
+			self
+		) :
+		"""
+		Description: Recall retained raw packets, empty in stream mode.
+		Returns:
+			[list] : List of RawPacket views in insertion order.
+		"""
+		return [self.__rawPackets[index] for index in range(len(self.__rawPackets))]
+
+	def recallStats(
+			self
+		) :
+		"""
+		Description: Recall run statistics recorded so far.
+		Returns:
+			[RunStats] : Statistics given at initialization, or None if not recorded.
+		"""
+		return self.__stats
 
 	def recallResults(
 			self
+			, mode = None
+			, limit = None
 		) :
 		"""
-		Description: Recall results from last processing.
+		Description: Recall results from last processing, or from result cache per mode.
+		Arguments:
+			mode : Group, sort, order, and output data mode of cached results, last results if None, see resultMode().
+			limit : Limit of cached results, see processPerMode().
 		Returns:
-			[list] : List of tuples from last successful packet processing.
+			[list] : List of ProcPacket objects from last successful packet processing, or None if mode is not cached.
 		"""
-		return self.__resultPackets.copy()
+		if mode is None :
+			return self.__resultPackets.copy()
+		cachedResults = self.__resultCache.get( (resultMode(mode), limit) )
+		if cachedResults is None :
+			return None
+		return cachedResults.copy()
 
 def main(
 		cmdArgv = None
@@ -646,17 +2326,380 @@ def main(
 		argv = cmdArgv
 	# Prepare for processing
 	inputFilenames = processCommandLine(argv.copy())
-	# Process input data
-	networkMetadata = ProcPackets()
-	for inputFilename in inputFilenames :
-		networkMetadata.appendPackets(inputFilename)
-	# Create ProcPackets
-	results = networkMetadata.processPerMode()
-	# Output Results
-	outputResults(results)
+	stats = None
+	if config["stats"] is not None :
+		stats = RunStats()
+	profiler = None
+	if config["profile"] is not None :
+		profiler = cProfile.Profile()
+		profiler.enable()
+	# Process input files, statistics and profile are written even if processing fails
+	start = time.perf_counter()
+	try :
+		processInputs(inputFilenames, stats)
+	finally :
+		if profiler is not None :
+			profiler.disable()
+			profiler.dump_stats(config["profile"])
+		if stats is not None :
+			stats.totalSeconds = time.perf_counter() - start
+			outputStats(stats, config["stats"])
 
 # Function Definitions
 
+def aggregatedGroup(
+		mode
+	) :
+	"""
+	Description: Return group mode aggregated for mode, rolled up group modes aggregate their address group mode, see GROUP_BY_ROLLUPS.
+	Arguments:
+		mode : Mode to group per, other bits are ignored.
+	Return:
+		[int] : Group mode, resolved (not GROUP_BY_USE_DEFAULT).
+	"""
+	modeGroup = resolveMode(mode) & GROUP_BY_MASK
+	return GROUP_BY_ROLLUPS.get(modeGroup, modeGroup)
+
+def aggregateColumns(
+		columns
+		, modeGroup
+		, withPeers = False
+	) :
+	"""
+	Description: Aggregate raw packet columns per group mode, and peers of group modes with peers defined.
+	Arguments:
+		columns : RawPacketColumns
+		modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT), GROUP_BY_ALL aggregates every group mode of GROUP_BY_ALL_MODES
+		withPeers : Aggregate peer sketches, see RawPacketColumns.aggregatePeers()
+	Return:
+		[tuple] : (dictionary of group mode to aggregate, dictionary of group mode to peer sketches).
+	"""
+	modeGroups = GROUP_BY_ALL_MODES if modeGroup == GROUP_BY_ALL else (modeGroup,)
+	aggregates = {aggregateGroup : columns.aggregate(aggregateGroup) for aggregateGroup in modeGroups}
+	peers = {}
+	if withPeers :
+		peers = {peerGroup : columns.aggregatePeers(peerGroup) for peerGroup in modeGroups if peerGroup in PEER_COLUMNS}
+	return aggregates, peers
+
+def aggregateFile(
+		task
+	) :
+	"""
+	Description: Worker process entry, parse and aggregate a byte range of a single file.
+	Arguments:
+		task : Tuple of (file, format, group mode, with bytes, start byte offset, end byte offset, with peers, skip malformed lines)
+	Return:
+		[tuple] : (partial aggregate, malformed lines skipped), see skipMalformedLines().
+		Partial aggregate of group to [count, bytes] list, or group mode to partial aggregate if GROUP_BY_ALL.
+		With peers, (aggregates, peers) per aggregateColumns().
+	"""
+	file, format, modeGroup, withBytes, start, end, withPeers, skipMalformed = task
+	formatIn = format & IN_FORMAT_MASK
+	stats = RunStats()
+	if formatIn in (IN_FORMAT_PCAP, IN_FORMAT_PCAPNG) :
+		records = readPacketRecords(file, formatIn)
+	else :
+		packetLines = mapPacketLines(file, format, start, end)
+		if skipMalformed :
+			packetLines = skipMalformedLines(packetLines, stats)
+	if withPeers :
+		columns = RawPacketColumns()
+		if formatIn in (IN_FORMAT_PCAP, IN_FORMAT_PCAPNG) :
+			columns.extendRecords(records)
+		else :
+			columns.extendMapped(packetLines)
+		return aggregateColumns(columns, modeGroup, True), stats.malformedLines
+	if formatIn in (IN_FORMAT_PCAP, IN_FORMAT_PCAPNG) :
+		partialAggregates = aggregateRecords(records, modeGroup)
+		if modeGroup == GROUP_BY_ALL :
+			return partialAggregates, 0
+		return partialAggregates[modeGroup], 0
+	if modeGroup == GROUP_BY_ALL :
+		return aggregateAllLines(packetLines, None, withBytes, True), stats.malformedLines
+	return aggregateMappedLines(packetLines, modeGroup, None, withBytes), stats.malformedLines
+
+def aggregateLines(
+		packetLines
+		, modeGroup
+		, aggregate = None
+		, withBytes = True
+	) :
+	"""
+	Description: Fold CSV packet lines into group aggregate per group mode, raw packets are not retained.
+	Lines are split only up to the last needed field.
+	Arguments:
+		packetLines : Iterable of single line packet fields in CSV format
+		modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT)
+		aggregate : Dictionary of group to [count, bytes] list to fold into, new if None
+		withBytes : Parse length field and aggregate bytes, else bytes remain 0
+	Return:
+		[dict] : aggregate
+	"""
+	if aggregate is None :
+		aggregate = {}
+	keyFields = neededFields(modeGroup | SORT_PACKETS | OUT_DATA_PACKETS)
+	lengthField = SPLTcsv.length.value
+	maxSplit = max(keyFields + ((lengthField,) if withBytes else ())) + 1
+	packetBytes = 0
+	for packetLine in packetLines :
+		fields = packetLine.strip().split(",", maxSplit)
+		if len(keyFields) == 1 :
+			group = fields[keyFields[0]].strip('"')
+		elif modeGroup in GROUP_BY_FLOWS :
+			group = flowKey([fields[keyField].strip('"') for keyField in keyFields], modeGroup == GROUP_BY_BIFLOW)
+		else :
+			group = fields[keyFields[0]].strip('"') + " -> " + fields[keyFields[1]].strip('"')
+		if withBytes :
+			packetBytes = int( fields[lengthField].strip('"') )
+		totals = aggregate.get(group)
+		if totals is None :
+			aggregate[group] = [1, packetBytes]
+		else :
+			totals[0] += 1
+			totals[1] += packetBytes
+	return aggregate
+
+def aggregateMappedLines(
+		packetLines
+		, modeGroup
+		, aggregate = None
+		, withBytes = True
+	) :
+	"""
+	Description: Fold bytes CSV packet lines into group aggregate per group mode, see aggregateLines().
+	Only group key and length fields are sliced out, group keys are stripped and decoded once per group rather than per line.
+	Connection and flow keys are a single joined slice, cheaper to build and hash per line than a tuple.
+	Undecoded keys are popped as they are decoded, so both key forms are not held at once.
+	Arguments:
+		packetLines : Iterable of single line packet fields in CSV format, bytes
+		modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT)
+		aggregate : Dictionary of group to [count, bytes] list to fold into, new if None
+		withBytes : Parse length field and aggregate bytes, else bytes remain 0
+	Return:
+		[dict] : aggregate
+	"""
+	if aggregate is None :
+		aggregate = {}
+	keyFields = neededFields(modeGroup | SORT_PACKETS | OUT_DATA_PACKETS)
+	keyField = None
+	flowFields = None
+	if len(keyFields) == 1 :
+		keyField = keyFields[0]
+	elif modeGroup in GROUP_BY_FLOWS :
+		flowFields = slice(keyFields[0], keyFields[-1] + 1)  # Flow fields are adjacent
+	else :
+		srcField, destField = keyFields
+	lengthField = SPLTcsv.length.value
+	maxSplit = max(keyFields + ((lengthField,) if withBytes else ())) + 1
+	packetBytes = 0
+	# Fold per undecoded key
+	keyAggregate = {}
+	for packetLine in packetLines :
+		fields = packetLine.split(b",", maxSplit)
+		if keyField is not None :
+			key = fields[keyField]
+		elif flowFields is not None :
+			key = b",".join(fields[flowFields])
+		else :
+			key = fields[srcField] + b"," + fields[destField]
+		if withBytes :
+			packetBytes = int( fields[lengthField].strip(b'"\r\n ') )
+		totals = keyAggregate.get(key)
+		if totals is None :
+			keyAggregate[key] = [1, packetBytes]
+		else :
+			totals[0] += 1
+			totals[1] += packetBytes
+	# Decode keys and fold into aggregate, releasing undecoded keys
+	while keyAggregate :
+		key, keyTotals = keyAggregate.popitem()
+		if keyField is not None :
+			group = key.strip(b'"').decode()
+		elif flowFields is not None :
+			group = flowKey([field.strip(b'"').decode() for field in key.split(b",")], modeGroup == GROUP_BY_BIFLOW)
+		else :
+			src, dest = key.split(b",", 1)
+			group = src.strip(b'"').decode() + " -> " + dest.strip(b'"').decode()
+		totals = aggregate.get(group)
+		if totals is None :
+			aggregate[group] = keyTotals
+		else :
+			totals[0] += keyTotals[0]
+			totals[1] += keyTotals[1]
+	return aggregate
+
+def aggregateAllLines(
+		packetLines
+		, aggregates = None
+		, withBytes = True
+		, binary = False
+	) :
+	"""
+	Description: Fold CSV packet lines into group aggregates of every group mode of GROUP_BY_ALL_MODES in a single pass.
+	Arguments:
+		packetLines : Iterable of single line packet fields in CSV format, str or bytes per binary
+		aggregates : Dictionary of group mode to aggregate to fold into, see aggregateLines(), new if None
+		withBytes : Parse length field and aggregate bytes, else bytes remain 0
+		binary : Lines are bytes, keys are decoded once per group
+	Return:
+		[dict] : aggregates
+	"""
+	if aggregates is None :
+		aggregates = {}
+	for modeGroup in GROUP_BY_ALL_MODES :
+		aggregates.setdefault(modeGroup, {})
+	srcField = SPLTcsv.srcAddr.value
+	destField = SPLTcsv.destAddr.value
+	protoField = SPLTcsv.protocol.value
+	lengthField = SPLTcsv.length.value
+	maxSplit = (lengthField if withBytes else protoField) + 1
+	if binary :
+		separator, quote, blanks = b",", b'"', b'"\r\n '
+	else :
+		separator, quote, blanks = ",", '"', '"\r\n '
+	packetBytes = 0
+	# Fold per unstripped, undecoded key, connection keys joined by separator
+	srcTable = {}
+	destTable = {}
+	connectTable = {}
+	protoTable = {}
+	for packetLine in packetLines :
+		fields = packetLine.split(separator, maxSplit)
+		src = fields[srcField]
+		dest = fields[destField]
+		if withBytes :
+			packetBytes = int( fields[lengthField].strip(blanks) )
+		for table, key in ((srcTable, src), (destTable, dest), (connectTable, src + separator + dest), (protoTable, fields[protoField])) :
+			totals = table.get(key)
+			if totals is None :
+				table[key] = [1, packetBytes]
+			else :
+				totals[0] += 1
+				totals[1] += packetBytes
+	# Decode keys and fold into aggregates
+	if binary :
+		decode = bytes.decode
+	else :
+		decode = str
+	for modeGroup, table in ((GROUP_BY_SRC_ADDR, srcTable), (GROUP_BY_DEST_ADDR, destTable), (GROUP_BY_CONNECT, connectTable), (GROUP_BY_PROTO, protoTable)) :
+		aggregate = aggregates[modeGroup]
+		for key, (count, packetBytes) in table.items() :
+			if modeGroup == GROUP_BY_CONNECT :
+				src, dest = key.split(separator, 1)
+				group = decode( src.strip(quote) ) + " -> " + decode( dest.strip(quote) )
+			else :
+				group = decode( key.strip(quote) )
+			totals = aggregate.get(group)
+			if totals is None :
+				aggregate[group] = [count, packetBytes]
+			else :
+				totals[0] += count
+				totals[1] += packetBytes
+	return aggregates
+
+def aggregatePackets(
+		aggregates
+	) :
+	"""
+	Description: Return number of packets folded into aggregates, counted from any one group mode.
+	Arguments:
+		aggregates : Dictionary of group mode to aggregate of group to [count, bytes] list
+	"""
+	for aggregate in aggregates.values() :
+		return sum(totals[0] for totals in aggregate.values())
+	return 0
+
+def aggregateRecords(
+		records
+		, modeGroup
+	) :
+	"""
+	Description: Fold decoded packet records into group aggregate per group mode, see readPacketRecords().
+	Arguments:
+		records : Iterable of packet tuples in SPLTcsv field order, information field excluded
+		modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT), GROUP_BY_ALL folds every group mode of GROUP_BY_ALL_MODES
+	Return:
+		[dict] : Dictionary of group mode to aggregate of group to [count, bytes] list.
+	"""
+	if modeGroup == GROUP_BY_ALL :
+		modeGroups = GROUP_BY_ALL_MODES
+	else :
+		modeGroups = (modeGroup,)
+	aggregates = {}
+	keyGetters = []
+	for aggregateGroup in modeGroups :
+		aggregates[aggregateGroup] = {}
+		keyFields = neededFields(aggregateGroup | SORT_PACKETS | OUT_DATA_PACKETS)
+		if len(keyFields) == 1 :
+			keyGetter = operator.itemgetter(keyFields[0])
+		else :
+			keyGetter = operator.itemgetter(*keyFields)
+		keyGetters.append( (aggregates[aggregateGroup], keyGetter) )
+	lengthField = SPLTcsv.length.value
+	for record in records :
+		packetBytes = record[lengthField]
+		for aggregate, keyGetter in keyGetters :
+			key = keyGetter(record)
+			totals = aggregate.get(key)
+			if totals is None :
+				aggregate[key] = [1, packetBytes]
+			else :
+				totals[0] += 1
+				totals[1] += packetBytes
+	# Render connection keys, key flows per flowKey()
+	if GROUP_BY_CONNECT in aggregates :
+		aggregates[GROUP_BY_CONNECT] = {src + " -> " + dest : totals for (src, dest), totals in aggregates[GROUP_BY_CONNECT].items()}
+	for flowGroup in GROUP_BY_FLOWS :
+		if flowGroup in aggregates :
+			flowAggregate = {}
+			for flow, (count, packetBytes) in aggregates[flowGroup].items() :
+				totals = flowAggregate.setdefault(flowKey(flow, flowGroup == GROUP_BY_BIFLOW), [0, 0])
+				totals[0] += count
+				totals[1] += packetBytes
+			aggregates[flowGroup] = flowAggregate
+	return aggregates
+
+def skipMalformedLines(
+		packetLines
+		, stats
+	) :
+	"""
+	Description: Generate packet lines that parse, malformed lines are counted into stats and skipped.
+	A line is malformed if it has fewer fields than SPLTcsv up to length, or its relTime or length field is not a number.
+	Arguments:
+		packetLines : Iterable of single line packet fields in CSV format, str or bytes
+		stats : RunStats to count malformed lines into
+	"""
+	relTimeField = SPLTcsv.relTime.value
+	lengthField = SPLTcsv.length.value
+	for packetLine in packetLines :
+		separator, stripChars = (b",", b'"\r\n ') if isinstance(packetLine, bytes) else (",", '"\r\n ')
+		fields = packetLine.split(separator, lengthField + 1)
+		try :
+			float( fields[relTimeField].strip(stripChars) )
+			int( fields[lengthField].strip(stripChars) )
+		except (IndexError, ValueError) :
+			stats.malformedLines += 1
+			continue
+		yield packetLine
+
+def batchPackets(
+		packets
+		, size
+	) :
+	"""
+	Description: Generate lists of at most size consecutive packets, lines or records.
+	Arguments:
+		packets : Iterable of packets
+		size : Maximum packets per list
+	"""
+	packets = iter(packets)
+	while True :
+		packetBatch = list( itertools.islice(packets, size) )
+		if not packetBatch :
+			return
+		yield packetBatch
+
 def configureDefaults(
 	) :
 	"""
@@ -669,6 +2712,196 @@ def configureDefaults(
 	  | IN_FORMAT_USE_DEFAULT \
 	  | OUT_DATA_USE_DEFAULT \
 	  | OUT_FORMAT_USE_DEFAULT
+	config["limit"] = None  # Maximum number of groups output, all if None
+	config["stream"] = False
+	config["jobs"] = 1  # Number of worker processes for ingestion
+	config["snapshot"] = True  # Use and write snapshot sidecars of input files
+	config["buildSnapshots"] = False  # Only write snapshot sidecars, no processing
+	config["numpy"] = True  # Use NumPy engine when available
+	config["follow"] = False  # Follow growing input, report periodically
+	config["interval"] = None  # Seconds between follow reports
+	config["batch"] = None  # Packets between follow reports
+	config["approx"] = None  # Space-Saving error bound, fraction of total, exact if None
+	config["window"] = None  # Seconds of relative time per window report, no windows if None
+	config["slide"] = None  # Seconds between sliding window starts, tumbling windows if None
+	config["prefix"] = PREFIX_DEFAULT  # (IPv4, IPv6) prefix length of prefix groups
+	config["subnets"] = None  # PrefixTrie of subnet groups, see readSubnets()
+	config["stats"] = None  # Run statistics file, "-" for standard error, not recorded if None
+	config["profile"] = None  # cProfile output file, not profiled if None
+
+def needsPeers(
+		mode
+	) :
+	"""
+	Description: Return whether peers are sorted or output per mode.
+	Arguments:
+		mode : Mode to sort and output per, other bits are ignored.
+	"""
+	return ((resolveMode(mode) & SORT_MASK) == SORT_PEERS) or bool(mode & OUT_DATA_PEERS)
+
+def resultMode(
+		mode
+	) :
+	"""
+	Description: Return bits of mode that processed results depend on, mode of result cache keys.
+	Arguments:
+		mode : Mode to process per
+	Return:
+		[int] : Resolved group, sort, and order bits, with OUT_DATA_PEERS if peers are needed, see needsPeers().
+	"""
+	resultBits = resolveMode(mode) & (GROUP_BY_MASK | SORT_MASK | ORDER_MASK)
+	if needsPeers(mode) :
+		resultBits |= OUT_DATA_PEERS
+	return resultBits
+
+def neededFields(
+		mode
+	) :
+	"""
+	Description: Return SPLTcsv field indices needed to group, sort, and output per mode, for column projection while parsing.
+	Arguments:
+		mode : Mode to group, sort, and output per, other bits are ignored.
+	Return:
+		[tuple] : Ascending tuple of SPLTcsv field values.
+	"""
+	modeGroup = aggregatedGroup(mode)
+	if modeGroup == GROUP_BY_SRC_ADDR :
+		fields = [SPLTcsv.srcAddr.value]
+	elif modeGroup == GROUP_BY_DEST_ADDR :
+		fields = [SPLTcsv.destAddr.value]
+	elif modeGroup == GROUP_BY_CONNECT :
+		fields = [SPLTcsv.srcAddr.value, SPLTcsv.destAddr.value]
+	elif modeGroup == GROUP_BY_PROTO :
+		fields = [SPLTcsv.protocol.value]
+	elif modeGroup == GROUP_BY_SRC_PORT :
+		fields = [SPLTcsv.srcPort.value]
+	elif modeGroup == GROUP_BY_DEST_PORT :
+		fields = [SPLTcsv.destPort.value]
+	elif modeGroup in GROUP_BY_FLOWS :
+		fields = [SPLTcsv.srcAddr.value, SPLTcsv.destAddr.value, SPLTcsv.srcPort.value, SPLTcsv.destPort.value, SPLTcsv.protocol.value]
+	elif modeGroup == GROUP_BY_ALL :
+		fields = [SPLTcsv.srcAddr.value, SPLTcsv.destAddr.value, SPLTcsv.protocol.value]
+	# Length is needed if bytes are sorted or output
+	modeSort = resolveMode(mode) & SORT_MASK
+	modeOutData = mode & OUT_DATA_MASK
+	if modeOutData == OUT_DATA_USE_DEFAULT :
+		modeOutData = OUT_DATA_DEFAULT
+	if (modeSort == SORT_BYTES) or (modeOutData & OUT_DATA_BYTES) :
+		fields.append(SPLTcsv.length.value)
+	return tuple(fields)
+
+def outputReport(
+		procPackets
+		, file = sys.stdout
+		, context = ()
+		, header = True
+	) :
+	"""
+	Description: Output results of procPackets per config, one section per group mode for GROUP_BY_ALL.
+	TSV sections are preceded by comment 'group mode', see outputComment(), CSV and JSON lines rows carry a 'mode' column instead.
+	Output is timed as output stage of statistics of procPackets, if recorded.
+	Arguments:
+		procPackets : ProcPackets to process
+		file : File object to output to
+		context : Tuple of (column name, value) pairs of the report, see renderResults()
+		header : Output CSV header row, see renderResults()
+	Return:
+		[bool] : Whether any rows were output.
+	"""
+	stats = procPackets.recallStats()
+	if (config["mode"] & GROUP_BY_MASK) == GROUP_BY_ALL :
+		allResults = procPackets.processAllGroups()
+		if stats is not None :
+			start = time.perf_counter()
+		outputRows = False
+		for groupName, modeGroup in (("src", GROUP_BY_SRC_ADDR), ("dest", GROUP_BY_DEST_ADDR), ("connect", GROUP_BY_CONNECT), ("proto", GROUP_BY_PROTO)) :
+			outputComment("group " + groupName, file, modeGroup != GROUP_BY_SRC_ADDR)
+			if outputResults(allResults[modeGroup], file, None, context + (("mode", groupName),), header and not outputRows) :
+				outputRows = True
+		if stats is not None :
+			stats.addSeconds("output", start)
+		return outputRows
+	results = procPackets.processPerMode()
+	if stats is not None :
+		start = time.perf_counter()
+	outputRows = outputResults(results, file, None, context, header)
+	if stats is not None :
+		stats.addSeconds("output", start)
+	return outputRows
+
+def outputComment(
+		comment
+		, file
+		, separate = False
+	) :
+	"""
+	Description: Output comment line '# comment' to file for TSV output formats, nothing for CSV and JSON lines, whose rows carry context columns instead.
+	Arguments:
+		comment : Comment text
+		file : File object of report output
+		separate : Precede comment by a blank line
+	"""
+	outFormat = config["mode"] & OUT_FORMAT_MASK
+	if outFormat == OUT_FORMAT_USE_DEFAULT :
+		outFormat = OUT_FORMAT_DEFAULT
+	if outFormat not in (OUT_FORMAT_TSV_HUMAN, OUT_FORMAT_TSV_SIMPLE) :
+		return
+	if separate :
+		print(file=file)
+	print("# " + comment, file=file)
+
+def outputStats(
+		stats
+		, file
+	) :
+	"""
+	Description: Output statistics, see RunStats.toDict().
+	Arguments:
+		stats : RunStats to output
+		file : Name of JSON file to write, or "-" for tab separated name and value lines on standard error
+	"""
+	statistics = stats.toDict()
+	if file == "-" :
+		sys.stderr.write( "".join(name + "\t" + str(value) + "\n" for name, value in statistics.items()) )
+		return
+	with open(file, "w") as statsFile :
+		json.dump(statistics, statsFile, indent="\t")
+		statsFile.write("\n")
+
+def outputWindows(
+		windows
+		, file = sys.stdout
+		, flush = False
+	) :
+	"""
+	Description: Output report of each window as it closes.
+	TSV reports are preceded by comment 'window [start, end)', see outputComment(), CSV and JSON lines rows carry 'start' and 'end' columns instead.
+	Arguments:
+		windows : Iterable of (start, end, ProcPackets) tuples, see windowReports()
+		file : File object to output to
+		flush : Flush file after each window, for live input
+	"""
+	firstWindow = True
+	header = True
+	for windowStart, windowEnd, procPackets in windows :
+		outputComment("window [%.6f, %.6f)" % (windowStart, windowEnd), file, not firstWindow)
+		firstWindow = False
+		if outputReport(procPackets, file, (("start", round(windowStart, 6)), ("end", round(windowEnd, 6))), header) :
+			header = False
+		if flush :
+			file.flush()
+
+def peakMemory(
+	) :
+	"""
+	Description: Return peak resident memory of process in bytes, None where not available.
+	"""
+	if resource is None :
+		return None
+	maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	if sys.platform == "darwin" :
+		return maxRss  # Bytes on macOS, kilobytes elsewhere
+	return maxRss * 1024
 
 def processCommandLine(
 		argv
@@ -685,10 +2918,10 @@ def processCommandLine(
 		print(__doc__)
 		sys.exit()
 	filenames = []
-	skipIt = False
+	skipIt = 0  # Arguments of sub-command left to skip
 	for i in range(1, len(argv)) :
 		if skipIt :
-			skipIt = False
+			skipIt -= 1
 			continue
 		if argv[i] == "group" :  # Argument: Sub-command: group
 			if i < len(argv) - 1 :
@@ -702,12 +2935,42 @@ def processCommandLine(
 					newGroupMode = GROUP_BY_CONNECT
 				elif groupByStr == "proto" :
 					newGroupMode = GROUP_BY_PROTO
+				elif groupByStr == "srcport" :
+					newGroupMode = GROUP_BY_SRC_PORT
+				elif groupByStr == "destport" :
+					newGroupMode = GROUP_BY_DEST_PORT
+				elif groupByStr == "flow" :
+					newGroupMode = GROUP_BY_FLOW
+				elif groupByStr == "biflow" :
+					newGroupMode = GROUP_BY_BIFLOW
+				elif groupByStr == "all" :
+					newGroupMode = GROUP_BY_ALL
+				elif groupByStr in ("src-prefix", "dest-prefix", "subnet", "dest-subnet") and (i < len(argv) - 2) :
+					groupByArg = argv[i+2]
+					skipIt = 1
+					if groupByStr in ("src-prefix", "dest-prefix") :
+						newGroupMode = GROUP_BY_SRC_PREFIX if groupByStr == "src-prefix" else GROUP_BY_DEST_PREFIX
+						try :
+							prefixLengths = [int(prefixLength) for prefixLength in groupByArg.split("/")]
+						except ValueError :
+							sys.exit("(netSort) ERROR: Improper 'group' Usage, see 'help'.")
+						if len(prefixLengths) == 1 :
+							prefixLengths = [min(prefixLengths[0], 32), prefixLengths[0]]
+						if (len(prefixLengths) != 2) or not (0 <= prefixLengths[0] <= 32) or not (0 <= prefixLengths[1] <= 128) :
+							sys.exit("(netSort) ERROR: Improper 'group' Usage, see 'help'.")
+						config["prefix"] = tuple(prefixLengths)
+					else :
+						newGroupMode = GROUP_BY_SRC_SUBNET if groupByStr == "subnet" else GROUP_BY_DEST_SUBNET
+						try :
+							config["subnets"] = readSubnets(groupByArg)
+						except (OSError, ValueError) :
+							sys.exit("(netSort) ERROR: Improper 'group' Usage, see 'help'.")
 				else :
 					sys.exit("(netSort) ERROR: Improper 'group' Usage, see 'help'.")
 				config["mode"] = saveCurrMode | newGroupMode
 			else :
 				sys.exit("(netSort) ERROR: Improper 'group' Usage, see 'help'.")
-			skipIt = True
+			skipIt += 1
 		elif argv[i] == "sort" :  # Argument: Sub-command: sort
 			if i < len(argv) - 1 :
 				saveCurrMode = config["mode"] & ~ SORT_MASK
@@ -716,12 +2979,14 @@ def processCommandLine(
 					newSortMode = SORT_PACKETS
 				elif sortStr == "bytes" :
 					newSortMode = SORT_BYTES
+				elif sortStr == "peers" :
+					newSortMode = SORT_PEERS
 				else :
 					sys.exit("(netSort) ERROR: Improper 'sort' Usage, see 'help'.")
 				config["mode"] = saveCurrMode | newSortMode
 			else :
 				sys.exit("(netSort) ERROR: Improper 'sort' Usage, see 'help'.")
-			skipIt = True
+			skipIt = 1
 		elif argv[i] == "order" :  # Argument: Sub-command: order
 			if i < len(argv) - 1 :
 				saveCurrMode = config["mode"] & ~ ORDER_MASK
@@ -735,43 +3000,1033 @@ def processCommandLine(
 				config["mode"] = saveCurrMode | newOrderMode
 			else :
 				sys.exit("(netOrder) ERROR: Improper 'order' Usage, see 'help'.")
-			skipIt = True
+			skipIt = 1
+		elif argv[i] == "top" :  # Argument: Sub-command: top
+			if i < len(argv) - 1 :
+				try :
+					config["limit"] = int(argv[i+1])
+				except ValueError :
+					sys.exit("(netSort) ERROR: Improper 'top' Usage, see 'help'.")
+				if config["limit"] < 1 :
+					sys.exit("(netSort) ERROR: Improper 'top' Usage, see 'help'.")
+			else :
+				sys.exit("(netSort) ERROR: Improper 'top' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "jobs" :  # Argument: Sub-command: jobs
+			if i < len(argv) - 1 :
+				try :
+					config["jobs"] = int(argv[i+1])
+				except ValueError :
+					sys.exit("(netSort) ERROR: Improper 'jobs' Usage, see 'help'.")
+				if config["jobs"] < 1 :
+					sys.exit("(netSort) ERROR: Improper 'jobs' Usage, see 'help'.")
+			else :
+				sys.exit("(netSort) ERROR: Improper 'jobs' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "input" :  # Argument: Sub-command: input
+			if i < len(argv) - 1 :
+				saveCurrMode = config["mode"] & ~ IN_FORMAT_MASK
+				inputStr = argv[i+1]
+				if inputStr == "csv" :
+					newInputMode = IN_FORMAT_CSV_NO_HEADER
+				elif inputStr == "csv-header" :
+					newInputMode = IN_FORMAT_CSV_HEADER
+				elif inputStr == "pcap" :
+					newInputMode = IN_FORMAT_PCAP
+				elif inputStr == "pcapng" :
+					newInputMode = IN_FORMAT_PCAPNG
+				else :
+					sys.exit("(netSort) ERROR: Improper 'input' Usage, see 'help'.")
+				config["mode"] = saveCurrMode | newInputMode
+			else :
+				sys.exit("(netSort) ERROR: Improper 'input' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "output" :  # Argument: Sub-command: output
+			if i < len(argv) - 1 :
+				saveCurrMode = config["mode"] & ~ OUT_FORMAT_MASK
+				outputStr = argv[i+1]
+				if outputStr == "tsv" :
+					newOutputMode = OUT_FORMAT_TSV_HUMAN
+				elif outputStr == "tsv-simple" :
+					newOutputMode = OUT_FORMAT_TSV_SIMPLE
+				elif outputStr == "csv" :
+					newOutputMode = OUT_FORMAT_CSV
+				elif outputStr == "json" :
+					newOutputMode = OUT_FORMAT_JSON_LINES
+				else :
+					sys.exit("(netSort) ERROR: Improper 'output' Usage, see 'help'.")
+				config["mode"] = saveCurrMode | newOutputMode
+			else :
+				sys.exit("(netSort) ERROR: Improper 'output' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "data" :  # Argument: Sub-command: data
+			if i < len(argv) - 1 :
+				saveCurrMode = config["mode"] & ~ OUT_DATA_MASK
+				newDataMode = OUT_DATA_USE_DEFAULT
+				for dataStr in argv[i+1].split(",") :
+					if dataStr == "sort" :
+						newDataMode |= OUT_DATA_TRACK_SORT
+					elif dataStr == "packets" :
+						newDataMode |= OUT_DATA_PACKETS
+					elif dataStr == "bytes" :
+						newDataMode |= OUT_DATA_BYTES
+					elif dataStr == "peers" :
+						newDataMode |= OUT_DATA_PEERS
+					else :
+						sys.exit("(netSort) ERROR: Improper 'data' Usage, see 'help'.")
+				config["mode"] = saveCurrMode | newDataMode
+			else :
+				sys.exit("(netSort) ERROR: Improper 'data' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "interval" :  # Argument: Sub-command: interval
+			if i < len(argv) - 1 :
+				try :
+					config["interval"] = float(argv[i+1])
+				except ValueError :
+					sys.exit("(netSort) ERROR: Improper 'interval' Usage, see 'help'.")
+				if not (config["interval"] > 0) :
+					sys.exit("(netSort) ERROR: Improper 'interval' Usage, see 'help'.")
+			else :
+				sys.exit("(netSort) ERROR: Improper 'interval' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "batch" :  # Argument: Sub-command: batch
+			if i < len(argv) - 1 :
+				try :
+					config["batch"] = int(argv[i+1])
+				except ValueError :
+					sys.exit("(netSort) ERROR: Improper 'batch' Usage, see 'help'.")
+				if config["batch"] < 1 :
+					sys.exit("(netSort) ERROR: Improper 'batch' Usage, see 'help'.")
+			else :
+				sys.exit("(netSort) ERROR: Improper 'batch' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "approx" :  # Argument: Sub-command: approx
+			if i < len(argv) - 1 :
+				try :
+					config["approx"] = float(argv[i+1])
+				except ValueError :
+					sys.exit("(netSort) ERROR: Improper 'approx' Usage, see 'help'.")
+				if not (0 < config["approx"] < 1) :
+					sys.exit("(netSort) ERROR: Improper 'approx' Usage, see 'help'.")
+			else :
+				sys.exit("(netSort) ERROR: Improper 'approx' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "window" :  # Argument: Sub-command: window
+			if i < len(argv) - 1 :
+				try :
+					config["window"] = float(argv[i+1])
+				except ValueError :
+					sys.exit("(netSort) ERROR: Improper 'window' Usage, see 'help'.")
+				if not (config["window"] > 0) :
+					sys.exit("(netSort) ERROR: Improper 'window' Usage, see 'help'.")
+			else :
+				sys.exit("(netSort) ERROR: Improper 'window' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "slide" :  # Argument: Sub-command: slide
+			if i < len(argv) - 1 :
+				try :
+					config["slide"] = float(argv[i+1])
+				except ValueError :
+					sys.exit("(netSort) ERROR: Improper 'slide' Usage, see 'help'.")
+				if not (config["slide"] > 0) :
+					sys.exit("(netSort) ERROR: Improper 'slide' Usage, see 'help'.")
+			else :
+				sys.exit("(netSort) ERROR: Improper 'slide' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "stats" :  # Argument: Sub-command: stats
+			if i < len(argv) - 1 :
+				config["stats"] = argv[i+1]
+			else :
+				sys.exit("(netSort) ERROR: Improper 'stats' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "profile" :  # Argument: Sub-command: profile
+			if i < len(argv) - 1 :
+				config["profile"] = argv[i+1]
+			else :
+				sys.exit("(netSort) ERROR: Improper 'profile' Usage, see 'help'.")
+			skipIt = 1
+		elif argv[i] == "follow" :  # Argument: Flag: follow
+			config["follow"] = True
+		elif argv[i] == "snapshot" :  # Argument: Flag: snapshot
+			config["buildSnapshots"] = True
+		elif argv[i] == "stream" :  # Argument: Flag: stream
+			config["stream"] = True
 		else :  # Argument: Input filename
 			filenames.append(argv[i])
+	if ((config["mode"] & SORT_MASK) == SORT_PEERS) and ((config["mode"] & GROUP_BY_MASK) in (GROUP_BY_CONNECT, GROUP_BY_FLOW, GROUP_BY_BIFLOW, GROUP_BY_ALL)) :
+		sys.exit("(netSort) ERROR: Improper 'sort' Usage, see 'help'.")
+	if (config["mode"] & OUT_DATA_PEERS) and ((config["mode"] & GROUP_BY_MASK) in (GROUP_BY_CONNECT, GROUP_BY_FLOW, GROUP_BY_BIFLOW, GROUP_BY_ALL)) :
+		sys.exit("(netSort) ERROR: Improper 'data' Usage, see 'help'.")
+	if ((config["mode"] & GROUP_BY_MASK) in GROUP_BY_ROLLUPS) and (config["approx"] is not None) :  # Pruned address groups would roll up to undercounted groups
+		sys.exit("(netSort) ERROR: Improper 'group' Usage, see 'help'.")
+	if (config["window"] is not None) and (config["approx"] is not None) :  # Panes are aggregated exactly
+		sys.exit("(netSort) ERROR: Improper 'approx' Usage, see 'help'.")
+	if ((config["mode"] & SORT_MASK) == SORT_PEERS) and (config["approx"] is not None) :  # Summary ranks by counts only
+		sys.exit("(netSort) ERROR: Improper 'sort' Usage, see 'help'.")
+	if (((config["mode"] & SORT_MASK) == SORT_PEERS) or (config["mode"] & OUT_DATA_PEERS)) and (config["window"] is not None) :  # Panes hold no peer sketches
+		sys.exit("(netSort) ERROR: Improper 'window' Usage, see 'help'.")
+	if config["slide"] is not None :
+		if config["window"] is None :
+			sys.exit("(netSort) ERROR: Improper 'slide' Usage, see 'help'.")
+		panesPerWindow = round(config["window"] / config["slide"])
+		if (panesPerWindow < 1) or (abs(panesPerWindow * config["slide"] - config["window"]) > 1e-9 * config["window"]) :
+			sys.exit("(netSort) ERROR: Improper 'slide' Usage, see 'help'.")
 	return filenames.copy()
 
+def processInputs(
+		inputFilenames
+		, stats = None
+	) :
+	"""
+	Description: Process input files per config, output reports or build snapshots.
+	Arguments:
+		inputFilenames : List of input filenames, see processCommandLine().
+		stats : RunStats to record into, see ProcPackets, nothing recorded if None
+	"""
+	inputFormat = config["mode"] & IN_FORMAT_MASK
+	# Build snapshots ahead of time
+	if config["buildSnapshots"] :
+		for inputFilename in inputFilenames :
+			fileFormat = detectFormat(inputFilename, inputFormat)
+			snapshot = RawPacketColumns()
+			if (fileFormat & IN_FORMAT_MASK) in (IN_FORMAT_PCAP, IN_FORMAT_PCAPNG) :
+				snapshot.extendRecords( readPacketRecords(inputFilename, fileFormat & IN_FORMAT_MASK) )
+			else :
+				snapshot.extendMapped( mapPacketLines(inputFilename, fileFormat) )
+			writeSnapshot(snapshot, inputFilename, fileFormat)
+		return
+	# Follow live input
+	if config["follow"] :
+		if len(inputFilenames) > 1 :
+			sys.exit("(netSort) ERROR: Improper 'follow' Usage, see 'help'.")
+		try :
+			if config["window"] is not None :
+				packetLines = (packetLine for packetChunk in followPacketLines(inputFilenames[0] if inputFilenames else "-", inputFormat) for packetLine in packetChunk)
+				outputWindows(windowReports(packetLines, config["window"], config["slide"]), flush=True)
+			else :
+				followReports(inputFilenames[0] if inputFilenames else "-", inputFormat, config["interval"], config["batch"])
+		except KeyboardInterrupt :
+			pass
+		return
+	# Report per time window, each input file in turn
+	if config["window"] is not None :
+		for inputFilename in inputFilenames :
+			fileFormat = detectFormat(inputFilename, inputFormat)
+			if (fileFormat & IN_FORMAT_MASK) in (IN_FORMAT_PCAP, IN_FORMAT_PCAPNG) :
+				sys.exit("(netSort) ERROR: Improper 'window' Usage, see 'help'.")
+			outputWindows(windowReports(mapPacketLines(inputFilename, fileFormat), config["window"], config["slide"]))
+		return
+	# Process input data
+	if config["jobs"] > 1 :
+		networkMetadata = ProcPackets(stream=True, project=True, approx=config["approx"], stats=stats)
+		networkMetadata.appendPacketsParallel(inputFilenames, inputFormat, jobs=config["jobs"])
+	else :
+		networkMetadata = ProcPackets(stream=config["stream"] or (config["approx"] is not None), project=True, approx=config["approx"], stats=stats)
+		for inputFilename in inputFilenames :
+			networkMetadata.appendPackets(inputFilename, inputFormat)
+	# Create ProcPackets and Output Results
+	outputReport(networkMetadata)
+
+def readPacketLines(
+		file
+		, format = IN_FORMAT_USE_DEFAULT
+	) :
+	"""
+	Description: Generate packet lines from file per format, header line skipped if any, file closed when exhausted.
+	Arguments:
+		file : Name of input file
+		format : Format of file
+	"""
+	# Prepare for opening input file
+	formatIn = format & IN_FORMAT_MASK
+	if formatIn == IN_FORMAT_USE_DEFAULT :
+		formatIn = IN_FORMAT_DEFAULT
+	fileOpenMode = "rt"
+	with open(file, mode=fileOpenMode) as packetsFile :
+		# Convert input file to packet per line format
+		packetPerLine = iter([])
+		if (formatIn & IN_FORMAT_CSV_HEADER) or (formatIn & IN_FORMAT_CSV_NO_HEADER) :
+			packetPerLine = packetsFile
+		if formatIn & IN_FORMAT_CSV_HEADER :
+			next(packetPerLine, None)
+		yield from packetPerLine
+
+def splitFileRanges(
+		file
+		, chunks
+	) :
+	"""
+	Description: Split file into at most chunks byte ranges of about equal size, each starting and ending on a line boundary.
+	Arguments:
+		file : Name of input file
+		chunks : Number of ranges requested
+	Return:
+		[list] : List of (start, end) byte offset tuples covering the whole file.
+	"""
+	fileSize = os.path.getsize(file)
+	boundaries = [0]
+	with open(file, mode="rb") as packetsFile :
+		for chunk in range(1, chunks) :
+			offset = (fileSize * chunk) // chunks
+			if offset <= boundaries[-1] :
+				continue
+			packetsFile.seek(offset - 1)
+			packetsFile.readline()  # Advance to start of next line
+			boundary = packetsFile.tell()
+			if boundary >= fileSize :
+				break
+			if boundary > boundaries[-1] :
+				boundaries.append(boundary)
+	boundaries.append(fileSize)
+	return list(zip(boundaries[:-1], boundaries[1:]))
+
+def readSnapshot(
+		file
+		, format = IN_FORMAT_USE_DEFAULT
+	) :
+	"""
+	Description: Load snapshot sidecar of file, valid only if written for same format and current size and modification time of file.
+	Arguments:
+		file : Name of input file, not of snapshot
+		format : Format of input file
+	Return:
+		[RawPacketColumns] : Packets of file, or None if snapshot is missing or invalid.
+	"""
+	formatIn = format & IN_FORMAT_MASK
+	if formatIn == IN_FORMAT_USE_DEFAULT :
+		formatIn = IN_FORMAT_DEFAULT
+	try :
+		sourceStat = os.stat(file)
+		with open(snapshotName(file), mode="rb") as snapshotFile :
+			header = snapshotFile.read(SNAPSHOT_HEADER.size)
+			if len(header) != SNAPSHOT_HEADER.size :
+				return None
+			magic, version, byteOrder, snapshotFormat, sourceSize, sourceMtime, packetCount, stringCount = SNAPSHOT_HEADER.unpack(header)
+			if (magic != SNAPSHOT_MAGIC) or (version != SNAPSHOT_VERSION) or (byteOrder != (sys.byteorder == "little")) \
+			   or (snapshotFormat != formatIn) or (sourceSize != sourceStat.st_size) or (sourceMtime != sourceStat.st_mtime_ns) :
+				return None
+			# String table, lengths then concatenated UTF-8
+			stringLengths = array.array("I")
+			stringLengths.fromfile(snapshotFile, stringCount)
+			stringBlob = snapshotFile.read(sum(stringLengths))
+			columns = RawPacketColumns()
+			position = 0
+			for stringLength in stringLengths :
+				columns.intern( stringBlob[position:position+stringLength].decode() )
+				position += stringLength
+			# Packed columns, bulk read
+			for columnName in SNAPSHOT_COLUMNS :
+				getattr(columns, columnName).fromfile(snapshotFile, packetCount)
+	except (OSError, EOFError, UnicodeDecodeError) :
+		return None
+	return columns
+
+def readSubnets(
+		file
+	) :
+	"""
+	Description: Read subnets file into PrefixTrie, one network in CIDR notation per line, optionally followed by its group label.
+	Blank lines and lines starting with '#' are skipped, host bits of networks are ignored.
+	Arguments:
+		file : Name of subnets file
+	Return:
+		[PrefixTrie] : Networks of file, labelled by their group label or CIDR notation.
+	"""
+	subnets = PrefixTrie()
+	with open(file) as subnetsFile :
+		for lineNumber, subnetLine in enumerate(subnetsFile, 1) :
+			fields = subnetLine.split(None, 1)
+			if (not fields) or fields[0].startswith("#") :
+				continue
+			try :
+				network = ipaddress.ip_network(fields[0], strict=False)
+			except ValueError :
+				raise ValueError("(netSort) ERROR: Improper subnet on line " + str(lineNumber) + " of '" + str(file) + "'.")
+			label = fields[1].strip() if len(fields) > 1 else None
+			subnets.insert(network, label or None)
+	return subnets
+
+def windowReports(
+		packetLines
+		, width
+		, hop = None
+	) :
+	"""
+	Description: Generate a ProcPackets per time window of relTime as each window closes, windows without packets are skipped.
+	Packets are folded per pane (hop seconds) and a window merges its panes, panes no open window covers are evicted.
+	A window closes at the first packet past its end, packets before the earliest open window are folded into it.
+	Arguments:
+		packetLines : Iterable of CSV packet lines as bytes in relTime order, no header line
+		width : Seconds per window
+		hop : Seconds between window starts, width divisible by hop, tumbling windows (hop = width) if None
+	"""
+	if hop is None :
+		hop = width
+	panesPerWindow = max(1, round(width / hop))
+	modeGroup = aggregatedGroup(config["mode"])  # Rolled up when processed
+	withBytes = SPLTcsv.length.value in neededFields(config["mode"])
+	relTimeField = SPLTcsv.relTime.value
+	panes = {}  # Pane index -> group mode -> aggregate
+	nextWindow = None  # Start pane of earliest open window
+	def foldPane(
+			pane
+			, paneLines
+		) :
+		"""
+		Description: Fold packet lines into group aggregates of pane.
+		Arguments:
+			pane : Pane index
+			paneLines : List of single line packet fields in CSV format, bytes
+		"""
+		paneAggregates = panes.setdefault(pane, {})
+		if modeGroup == GROUP_BY_ALL :
+			aggregateAllLines(paneLines, paneAggregates, withBytes, True)
+		else :
+			paneAggregates[modeGroup] = aggregateMappedLines(paneLines, modeGroup, paneAggregates.get(modeGroup), withBytes)
+	def closeWindows(
+			lastWindow
+		) :
+		"""
+		Description: Generate windows starting up to lastWindow, then drop panes of no open window.
+		Arguments:
+			lastWindow : Start pane of last window to close
+		"""
+		nonlocal nextWindow
+		windowStarts = sorted({windowStart for pane in panes for windowStart in range(max(pane - panesPerWindow + 1, nextWindow), pane + 1) if windowStart <= lastWindow})
+		for windowStart in windowStarts :
+			procPackets = ProcPackets(stream=True)
+			for pane in range(windowStart, windowStart + panesPerWindow) :
+				for paneGroup, paneAggregate in panes.get(pane, {}).items() :
+					procPackets.mergeAggregate(paneGroup, paneAggregate, withBytes)
+			yield windowStart * hop, windowStart * hop + width, procPackets
+		nextWindow = max(nextWindow, lastWindow + 1)
+		for pane in [pane for pane in panes if pane < nextWindow] :
+			del panes[pane]
+	currentPane = None
+	paneLines = []
+	for packetLine in packetLines :
+		pane = math.floor( float(packetLine.split(b",", relTimeField + 1)[relTimeField].strip(b'"')) / hop )
+		if nextWindow is None :
+			nextWindow = max(0, pane - panesPerWindow + 1)
+		pane = max(pane, nextWindow)
+		if (pane != currentPane) or (len(paneLines) >= WINDOW_BATCH_LINES) :
+			if paneLines :
+				foldPane(currentPane, paneLines)
+				paneLines = []
+			if (currentPane is not None) and (pane > currentPane) :
+				yield from closeWindows(pane - panesPerWindow)
+			currentPane = pane
+		paneLines.append(packetLine)
+	if paneLines :
+		foldPane(currentPane, paneLines)
+	if panes :
+		yield from closeWindows(max(panes))
+
+def writeSnapshot(
+		columns
+		, file
+		, format = IN_FORMAT_USE_DEFAULT
+	) :
+	"""
+	Description: Write packets parsed from file to its snapshot sidecar, see readSnapshot().
+	Nothing is written if frame numbers are not all integers.
+	Arguments:
+		columns : RawPacketColumns instance holding exactly the packets of file
+		file : Name of input file, not of snapshot
+		format : Format of input file
+	"""
+	if isinstance(columns.ID, list) :  # Frame numbers not all integers, see RawPacketColumns.appendFrame()
+		return
+	formatIn = format & IN_FORMAT_MASK
+	if formatIn == IN_FORMAT_USE_DEFAULT :
+		formatIn = IN_FORMAT_DEFAULT
+	sourceStat = os.stat(file)
+	encodedStrings = [string.encode() for string in columns.strings]
+	snapshotFileName = snapshotName(file)
+	temporaryFileName = snapshotFileName + ".tmp"
+	with open(temporaryFileName, mode="wb") as snapshotFile :
+		snapshotFile.write( SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder == "little", formatIn, sourceStat.st_size, sourceStat.st_mtime_ns, len(columns), len(encodedStrings)) )
+		array.array("I", map(len, encodedStrings)).tofile(snapshotFile)
+		snapshotFile.write( b"".join(encodedStrings) )
+		for columnName in SNAPSHOT_COLUMNS :
+			getattr(columns, columnName).tofile(snapshotFile)
+	os.replace(temporaryFileName, snapshotFileName)
+
+def snapshotName(
+		file
+	) :
+	"""
+	Description: Return name of snapshot sidecar of file.
+	Arguments:
+		file : Name of input file
+	"""
+	return os.fspath(file) + SNAPSHOT_SUFFIX
+
+def flowKey(
+		flow
+		, bidirectional = False
+	) :
+	"""
+	Description: Return flow table key of flow, a tuple of interned strings shared by all flows of an address, port, or protocol.
+	Bidirectional flows are ordered with the lesser (address, port) endpoint first, so both directions have the same key.
+	Arguments:
+		flow : Sequence of (src, dest, src port, dest port, proto) strings
+		bidirectional : Key canonical bidirectional flow
+	Return:
+		[tuple] : (src, dest, src port, dest port, proto), rendered for output by renderGroup().
+	"""
+	src, dest, srcPort, destPort, proto = map(sys.intern, flow)
+	if bidirectional and ( (dest, destPort) < (src, srcPort) ) :
+		return (dest, src, destPort, srcPort, proto)
+	return (src, dest, srcPort, destPort, proto)
+
+def renderFlow(
+		flow
+		, bidirectional = False
+	) :
+	"""
+	Description: Return group string of flow, 'src:port -> dest:port proto', IPv6 addresses bracketed, ports omitted if empty.
+	Bidirectional flows are ordered with the lesser (address, port) endpoint first, 'a:port <-> b:port proto', so both directions render the same.
+	Arguments:
+		flow : Sequence of (src, dest, src port, dest port, proto) strings
+		bidirectional : Render canonical bidirectional flow
+	Return:
+		[str] : Flow group string.
+	"""
+	src, dest, srcPort, destPort, proto = flow
+	arrow = " -> "
+	if bidirectional :
+		arrow = " <-> "
+		if (dest, destPort) < (src, srcPort) :
+			src, dest, srcPort, destPort = dest, src, destPort, srcPort
+	endpoints = []
+	for address, port in ((src, srcPort), (dest, destPort)) :
+		if not port :
+			endpoints.append(address)
+		elif (":" in address) and isIPv6(address) :  # MAC addresses are not bracketed
+			endpoints.append("[" + address + "]:" + port)
+		else :
+			endpoints.append(address + ":" + port)
+	return endpoints[0] + arrow + endpoints[1] + " " + proto
+
+def renderGroup(
+		modeGroup
+		, group
+	) :
+	"""
+	Description: Return group string of group table key of group mode, flow keys are rendered, see flowKey().
+	Arguments:
+		modeGroup : Group mode, resolved (not GROUP_BY_USE_DEFAULT)
+		group : Key of group table
+	Return:
+		[str] : Group string.
+	"""
+	if modeGroup in GROUP_BY_FLOWS :
+		return renderFlow(group, modeGroup == GROUP_BY_BIFLOW)
+	return group
+
+def isIPv6(
+		address
+	) :
+	"""
+	Description: Return whether address string is an IPv6 address, scope zone allowed.
+	Arguments:
+		address : Address string
+	"""
+	try :
+		ipaddress.IPv6Address(address)
+	except ValueError :
+		return False
+	return True
+
+def resolveMode(
+		mode
+	) :
+	"""
+	Description: Return mode with USE_DEFAULT group, sort, and order values replaced by their defaults.
+	Arguments:
+		mode : Mode to resolve
+	Return:
+		[int] : Resolved mode.
+	"""
+	if (mode & GROUP_BY_MASK) == GROUP_BY_USE_DEFAULT :
+		mode |= GROUP_BY_DEFAULT
+	if (mode & SORT_MASK) == SORT_USE_DEFAULT :
+		mode |= SORT_DEFAULT
+	if (mode & ORDER_MASK) == ORDER_USE_DEFAULT :
+		mode |= ORDER_DEFAULT
+	return mode
+
+def rollupLabel(
+		modeGroup
+		, address
+	) :
+	"""
+	Description: Return group of address per rolled up group mode, its network of config["prefix"] length or its longest matching config["subnets"] network.
+	Addresses that are not IP addresses are their own prefix group, and in subnet group SUBNET_UNMATCHED.
+	Arguments:
+		modeGroup : Rolled up group mode, see GROUP_BY_ROLLUPS
+		address : Address string
+	Return:
+		[str] : Network in CIDR notation, subnet label, or address.
+	"""
+	try :
+		ipAddress = ipaddress.ip_address(address)
+	except ValueError :
+		ipAddress = None
+	if modeGroup in (GROUP_BY_SRC_PREFIX, GROUP_BY_DEST_PREFIX) :
+		if ipAddress is None :
+			return address
+		prefixLength = config["prefix"][0] if ipAddress.version == 4 else config["prefix"][1]
+		return str( ipaddress.ip_network( (ipAddress, prefixLength), strict=False ) )
+	if config["subnets"] is None :
+		raise ValueError("(netSort) ERROR: Subnet groups require config[\"subnets\"], see readSubnets().")
+	label = None if ipAddress is None else config["subnets"].match(ipAddress)
+	if label is None :
+		return SUBNET_UNMATCHED
+	return label
+
+def sortKey(
+		mode
+		, withGroup = False
+	) :
+	"""
+	Description: Return sort key function of ProcPacket metric per sort mode.
+	Arguments:
+		mode : Mode to sort per, only sort bits are used.
+		withGroup : Key includes group as tie breaker, same ordering as ProcPacket rich comparisons.
+	Return:
+		[function] : Key function returning count or bytes of ProcPacket, or (metric, group) tuple if withGroup.
+	"""
+	modeSort = resolveMode(mode) & SORT_MASK
+	if modeSort == SORT_BYTES :
+		metric = "bytes"
+	elif modeSort == SORT_PEERS :
+		metric = "peers"
+	else :
+		metric = "count"
+	if withGroup :
+		return operator.attrgetter(metric, "group")
+	return operator.attrgetter(metric)
+
+def sortProcPackets(
+		procPackets
+		, mode
+		, limit = None
+	) :
+	"""
+	Description: Sort ProcPacket objects per sort and order mode, same ordering as ProcPacket rich comparisons.
+	Stable sort on group then on metric, equivalent to a single sort on a (metric, group) key.
+	Two passes on single value keys are kept as both use the specialized string and integer comparisons of list.sort(),
+	a single pass builds and compares a tuple per group and measures about twice as slow on many groups.
+	With limit, only the first limit objects are selected with a bounded heap, O(groups * log(limit)).
+	Arguments:
+		procPackets : Iterable of ProcPacket objects
+		mode : Mode to sort and order per.
+		limit : Maximum number of ProcPacket objects to return, all if None.
+	Return:
+		[list] : New list of ProcPacket objects, sorted.
+	"""
+	reverse = (resolveMode(mode) & ORDER_MASK) == ORDER_NUM_HIGH
+	if limit is not None :
+		if reverse :
+			return heapq.nlargest(limit, procPackets, key=sortKey(mode, True))
+		return heapq.nsmallest(limit, procPackets, key=sortKey(mode, True))
+	sortedPackets = sorted(procPackets, key=operator.attrgetter("group"), reverse=reverse)
+	sortedPackets.sort(key=sortKey(mode), reverse=reverse)
+	return sortedPackets
+
+def detectFormat(
+		file
+		, format = IN_FORMAT_USE_DEFAULT
+	) :
+	"""
+	Description: Return format of file, packet capture formats are detected by magic bytes when format is IN_FORMAT_USE_DEFAULT, compressed or not.
+	Arguments:
+		file : Name of input file
+		format : Format of file
+	Return:
+		[int] : format, or with input format bits replaced by IN_FORMAT_PCAP or IN_FORMAT_PCAPNG.
+	"""
+	if (format & IN_FORMAT_MASK) != IN_FORMAT_USE_DEFAULT :
+		return format
+	with openPacketsFile(file) as packetsFile :
+		magic = packetsFile.read(4)
+	if magic in PCAP_MAGIC :
+		return format | IN_FORMAT_PCAP
+	if magic == PCAPNG_MAGIC :
+		return format | IN_FORMAT_PCAPNG
+	return format
+
+def readPacketRecords(
+		file
+		, formatIn
+	) :
+	"""
+	Description: Generate decoded packet records of packet capture file, no text representation.
+	Arguments:
+		file : Name of input file, compressed or not
+		formatIn : IN_FORMAT_PCAP or IN_FORMAT_PCAPNG
+	"""
+	with openPacketsFile(file) as packetsFile :
+		if formatIn == IN_FORMAT_PCAP :
+			frames = readPcapFrames(packetsFile)
+		else :
+			frames = readPcapngFrames(packetsFile)
+		decoder = FrameDecoder()
+		frameNumber = 0
+		firstTime = None
+		for linkType, timestamp, frameData, length in frames :
+			frameNumber += 1
+			if firstTime is None :
+				firstTime = timestamp
+			yield (frameNumber, timestamp - firstTime) + decoder.decode(linkType, frameData) + (length,)
+
+def readPcapFrames(
+		packetsFile
+	) :
+	"""
+	Description: Generate (link type, timestamp, frame data, original length) of each record of pcap file.
+	Arguments:
+		packetsFile : Binary file object or memory map of pcap file, read sequentially
+	"""
+	read = packetsFile.read
+	fileHeader = read(24)
+	byteOrder, fractionsPerSecond = PCAP_MAGIC.get(fileHeader[0:4], (None, None))
+	if (byteOrder is None) or (len(fileHeader) < 24) :
+		raise ValueError("(netSort) ERROR: Not a pcap file.")
+	linkType = struct.unpack_from(byteOrder + "I", fileHeader, 20)[0] & 0xffff
+	recordHeader = struct.Struct(byteOrder + "IIII")
+	while True :
+		recordBytes = read(recordHeader.size)
+		if len(recordBytes) < recordHeader.size :
+			break
+		seconds, fraction, capturedLength, originalLength = recordHeader.unpack(recordBytes)
+		yield linkType, seconds + fraction / fractionsPerSecond, read(capturedLength), originalLength
+
+def readPcapngFrames(
+		packetsFile
+	) :
+	"""
+	Description: Generate (link type, timestamp, frame data, original length) of each packet block of pcapng file.
+	Arguments:
+		packetsFile : Binary file object or memory map of pcapng file, read sequentially
+	"""
+	read = packetsFile.read
+	byteOrder = "<"
+	interfaces = []  # (link type, snap length, timestamp units per second) per interface
+	while True :
+		blockHead = read(8)
+		if len(blockHead) < 8 :
+			break
+		if blockHead[0:4] == PCAPNG_MAGIC :
+			# Section Header Block, byte order magic decides byte order of section
+			byteOrderMagic = read(4)
+			byteOrder = "<" if byteOrderMagic == b"\x4d\x3c\x2b\x1a" else ">"
+			interfaces = []
+		blockType, blockLength = struct.unpack(byteOrder + "II", blockHead)
+		if blockLength < 12 :
+			raise ValueError("(netSort) ERROR: Malformed pcapng block.")
+		if blockType == 0x0a0d0d0a :
+			read(blockLength - 12)
+			continue
+		body = read(blockLength - 8)  # Block body and trailing block length
+		if blockType == 1 :  # Interface Description Block
+			linkType, snapLength = struct.unpack_from(byteOrder + "HxxI", body, 0)
+			unitsPerSecond = 1000000
+			option = 8
+			while option + 4 <= len(body) - 4 :
+				optionCode, optionLength = struct.unpack_from(byteOrder + "HH", body, option)
+				if optionCode == 0 :
+					break
+				if optionCode == 9 :  # if_tsresol
+					resolution = body[option + 4]
+					unitsPerSecond = (2 ** (resolution & 0x7f)) if resolution & 0x80 else (10 ** resolution)
+				option += 4 + ((optionLength + 3) & ~3)
+			interfaces.append( (linkType, snapLength, unitsPerSecond) )
+		elif blockType == 6 :  # Enhanced Packet Block
+			interface, timeHigh, timeLow, capturedLength, originalLength = struct.unpack_from(byteOrder + "IIIII", body, 0)
+			linkType, snapLength, unitsPerSecond = interfaces[interface]
+			yield linkType, ((timeHigh << 32) | timeLow) / unitsPerSecond, body[20:20+capturedLength], originalLength
+		elif blockType == 3 :  # Simple Packet Block, no timestamp
+			originalLength = struct.unpack_from(byteOrder + "I", body, 0)[0]
+			linkType, snapLength, unitsPerSecond = interfaces[0]
+			capturedLength = min(originalLength, snapLength) if snapLength else originalLength
+			yield linkType, 0.0, body[4:4+capturedLength], originalLength
+
+def compressionOf(
+		file
+	) :
+	"""
+	Description: Return decompression module of file per magic bytes, None if not compressed.
+	Arguments:
+		file : Name of input file
+	"""
+	with open(file, mode="rb") as packetsFile :
+		magic = packetsFile.read(COMPRESSION_MAGIC_BYTES)
+	for compressionMagic, compression in COMPRESSION_MAGIC :
+		if magic.startswith(compressionMagic) :
+			return compression
+	return None
+
+def openPacketsFile(
+		file
+	) :
+	"""
+	Description: Open file for binary sequential reading, compressed files are decompressed while read through a large buffer.
+	Arguments:
+		file : Name of input file
+	Return:
+		[file object] : Readable binary file object, caller closes.
+	"""
+	compression = compressionOf(file)
+	if compression is None :
+		return open(file, mode="rb", buffering=DECOMPRESS_BUFFER_BYTES)
+	return io.BufferedReader(compression.open(file, mode="rb"), buffer_size=DECOMPRESS_BUFFER_BYTES)
+
+def followPacketLines(
+		file
+		, format = IN_FORMAT_USE_DEFAULT
+	) :
+	"""
+	Description: Generate lists of packet lines as bytes as they are written to file or standard input, line ending excluded.
+	An empty list is generated when no complete line arrives within FOLLOW_POLL_SECONDS.
+	Standard input is exhausted at its end, files are followed until the caller stops.
+	Arguments:
+		file : Name of input file, "-" for standard input
+		format : Format of file, CSV only
+	"""
+	formatIn = format & IN_FORMAT_MASK
+	if formatIn == IN_FORMAT_USE_DEFAULT :
+		formatIn = IN_FORMAT_DEFAULT
+	if formatIn not in (IN_FORMAT_CSV_HEADER, IN_FORMAT_CSV_NO_HEADER) :
+		raise ValueError("(netSort) ERROR: Following input requires CSV format.")
+	packetsFile = None
+	if file == "-" :
+		fileDescriptor = sys.stdin.fileno()
+	else :
+		packetsFile = open(file, mode="rb", buffering=0)
+		fileDescriptor = packetsFile.fileno()
+	try :
+		skipHeader = formatIn == IN_FORMAT_CSV_HEADER
+		partialLine = b""
+		while True :
+			if packetsFile is None :
+				ready, _, _ = select.select([fileDescriptor], [], [], FOLLOW_POLL_SECONDS)
+				if not ready :
+					yield []
+					continue
+			data = os.read(fileDescriptor, FOLLOW_READ_BYTES)
+			if not data :
+				if packetsFile is None :  # End of standard input
+					break
+				time.sleep(FOLLOW_POLL_SECONDS)
+				yield []
+				continue
+			packetLines = (partialLine + data).split(b"\n")
+			partialLine = packetLines.pop()
+			if skipHeader and packetLines :
+				del packetLines[0]
+				skipHeader = False
+			yield packetLines
+		if partialLine and not skipHeader :
+			yield [partialLine]
+	finally :
+		if packetsFile is not None :
+			packetsFile.close()
+
+def followReports(
+		file
+		, format = IN_FORMAT_USE_DEFAULT
+		, interval = None
+		, batch = None
+		, output = sys.stdout
+	) :
+	"""
+	Description: Aggregate packets as they arrive on file or standard input, output a report every interval seconds and every batch packets.
+	TSV reports are preceded by comment 'report N, P packets', see outputComment(), CSV and JSON lines rows carry a 'report' column instead.
+	A final report is output at the end of standard input, unless no packets arrived since the last report.
+	Groups are approximate per config["approx"], see ProcPackets.__init__().
+	Arguments:
+		file : Name of input file, "-" for standard input
+		format : Format of file, CSV only
+		interval : Seconds between reports, FOLLOW_INTERVAL_DEFAULT if both interval and batch are None
+		batch : Packets between reports
+		output : File object to output reports to
+	"""
+	if (interval is None) and (batch is None) :
+		interval = FOLLOW_INTERVAL_DEFAULT
+	procPackets = ProcPackets(stream=True, project=True, approx=config["approx"])
+	reportNumber = 0
+	header = True  # CSV header row not yet output
+	reportedPackets = None
+	totalPackets = 0
+	batchPackets = 0
+	def report(
+		) :
+		"""
+		Description: Output report of packets folded so far, preceded by its comment line.
+		"""
+		nonlocal reportNumber, reportedPackets, header
+		reportedPackets = totalPackets
+		reportNumber += 1
+		outputComment("report " + str(reportNumber) + ", " + str(totalPackets) + " packets", output, reportNumber > 1)
+		if outputReport(procPackets, output, (("report", reportNumber),), header) :
+			header = False
+		output.flush()
+	nextReport = None if interval is None else time.monotonic() + interval
+	for packetLines in followPacketLines(file, format) :
+		# Fold packets, report at each full batch
+		while packetLines :
+			take = len(packetLines) if batch is None else min(len(packetLines), batch - batchPackets)
+			procPackets.appendPacketLines(packetLines[:take])
+			packetLines = packetLines[take:]
+			totalPackets += take
+			batchPackets += take
+			if batchPackets == batch :
+				batchPackets = 0
+				report()
+		if (nextReport is not None) and (time.monotonic() >= nextReport) :
+			report()
+			nextReport = time.monotonic() + interval
+	if reportedPackets != totalPackets :
+		report()
+
+def mapPacketLines(
+		file
+		, format = IN_FORMAT_USE_DEFAULT
+		, start = 0
+		, end = None
+	) :
+	"""
+	Description: Generate packet lines as bytes from memory mapped file per format, no decoding, line ending excluded.
+	Compressed files are decompressed while read instead, whole file only.
+	Arguments:
+		file : Name of input file
+		format : Format of file
+		start : Byte offset of first line, newline aligned, header line only skipped when 0
+		end : Byte offset after last line, newline aligned, end of file if None
+	"""
+	formatIn = format & IN_FORMAT_MASK
+	if formatIn == IN_FORMAT_USE_DEFAULT :
+		formatIn = IN_FORMAT_DEFAULT
+	if not ((formatIn & IN_FORMAT_CSV_HEADER) or (formatIn & IN_FORMAT_CSV_NO_HEADER)) :
+		return
+	if compressionOf(file) is not None :
+		if (start != 0) or (end is not None) :
+			raise ValueError("(netSort) ERROR: Compressed files can not be read by byte range.")
+		with openPacketsFile(file) as packetsFile :
+			if formatIn & IN_FORMAT_CSV_HEADER :
+				packetsFile.readline()
+			for packetLine in packetsFile :
+				yield packetLine.rstrip(b"\n")
+		return
+	with open(file, mode="rb") as packetsFile :
+		if os.fstat(packetsFile.fileno()).st_size == 0 :  # Empty files can not be mapped
+			return
+		with mmap.mmap(packetsFile.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile :
+			if end is None :
+				end = len(mappedFile)
+			find = mappedFile.find
+			position = start
+			if (start == 0) and (formatIn & IN_FORMAT_CSV_HEADER) :
+				newline = find(b"\n", 0, end)
+				position = end if newline < 0 else newline + 1
+			while position < end :
+				newline = find(b"\n", position, end)
+				if newline < 0 :
+					newline = end
+				yield mappedFile[position:newline]
+				position = newline + 1
+
 def outputResults(
 		results
 		, file = sys.stdout
 		, mode = None
+		, context = ()
+		, header = True
 	) :
 	"""
-	Description: ...
+	Description: Output results per output data and output format mode, rendered in batches of OUTPUT_BATCH_ROWS rows, one write per batch.
+	Arguments:
+		results : Iterable of ProcPacket objects
+		file : File object to output to
+		mode : Mode to output per, or config["mode"] if None.
+		context : Tuple of (column name, value) pairs, see renderResults()
+		header : Output CSV header row, see renderResults()
+	Return:
+		[bool] : Whether any rows were output.
 	"""
-	if mode is not None :
-		outDataMode = mode & OUT_DATA_MASK
-		sortMode = mode & SORT_MASK
-	else :
-		outDataMode = config["mode"] & OUT_DATA_MASK
-		sortMode = config["mode"] & SORT_MASK
+	outputRows = False
+	for outputBatch in renderResults(results, mode, context, header) :
+		file.write(outputBatch)
+		outputRows = True
+	return outputRows
+
+def renderResults(
+		results
+		, mode = None
+		, context = ()
+		, header = True
+	) :
+	"""
+	Description: Generate output of results as strings of at most OUTPUT_BATCH_ROWS rows each, see outputResults().
+	Columns are the group, then packets, bytes, and peers per output data flags, then the error of approximate results.
+	OUT_DATA_TRACK_SORT adds the sorted metric. Formats other than OUT_FORMAT_TSV_HUMAN name their columns, TSV and CSV in a header row.
+	CSV and JSON lines rows are preceded by context columns, TSV sections are told apart by comment lines instead, see outputComment().
+	Arguments:
+		results : Iterable of ProcPacket objects
+		mode : Mode to output per, or config["mode"] if None.
+		context : Tuple of (column name, value) pairs of the section, window, or report of results, CSV and JSON lines only
+		header : Output CSV header row, else continue a CSV table of same columns, TSV sections always have their own
+	"""
+	if mode is None :
+		mode = config["mode"]
+	outDataMode = mode & OUT_DATA_MASK
 	if outDataMode == OUT_DATA_USE_DEFAULT :
 		outDataMode = OUT_DATA_DEFAULT
-	if outDataMode == OUT_DATA_TRACK_SORT :
-		if sortMode == SORT_USE_DEFAULT :
-			sortMode = SORT_DEFAULT
-		if sortMode == SORT_PACKETS :
-			outDataMode = OUT_DATA_PACKETS
-		elif sortMode == SORT_BYTES :
-			outDataMode = OUT_DATA_BYTES
-		elif sortMode == SORT_EXTEND_01 :
-			...
-	for resultProcPacket in results :
-		outData = str(resultProcPacket.group) + "\t"
-		if outDataMode == OUT_DATA_PACKETS :
-			outData += str(resultProcPacket.count)
-		elif outDataMode == OUT_DATA_BYTES :
-			outData += str(resultProcPacket.bytes)
-		print(outData, file=file)
+	if outDataMode & OUT_DATA_TRACK_SORT :
+		outDataMode |= SORT_OUT_DATA[resolveMode(mode) & SORT_MASK]
+	outFormat = mode & OUT_FORMAT_MASK
+	if outFormat == OUT_FORMAT_USE_DEFAULT :
+		outFormat = OUT_FORMAT_DEFAULT
+	if outFormat in (OUT_FORMAT_TSV_HUMAN, OUT_FORMAT_TSV_SIMPLE) :
+		context = ()
+	contextNames = [contextName for contextName, contextValue in context]
+	contextValues = tuple(contextValue for contextName, contextValue in context)
+	columnNames = [columnName for outDataFlag, columnName, attributeName in OUT_DATA_COLUMNS if outDataMode & outDataFlag]
+	attributeNames = [attributeName for outDataFlag, columnName, attributeName in OUT_DATA_COLUMNS if outDataMode & outDataFlag]
+	firstBatch = True
+	for resultBatch in batchPackets(results, OUTPUT_BATCH_ROWS) :
+		# Row values fetched by a single attribute getter, errors only of approximate results
+		withErrors = resultBatch[0].error is not None  # Results are all approximate or all exact
+		rowNames = contextNames + ["group"] + columnNames + (["error"] if withErrors else [])
+		rowValues = operator.attrgetter("group", *attributeNames, *(["error"] if withErrors else []))
+		headerRow = ""
+		if firstBatch and ( (outFormat == OUT_FORMAT_TSV_SIMPLE) or (header and (outFormat == OUT_FORMAT_CSV)) ) :
+			headerRow = ("\t" if outFormat == OUT_FORMAT_TSV_SIMPLE else ",").join(rowNames) + "\n"
+		firstBatch = False
+		# Rows
+		if outFormat in (OUT_FORMAT_TSV_HUMAN, OUT_FORMAT_TSV_SIMPLE) :
+			rowTemplate = "\t".join(["%s"] * len(rowNames)) + "\n"
+			yield headerRow + "".join([rowTemplate % rowValues(procPacket) for procPacket in resultBatch])
+		elif outFormat == OUT_FORMAT_CSV :
+			outputBuffer = io.StringIO()
+			outputBuffer.write(headerRow)
+			csv.writer(outputBuffer, lineterminator="\n").writerows( [contextValues + rowValues(procPacket) for procPacket in resultBatch] if context else map(rowValues, resultBatch) )
+			yield outputBuffer.getvalue()
+		elif outFormat == OUT_FORMAT_JSON_LINES :
+			# Objects rendered from a template, only groups need JSON string escaping, context values are rendered once
+			dumps = json.dumps
+			rowTemplate = "{" + ", ".join( ['"' + contextName + '": ' + dumps(contextValue).replace("%", "%%") for contextName, contextValue in context]
+			  + ['"' + rowName + '": ' + ("%s" if rowName == "group" else "%d") for rowName in rowNames[len(contextNames):]] ) + "}\n"
+			rows = []
+			for procPacket in resultBatch :
+				values = rowValues(procPacket)
+				rows.append( rowTemplate % ( (dumps(str(values[0])),) + values[1:] ) )
+			yield "".join(rows)
+		else :
+			raise ValueError("(netSort) ERROR: Output format is not supported.")
 
 configureDefaults()
 if __name__ == "__main__" :  # Called as standalone program
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+
+"""
+NAME
+	netSortBench - Benchmark for Network Traffic Sorter (netSort). Time each processing stage on a synthetic capture.
+
+SYNOPSIS
+	netSortBench [count N] [groups N] [skew S] [seed N] [repeat N] [capture FILE] [save FILE] [compare FILE] [threshold PERCENT] [netSort options...]
+	netSortBench help
+
+DESCRIPTION
+	Generate a deterministic synthetic capture in SPLTcsv format, then time each stage of processing it per netSort options.
+	Output one line per stage: stage, seconds, packets per second; then groups and peak resident memory.
+	Stages are timed apart, each the fastest of 'repeat' runs:
+		parse : ProcPackets.appendPackets() of the capture, snapshots disabled, aggregation included in stream mode.
+		group : Grouping of packets into ProcPacket objects (ProcPackets.__processGroupBy()).
+		sort : Sorting and top N selection of groups (sortProcPackets()).
+		output : Output of sorted groups to the null device (outputResults()).
+		total : Sum of the stages.
+	netSort options are those of netSort processing, e.g. group, sort, order, top, stream, output, data, see 'netSort help'.
+	Group 'all', approx, jobs, window, follow, and snapshot are not benchmarked.
+
+	count : Number of packets in capture.
+		N : Positive integer, default 1000000.
+
+	groups : Number of distinct addresses in capture, packets per address follow 'skew'.
+		N : Positive integer at most 16777216, default 10000.
+
+	skew : Zipf exponent of address popularity, address of rank r is drawn with weight 1 / r ** S.
+		S : Non-negative number, 0 for uniform, default 1.
+
+	seed : Seed of capture generator, same arguments generate the same capture.
+		N : Integer, default 0.
+
+	repeat : Runs per stage, fastest reported.
+		N : Positive integer, default 3.
+
+	capture : Write capture to FILE and keep it, instead of a removed temporary file.
+
+	save : Write results to FILE as JSON, for later 'compare'.
+
+	compare : Compare results with earlier results saved to FILE, output change per stage.
+		Exits with error if a stage is slower by more than 'threshold', for regression checks.
+
+	threshold : Slowdown per stage tolerated by 'compare'.
+		PERCENT : Non-negative number, default 10.
+
+	help : Print this help file.
+"""
+
+
+# Required imports
+import itertools  # Iteration Tools Module: accumulate()
+import json  # JSON Module: dump(), load()
+import os  # Operating System Module: devnull, remove()
+import platform  # Platform Module: python_version()
+import random  # Random Module: Random()
+import sys  # System Module: argv, stdout
+import tempfile  # Temporary File Module: mkstemp()
+import time  # Time Module: perf_counter()
+import netSort  # Network Traffic Sorter Module: *
+
+
+# Declare Required Constants (Immutables)
+RESULTS_VERSION        = 1  # Format version of saved results
+STAGES                 = ("parse", "group", "sort", "output")
+GENERATE_BATCH_PACKETS = 0o200000  # Packets drawn and written per batch
+GENERATE_GROUPS_MAX    = 1 << 24  # Distinct addresses of 10.0.0.0/8
+GENERATE_PROTOCOLS     = ("TCP", "UDP", "DNS", "HTTP", "TLSv1.2", "ICMP")
+GENERATE_PORTS         = ("53", "80", "443", "123", "1025", "5353", "8080", "49152")
+GENERATE_PACKET_RATE   = 10000  # Packets per second of relative time
+GENERATE_LENGTHS       = range(60, 1515)  # Packet lengths, uniform
+
+
+# Declare Required Variables (Mutables)
+config = {}
+
+
+# Function Definitions
+
+def main(
+		cmdArgv = None
+	) :
+	"""
+	Description: Main program control flow and logic.
+	Arguments:
+		cmdArgv : Command line arguments, expect same format as sys.argv.
+	"""
+	# Set Up Environment
+	configureDefaults()
+	netSort.configureDefaults()
+	if cmdArgv is None :
+		argv = sys.argv
+	else :
+		argv = cmdArgv
+	processCommandLine(argv.copy())
+	# Generate capture
+	captureFile = config["capture"]
+	if captureFile is None :
+		fileDescriptor, captureFile = tempfile.mkstemp(suffix=".csv")
+		os.close(fileDescriptor)
+	try :
+		generateCapture(captureFile, config["packets"], config["groups"], config["skew"], config["seed"])
+		results = runBenchmark(captureFile, config["repeat"])
+	finally :
+		if config["capture"] is None :
+			os.remove(captureFile)
+	outputBenchmark(results)
+	if config["save"] is not None :
+		with open(config["save"], mode="w") as resultsFile :
+			json.dump(results, resultsFile, indent="\t", sort_keys=True)
+			resultsFile.write("\n")
+	# Compare with earlier results
+	if config["compare"] is not None :
+		with open(config["compare"]) as baselineFile :
+			baseline = json.load(baselineFile)
+		regressions = outputComparison(baseline, results, config["threshold"])
+		if regressions :
+			sys.exit("(netSortBench) ERROR: Stages slower than threshold: " + ", ".join(regressions) + ".")
+
+def configureDefaults(
+	) :
+	"""
+	Description: Assign default configuration to config.
+	"""
+	config["packets"] = 1000000  # Packets in capture
+	config["groups"] = 10000  # Distinct addresses in capture
+	config["skew"] = 1.0  # Zipf exponent of address popularity
+	config["seed"] = 0  # Seed of capture generator
+	config["repeat"] = 3  # Runs per stage, fastest reported
+	config["capture"] = None  # File to keep capture in, temporary if None
+	config["save"] = None  # File to save results to
+	config["compare"] = None  # File of earlier results to compare with
+	config["threshold"] = 10.0  # Percent slowdown per stage tolerated by compare
+	config["netSortArgv"] = []  # Arguments passed to netSort.processCommandLine()
+
+def compareResults(
+		baseline
+		, results
+		, threshold = 10.0
+	) :
+	"""
+	Description: Compare stage timings of results with baseline results.
+	Arguments:
+		baseline : Earlier results, see runBenchmark()
+		results : Current results
+		threshold : Percent slowdown of a stage counted as regression
+	Return:
+		[list] : List of (stage, baseline seconds, seconds, percent change, regressed) tuples, stages of both results only.
+	"""
+	comparison = []
+	for stage in STAGES + ("total",) :
+		if (stage not in baseline["stages"]) or (stage not in results["stages"]) :
+			continue
+		baselineSeconds = baseline["stages"][stage]["seconds"]
+		seconds = results["stages"][stage]["seconds"]
+		change = 100.0 * (seconds - baselineSeconds) / baselineSeconds if baselineSeconds > 0 else 0.0
+		comparison.append( (stage, baselineSeconds, seconds, change, change > threshold) )
+	return comparison
+
+def generateCapture(
+		file
+		, packets
+		, groups
+		, skew = 1.0
+		, seed = 0
+	) :
+	"""
+	Description: Write synthetic capture in SPLTcsv format, deterministic per arguments.
+	Source and destination addresses are drawn from groups distinct IPv4 addresses, rank r with weight 1 / r ** skew.
+	Ports, protocols, and lengths are drawn uniformly, relative time advances GENERATE_PACKET_RATE packets per second.
+	Arguments:
+		file : Name of file to write
+		packets : Number of packets
+		groups : Number of distinct addresses, at most GENERATE_GROUPS_MAX
+		skew : Zipf exponent of address popularity, 0 for uniform
+		seed : Seed of random number generator
+	"""
+	if not (0 < groups <= GENERATE_GROUPS_MAX) :
+		raise ValueError("(netSortBench) ERROR: Number of groups must be between 1 and " + str(GENERATE_GROUPS_MAX) + ".")
+	randomness = random.Random(seed)
+	# Addresses in random order, so popularity rank is not address order
+	addresses = ["10.%d.%d.%d" % (index >> 16, (index >> 8) & 0xff, index & 0xff) for index in range(groups)]
+	randomness.shuffle(addresses)
+	cumulativeWeights = list( itertools.accumulate(rank ** -skew for rank in range(1, groups + 1)) )
+	with open(file, mode="w") as captureFile :
+		for batchStart in range(0, packets, GENERATE_BATCH_PACKETS) :
+			batchPackets = min(GENERATE_BATCH_PACKETS, packets - batchStart)
+			srcAddrs = randomness.choices(addresses, cum_weights=cumulativeWeights, k=batchPackets)
+			destAddrs = randomness.choices(addresses, cum_weights=cumulativeWeights, k=batchPackets)
+			srcPorts = randomness.choices(GENERATE_PORTS, k=batchPackets)
+			destPorts = randomness.choices(GENERATE_PORTS, k=batchPackets)
+			protocols = randomness.choices(GENERATE_PROTOCOLS, k=batchPackets)
+			lengths = randomness.choices(GENERATE_LENGTHS, k=batchPackets)
+			frames = range(batchStart + 1, batchStart + batchPackets + 1)
+			captureFile.write( "".join([
+				'"%d","%.6f","%s","%s","%s","%s","%s","%d",""\n' % (frame, frame / GENERATE_PACKET_RATE, srcAddr, destAddr, srcPort, destPort, protocol, length)
+				for frame, srcAddr, destAddr, srcPort, destPort, protocol, length in zip(frames, srcAddrs, destAddrs, srcPorts, destPorts, protocols, lengths)
+			]) )
+
+def outputBenchmark(
+		results
+		, file = sys.stdout
+	) :
+	"""
+	Description: Output stage timings of results, one line per stage, then groups and peak resident memory.
+	Arguments:
+		results : Results, see runBenchmark()
+		file : File object to output to
+	"""
+	for stage in STAGES + ("total",) :
+		stageResults = results["stages"][stage]
+		print(stage + "\t" + "%.6f" % stageResults["seconds"] + "\t" + "%.0f" % stageResults["packetsPerSecond"], file=file)
+	print("groups\t" + str(results["groups"]), file=file)
+	if results["peakRssBytes"] is not None :
+		print("peakRssBytes\t" + str(results["peakRssBytes"]), file=file)
+
+def outputComparison(
+		baseline
+		, results
+		, threshold = 10.0
+		, file = sys.stdout
+	) :
+	"""
+	Description: Output comparison of results with baseline, one line per stage: stage, baseline seconds, seconds, percent change.
+	Arguments:
+		baseline : Earlier results, see runBenchmark()
+		results : Current results
+		threshold : Percent slowdown of a stage counted as regression, marked as such
+		file : File object to output to
+	Return:
+		[list] : List of regressed stages.
+	"""
+	if baseline["parameters"] != results["parameters"] :
+		print("# compare: parameters differ from baseline, timings may not be comparable", file=file)
+	regressions = []
+	for stage, baselineSeconds, seconds, change, regressed in compareResults(baseline, results, threshold) :
+		outData = stage + "\t" + "%.6f" % baselineSeconds + "\t" + "%.6f" % seconds + "\t" + "%+.1f%%" % change
+		if regressed :
+			outData += "\tregression"
+			regressions.append(stage)
+		print(outData, file=file)
+	return regressions
+
+def processCommandLine(
+		argv
+	) :
+	"""
+	Description: Process benchmark arguments into config, remaining arguments are processed as netSort options into netSort.config.
+	Arguments:
+		argv : Command line arguments, expect same format as sys.argv.
+	"""
+	# Handle help option
+	if "help" in argv :
+		print(__doc__)
+		sys.exit()
+	# Benchmark sub-commands -> (config key, type, minimum)
+	subCommands = {
+		"count" : ("packets", int, 1)
+		, "groups" : ("groups", int, 1)
+		, "skew" : ("skew", float, 0)
+		, "seed" : ("seed", int, None)
+		, "repeat" : ("repeat", int, 1)
+		, "capture" : ("capture", str, None)
+		, "save" : ("save", str, None)
+		, "compare" : ("compare", str, None)
+		, "threshold" : ("threshold", float, 0)
+	}
+	netSortArgv = [argv[0]]
+	skipIt = 0  # Arguments of sub-command left to skip
+	for i in range(1, len(argv)) :
+		if skipIt :
+			skipIt -= 1
+			continue
+		if argv[i] in subCommands :  # Argument: Sub-command: benchmark
+			configKey, valueType, minimum = subCommands[argv[i]]
+			if i < len(argv) - 1 :
+				try :
+					config[configKey] = valueType(argv[i+1])
+				except ValueError :
+					sys.exit("(netSortBench) ERROR: Improper '" + argv[i] + "' Usage, see 'help'.")
+				if (minimum is not None) and not (config[configKey] >= minimum) :
+					sys.exit("(netSortBench) ERROR: Improper '" + argv[i] + "' Usage, see 'help'.")
+			else :
+				sys.exit("(netSortBench) ERROR: Improper '" + argv[i] + "' Usage, see 'help'.")
+			skipIt = 1
+		else :  # Argument: netSort option
+			netSortArgv.append(argv[i])
+	if config["groups"] > GENERATE_GROUPS_MAX :
+		sys.exit("(netSortBench) ERROR: Improper 'groups' Usage, see 'help'.")
+	if netSort.processCommandLine(netSortArgv) :
+		sys.exit("(netSortBench) ERROR: Input files are generated, see 'help'.")
+	if (netSort.config["mode"] & netSort.GROUP_BY_MASK) == netSort.GROUP_BY_ALL :
+		sys.exit("(netSortBench) ERROR: Improper 'group' Usage, see 'help'.")
+	config["netSortArgv"] = netSortArgv[1:]
+
+def runBenchmark(
+		file
+		, repeat = 1
+	) :
+	"""
+	Description: Time each stage of processing file per netSort.config, fastest of repeat runs per stage.
+	Arguments:
+		file : Name of capture file
+		repeat : Runs per stage
+	Return:
+		[dict] : Results: parameters, stages of stage to seconds and packets per second, groups, peak resident memory in bytes.
+	"""
+	netSort.config["snapshot"] = False  # Time parsing, not snapshot loading
+	mode = netSort.config["mode"]
+	stageSeconds = dict.fromkeys(STAGES, float("inf"))
+	with open(os.devnull, mode="w") as nullFile :
+		for run in range(repeat) :
+			procPackets = netSort.ProcPackets(stream=netSort.config["stream"], project=True)
+			start = time.perf_counter()
+			procPackets.appendPackets(file, mode & netSort.IN_FORMAT_MASK)
+			stageSeconds["parse"] = min(stageSeconds["parse"], time.perf_counter() - start)
+			# Stages of processPerMode() timed apart, through its private steps
+			start = time.perf_counter()
+			procPackets._ProcPackets__processGroupBy()
+			stageSeconds["group"] = min(stageSeconds["group"], time.perf_counter() - start)
+			groups = list( procPackets._ProcPackets__procPackets.values() )
+			start = time.perf_counter()
+			results = netSort.sortProcPackets(groups, mode, netSort.config["limit"])
+			stageSeconds["sort"] = min(stageSeconds["sort"], time.perf_counter() - start)
+			start = time.perf_counter()
+			netSort.outputResults(results, nullFile, mode)
+			stageSeconds["output"] = min(stageSeconds["output"], time.perf_counter() - start)
+	packets = sum(procPacket.count for procPacket in groups)
+	stageSeconds["total"] = sum(stageSeconds.values())
+	return {
+		"version" : RESULTS_VERSION
+		, "parameters" : {
+			"packets" : config["packets"]
+			, "groups" : config["groups"]
+			, "skew" : config["skew"]
+			, "seed" : config["seed"]
+			, "netSort" : config["netSortArgv"]
+		}
+		, "python" : platform.python_version()
+		, "numpy" : netSort.numpy is not None
+		, "stages" : {stage : {"seconds" : seconds, "packetsPerSecond" : packets / seconds if seconds > 0 else 0.0} for stage, seconds in stageSeconds.items()}
+		, "groups" : len(groups)
+		, "peakRssBytes" : netSort.peakMemory()
+	}
+
+if __name__ == "__main__" :  # Called as standalone program
+	main()
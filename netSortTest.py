@@ -14,12 +14,69 @@ DESCRIPTION
 	(FUTURE) If arguments, then only perform categorical unit tests per below.
 
 	raw : Test RawPacket class
+	columns : Test RawPacketColumns class
+	stream : Test ProcPackets stream mode
+	numpy : Test ProcPackets NumPy engine
+	sort : Test sortProcPackets function
+	top : Test ProcPackets top N selection
+	parallel : Test ProcPackets parallel ingestion
+	ranges : Test newline aligned byte range parsing
+	project : Test column projection while parsing
+	all : Test ProcPackets all group modes from single pass
+	cache : Test ProcPackets result cache
+	incremental : Test ProcPackets incremental aggregation on append
+	snapshot : Test snapshot sidecar of input files
+	capture : Test pcap and pcapng input
+	compressed : Test gzip, bzip2, and xz compressed input
+	follow : Test following growing input with periodic reports
+	window : Test time windowed reports
+	approx : Test approximate heavy hitters
+	peers : Test distinct peer sketches
+	keys : Test group key parsing
+	subnets : Test prefix and subnet groups
+	flows : Test port and flow groups
+	output : Test output formats and data columns
+	bench : Test benchmark capture generator and comparison
+	stats : Test run statistics and profiling
 """
 
 # Required imports
+import bz2       # Bzip2 Module: compress()
+import gzip      # Gzip Module: compress()
+import io        # I/O Module: StringIO()
+import json      # JSON Module: loads()
+import lzma      # LZMA Module: compress()
+import ipaddress # IP Address Module: IPv4Network(), IPv6Network()
+import os        # Operating System Module: remove()
+import pstats    # Profile Statistics Module: Stats()
+import random    # Random Module: Random()
+import struct    # Structure Module: pack()
 import sys       # System Module: argv
+import tempfile  # Temporary File Module: mkstemp()
 import unittest  # Unit Test Module: TestCase
 import netSort   # Network Traffic Sorter Module: *
+import netSortBench  # Network Traffic Sorter Benchmark Module: generateCapture(), runBenchmark()
+
+# Declare Required Constants (Immutables)
+SAMPLE_CSV = (
+	'"1","0.000000","10.0.0.1","10.0.0.2","1025","80","TCP","60","SYN"\n'
+	'"2","0.100000","10.0.0.2","10.0.0.1","80","1025","TCP","60","SYN, ACK"\n'
+	'"3","0.200000","10.0.0.1","10.0.0.2","1025","80","HTTP","400","GET /"\n'
+	'"4","0.300000","10.0.0.2","10.0.0.1","80","1025","HTTP","1500","200 OK"\n'
+	'"5","0.400000","10.0.0.3","10.0.0.1","5353","53","DNS","90","Query"\n'
+	'"6","1.500000","10.0.0.1","10.0.0.3","53","5353","DNS","120","Response"\n'
+	'"7","2.600000","10.0.0.1","10.0.0.2","1025","80","TCP","54","ACK"\n'
+)
+CAPTURE_CSV = (  # Decoded fields of captureFrames()
+	'"1","0.000000","10.0.0.1","10.0.0.2","1025","80","TCP","60",""\n'
+	'"2","0.250000","10.0.0.2","10.0.0.1","80","1025","TCP","1514",""\n'
+	'"3","0.500000","10.0.0.3","10.0.0.1","5353","53","UDP","90",""\n'
+	'"4","1.000000","fe80::1","ff02::fb","5353","5353","UDP","120",""\n'
+	'"5","1.500000","00:00:00:00:00:01","ff:ff:ff:ff:ff:ff","","","ARP","42",""\n'
+)
+ALL_GROUP_MODES = (netSort.GROUP_BY_SRC_ADDR, netSort.GROUP_BY_DEST_ADDR, netSort.GROUP_BY_CONNECT, netSort.GROUP_BY_PROTO)
+ALL_SORT_MODES = (netSort.SORT_PACKETS, netSort.SORT_BYTES)
+ALL_ORDER_MODES = (netSort.ORDER_NUM_LOW, netSort.ORDER_NUM_HIGH)
 
 # Class Definitions
 
@@ -180,26 +237,2121 @@ class RawPacketExpectFailTestCase(
 		"""
 		...
 
-def main(
-		cmdArgv = None
+class RawPacketColumnsTestCase(
+		unittest.TestCase
 	) :
 	"""
-	Description: Main program control flow and logic.
-	Arguments:
-		cmdArgv : Command line arguments, expect same format as sys.argv.
-	Return:
-		...
+	Description: RawPacketColumns store and RawPacket view test cases.
 	"""
-	# Set Up Environment
-	if cmdArgv is None :
-		argv = sys.argv.copy()
-	else :
-		argv = cmdArgv
-	# Test Components
-	unittest.main()
-	...
 
-# Function Definitions
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		self.columns = netSort.RawPacketColumns()
+		for packetLine in SAMPLE_CSV.splitlines() :
+			self.columns.appendCSV(packetLine)
+
+	def testLength(
+			self
+		) :
+		"""
+		Description: Test that store length equals number of appended packets.
+		"""
+		self.assertEqual(len(self.columns), len(SAMPLE_CSV.splitlines()))
+
+	def testView(
+			self
+		) :
+		"""
+		Description: Test that RawPacket view matches RawPacket parsed from same CSV line.
+		"""
+		expected = netSort.RawPacket()
+		expected.fromCSV(SAMPLE_CSV.splitlines()[2])
+		view = self.columns[2]
+		self.assertIsInstance(view, netSort.RawPacket)
+		for attribute in ("ID", "relTime", "srcAddr", "destAddr", "proto", "bytes") :
+			self.assertEqual(getattr(view, attribute), getattr(expected, attribute))
+
+	def testIntern(
+			self
+		) :
+		"""
+		Description: Test that repeated addresses and protocols share a single string table entry.
+		"""
+		self.assertEqual(len(self.columns.strings), len(set(self.columns.strings)))
+		self.assertEqual(self.columns.srcAddr[0], self.columns.destAddr[1])
+
+	def testExtendMapped(
+			self
+		) :
+		"""
+		Description: Test that packets appended from bytes lines equal packets appended from str lines.
+		"""
+		mappedColumns = netSort.RawPacketColumns()
+		mappedColumns.extendMapped(SAMPLE_CSV.encode().splitlines())
+		for index in range(len(self.columns)) :
+			self.assertEqual(str(mappedColumns[index]), str(self.columns[index]))
+
+	def testFrame_notInteger(
+			self
+		) :
+		"""
+		Description: Test that a frame number that is not an integer is kept, by every append path, and earlier frame numbers are unchanged.
+		"""
+		packetLine = SAMPLE_CSV.splitlines()[0].replace('"1"', '"x1"', 1)
+		mappedColumns = netSort.RawPacketColumns()
+		mappedColumns.extendMapped([packetLine.encode()])
+		self.columns.appendCSV(packetLine)
+		otherColumns = netSort.RawPacketColumns()
+		otherColumns.appendCSV(SAMPLE_CSV.splitlines()[0])
+		otherColumns.extendColumns(mappedColumns)
+		for columns in (self.columns, mappedColumns, otherColumns) :
+			self.assertEqual(columns[-1].ID, "x1")
+		self.assertEqual(self.columns[0].ID, "1")
+		self.assertEqual(otherColumns[0].ID, "1")
+
+class ProcPacketsStreamTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: ProcPackets stream mode matches retained raw packet processing.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def testResults_allModes(
+			self
+		) :
+		"""
+		Description: Test that stream mode results equal raw packet results for every mode.
+		"""
+		for groupMode in ALL_GROUP_MODES :
+			for sortMode in ALL_SORT_MODES :
+				for orderMode in ALL_ORDER_MODES :
+					mode = groupMode | sortMode | orderMode
+					netSort.config["mode"] = mode
+					expected = resultTuples(netSort.ProcPackets(self.sampleFile).processPerMode(mode))
+					streamed = resultTuples(netSort.ProcPackets(self.sampleFile, stream=True).processPerMode(mode))
+					self.assertEqual(streamed, expected)
+
+	def testResults_groupNotStreamed(
+			self
+		) :
+		"""
+		Description: Test that requesting a group mode not aggregated while streaming raises ValueError.
+		"""
+		netSort.config["mode"] = netSort.GROUP_BY_SRC_ADDR
+		streamPackets = netSort.ProcPackets(self.sampleFile, stream=True)
+		with self.assertRaises(ValueError) :
+			streamPackets.processPerMode(netSort.GROUP_BY_PROTO)
+
+class ProcPacketsNumPyTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: ProcPackets NumPy engine matches pure Python processing.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	@unittest.skipIf(netSort.numpy is None, "NumPy not available")
+	def testResults_allModes(
+			self
+		) :
+		"""
+		Description: Test that NumPy engine results equal pure Python results for every mode.
+		Each engine processes its own ProcPackets without result cache, group tables kept by either engine would bypass the other.
+		"""
+		for groupMode in ALL_GROUP_MODES :
+			for sortMode in ALL_SORT_MODES :
+				for orderMode in ALL_ORDER_MODES :
+					mode = groupMode | sortMode | orderMode
+					netSort.config["numpy"] = False
+					expected = resultTuples(netSort.ProcPackets(self.sampleFile, cacheSize=0).processPerMode(mode))
+					netSort.config["numpy"] = True
+					numpyPackets = netSort.ProcPackets(self.sampleFile, cacheSize=0)
+					processNumPy = numpyPackets._ProcPackets__processNumPy
+					numpyCalls = []
+					numpyPackets._ProcPackets__processNumPy = lambda limit = None : numpyCalls.append(limit) or processNumPy(limit)
+					self.assertEqual(resultTuples(numpyPackets.processPerMode(mode)), expected)
+					self.assertEqual(len(numpyCalls), 1)
+
+	@unittest.skipIf(netSort.numpy is None, "NumPy not available")
+	def testGroupTable_reused(
+			self
+		) :
+		"""
+		Description: Test that the group table kept by the NumPy engine is only re-sorted for other sort and order modes, default group included.
+		"""
+		for groupMode in (netSort.GROUP_BY_USE_DEFAULT, netSort.GROUP_BY_SRC_ADDR) :
+			netSort.config["numpy"] = True
+			numpyPackets = netSort.ProcPackets(self.sampleFile, cacheSize=0)
+			processNumPy = numpyPackets._ProcPackets__processNumPy
+			numpyCalls = []
+			numpyPackets._ProcPackets__processNumPy = lambda limit = None : numpyCalls.append(limit) or processNumPy(limit)
+			for sortMode in ALL_SORT_MODES :
+				for orderMode in ALL_ORDER_MODES :
+					numpyPackets.processPerMode(groupMode | sortMode | orderMode)
+			self.assertEqual(len(numpyCalls), 1)
+
+	@unittest.skipIf(netSort.numpy is None, "NumPy not available")
+	def testResults_limitTies(
+			self
+		) :
+		"""
+		Description: Test that NumPy engine limited results equal pure Python results, limit cutting through groups tied on metric.
+		"""
+		packetLines = [
+			'"%d","0.0","10.0.%d.%d","10.0.0.1","1","2","TCP","%d",""' % (index, index % 3, index, 40 + 20 * (index % 4))
+			for index in range(1, 41)
+		]
+		sampleFile = writeSampleFile("\n".join(packetLines) + "\n")
+		try :
+			for sortMode in ALL_SORT_MODES :
+				for orderMode in ALL_ORDER_MODES :
+					for limit in (0, 1, 7, 10, 11, 39, 40, 41) :
+						mode = netSort.GROUP_BY_SRC_ADDR | sortMode | orderMode
+						netSort.config["numpy"] = False
+						expected = resultTuples(netSort.ProcPackets(sampleFile, cacheSize=0).processPerMode(mode, limit))
+						netSort.config["numpy"] = True
+						self.assertEqual(resultTuples(netSort.ProcPackets(sampleFile, cacheSize=0).processPerMode(mode, limit)), expected)
+		finally :
+			removeSampleFile(sampleFile)
+
+class SortProcPacketsTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: sortProcPackets ordering matches ProcPacket rich comparisons.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.procPackets = []
+		for group, count, packetBytes in (("b", 2, 10), ("a", 2, 30), ("c", 1, 30), ("d", 3, 5), ("e", 1, 10)) :
+			procPacket = netSort.ProcPacket(None)
+			procPacket.group = group
+			procPacket.count = count
+			procPacket.bytes = packetBytes
+			self.procPackets.append(procPacket)
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		netSort.configureDefaults()
+
+	def testOrder_allModes(
+			self
+		) :
+		"""
+		Description: Test that key based sorting equals rich comparison sorting and reversal for every sort and order mode.
+		"""
+		for sortMode in ALL_SORT_MODES :
+			for orderMode in ALL_ORDER_MODES :
+				netSort.config["mode"] = sortMode | orderMode
+				expected = sorted(self.procPackets)
+				if orderMode == netSort.ORDER_NUM_HIGH :
+					expected.reverse()
+				self.assertEqual(resultTuples(netSort.sortProcPackets(self.procPackets, sortMode | orderMode)), resultTuples(expected))
+
+class ProcPacketsTopTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: ProcPackets limit selection matches first groups of full results.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def testLimit_allModes(
+			self
+		) :
+		"""
+		Description: Test that limited results equal first groups of full results for every mode and engine.
+		"""
+		for stream in (False, True) :
+			for groupMode in ALL_GROUP_MODES :
+				netSort.config["mode"] = groupMode
+				packets = netSort.ProcPackets(self.sampleFile, stream=stream)
+				for sortMode in ALL_SORT_MODES :
+					for orderMode in ALL_ORDER_MODES :
+						mode = groupMode | sortMode | orderMode
+						expected = resultTuples(packets.processPerMode(mode))
+						for limit in (1, 2, 10) :
+							self.assertEqual(resultTuples(packets.processPerMode(mode, limit)), expected[:limit])
+
+	def testLimit_helper(
+			self
+		) :
+		"""
+		Description: Test that helper methods accept limit.
+		"""
+		packets = netSort.ProcPackets(self.sampleFile)
+		results = packets.sourceByBytes(netSort.ORDER_NUM_HIGH, limit=1)
+		self.assertEqual(resultTuples(results), [("10.0.0.2", 2, 1560)])
+
+class ProcPacketsParallelTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: ProcPackets parallel ingestion matches serial ingestion.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		sampleLines = SAMPLE_CSV.splitlines(keepends=True)
+		self.sampleFiles = [writeSampleFile("".join(sampleLines[:3])), writeSampleFile("".join(sampleLines[3:]))]
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		for sampleFile in self.sampleFiles :
+			removeSampleFile(sampleFile)
+		netSort.configureDefaults()
+
+	def testResults_allGroupModes(
+			self
+		) :
+		"""
+		Description: Test that parallel results equal serial results for every group mode.
+		"""
+		for groupMode in ALL_GROUP_MODES :
+			mode = groupMode | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH
+			netSort.config["mode"] = mode
+			serialPackets = netSort.ProcPackets()
+			for sampleFile in self.sampleFiles :
+				serialPackets.appendPackets(sampleFile)
+			parallelPackets = netSort.ProcPackets(stream=True)
+			parallelPackets.appendPacketsParallel(self.sampleFiles, jobs=2)
+			self.assertEqual(resultTuples(parallelPackets.processPerMode(mode)), resultTuples(serialPackets.processPerMode(mode)))
+
+	def testParallel_requiresStream(
+			self
+		) :
+		"""
+		Description: Test that parallel ingestion without stream mode raises ValueError.
+		"""
+		with self.assertRaises(ValueError) :
+			netSort.ProcPackets().appendPacketsParallel(self.sampleFiles, jobs=2)
+
+class ByteRangeTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: splitFileRanges and ranged mapPacketLines cover every packet line exactly once.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+
+	def testRanges_lineAligned(
+			self
+		) :
+		"""
+		Description: Test that ranges are contiguous, cover the file, and start on line boundaries.
+		"""
+		with open(self.sampleFile, mode="rb") as sampleFile :
+			content = sampleFile.read()
+		for chunks in (1, 2, 3, 5, 100) :
+			ranges = netSort.splitFileRanges(self.sampleFile, chunks)
+			self.assertEqual(ranges[0][0], 0)
+			self.assertEqual(ranges[-1][1], len(content))
+			for (start, end), (nextStart, nextEnd) in zip(ranges, ranges[1:]) :
+				self.assertEqual(end, nextStart)
+				self.assertEqual(content[nextStart-1:nextStart], b"\n")
+
+	def testRanges_header(
+			self
+		) :
+		"""
+		Description: Test that ranged lines equal whole file lines, header skipped only once.
+		"""
+		for format, skip in ((netSort.IN_FORMAT_CSV_NO_HEADER, 0), (netSort.IN_FORMAT_CSV_HEADER, 1)) :
+			lines = []
+			for start, end in netSort.splitFileRanges(self.sampleFile, 3) :
+				lines.extend(netSort.mapPacketLines(self.sampleFile, format, start, end))
+			self.assertEqual(lines, SAMPLE_CSV.encode().splitlines()[skip:])
+
+class ProjectionTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Column projection parses only fields needed per mode.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def testNeededFields(
+			self
+		) :
+		"""
+		Description: Test that needed fields follow group, sort, and output data modes.
+		"""
+		self.assertEqual(netSort.neededFields(netSort.GROUP_BY_PROTO | netSort.SORT_PACKETS), (netSort.SPLTcsv.protocol.value,))
+		self.assertEqual(netSort.neededFields(netSort.GROUP_BY_PROTO | netSort.SORT_BYTES), (netSort.SPLTcsv.protocol.value, netSort.SPLTcsv.length.value))
+		self.assertEqual(netSort.neededFields(netSort.GROUP_BY_CONNECT | netSort.OUT_DATA_BYTES), (netSort.SPLTcsv.srcAddr.value, netSort.SPLTcsv.destAddr.value, netSort.SPLTcsv.length.value))
+
+	def testFromCSV_mode(
+			self
+		) :
+		"""
+		Description: Test that RawPacket populated per mode has only needed fields.
+		"""
+		packet = netSort.RawPacket()
+		packet.fromCSV(SAMPLE_CSV.splitlines()[0], netSort.GROUP_BY_PROTO | netSort.SORT_PACKETS)
+		self.assertEqual(packet.proto, "TCP")
+		self.assertIsNone(packet.srcAddr)
+		self.assertEqual(packet.bytes, 0)
+
+	def testStream_projected(
+			self
+		) :
+		"""
+		Description: Test that projected stream mode counts packets and refuses bytes it did not aggregate, also from cached results.
+		"""
+		mode = netSort.GROUP_BY_PROTO | netSort.SORT_PACKETS
+		netSort.config["mode"] = mode
+		netSort.config["snapshot"] = False  # Snapshot would provide bytes
+		expected = netSort.ProcPackets(self.sampleFile).processPerMode(mode)
+		projectedPackets = netSort.ProcPackets(self.sampleFile, stream=True, project=True)
+		projected = projectedPackets.processPerMode(mode)
+		self.assertEqual([(procPacket.group, procPacket.count) for procPacket in projected], [(procPacket.group, procPacket.count) for procPacket in expected])
+		with self.assertRaises(ValueError) :
+			projectedPackets.processPerMode(netSort.GROUP_BY_PROTO | netSort.SORT_BYTES)
+		netSort.config["mode"] = mode | netSort.OUT_DATA_BYTES  # Cached results of mode have no bytes
+		with self.assertRaises(ValueError) :
+			projectedPackets.processPerMode()
+
+class ProcPacketsAllGroupsTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: ProcPackets processAllGroups matches processPerMode per group mode.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def testResults_allModes(
+			self
+		) :
+		"""
+		Description: Test that every group mode from a single pass equals separate processing, retained and streamed.
+		"""
+		netSort.config["mode"] = netSort.GROUP_BY_ALL
+		streamPackets = netSort.ProcPackets(self.sampleFile, stream=True)
+		storePackets = netSort.ProcPackets(self.sampleFile)
+		for sortMode in ALL_SORT_MODES :
+			for orderMode in ALL_ORDER_MODES :
+				allStreamResults = streamPackets.processAllGroups(sortMode | orderMode)
+				allStoreResults = storePackets.processAllGroups(sortMode | orderMode)
+				for groupMode in ALL_GROUP_MODES :
+					expected = resultTuples(netSort.ProcPackets(self.sampleFile).processPerMode(groupMode | sortMode | orderMode))
+					self.assertEqual(resultTuples(allStreamResults[groupMode]), expected)
+					self.assertEqual(resultTuples(allStoreResults[groupMode]), expected)
+
+	def testProcessPerMode_all(
+			self
+		) :
+		"""
+		Description: Test that processPerMode refuses GROUP_BY_ALL.
+		"""
+		with self.assertRaises(ValueError) :
+			netSort.ProcPackets(self.sampleFile).processPerMode(netSort.GROUP_BY_ALL)
+
+	def testOutput_sections(
+			self
+		) :
+		"""
+		Description: Test that group comment lines precede sections in TSV output, CSV and JSON lines rows name their group mode instead, CSV under one header row.
+		"""
+		groupNames = ["src", "dest", "connect", "proto"]
+		for outFormat in (netSort.OUT_FORMAT_TSV_HUMAN, netSort.OUT_FORMAT_TSV_SIMPLE, netSort.OUT_FORMAT_CSV, netSort.OUT_FORMAT_JSON_LINES) :
+			netSort.config["mode"] = netSort.GROUP_BY_ALL | outFormat
+			output = io.StringIO()
+			self.assertTrue( netSort.outputReport(netSort.ProcPackets(self.sampleFile), output) )
+			outputLines = output.getvalue().splitlines()
+			if outFormat in (netSort.OUT_FORMAT_TSV_HUMAN, netSort.OUT_FORMAT_TSV_SIMPLE) :
+				self.assertEqual([line for line in outputLines if line.startswith("#")], ["# group " + groupName for groupName in groupNames])
+				continue
+			self.assertNotIn("#", output.getvalue())
+			self.assertNotIn("", outputLines)
+			if outFormat == netSort.OUT_FORMAT_CSV :
+				self.assertEqual(outputLines[0], "mode,group,packets")
+				rowModes = [line.split(",", 1)[0] for line in outputLines[1:]]
+			else :
+				rowModes = [json.loads(line)["mode"] for line in outputLines]
+			self.assertEqual(sorted(set(rowModes), key=groupNames.index), groupNames)
+			self.assertEqual(rowModes, sorted(rowModes, key=groupNames.index))
+
+class ProcPacketsCacheTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: ProcPackets result cache serves repeated modes and is invalidated on append and clear.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+		self.mode = netSort.GROUP_BY_SRC_ADDR | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def testCache_hit(
+			self
+		) :
+		"""
+		Description: Test that processing a cached mode again returns the cached ProcPacket objects.
+		"""
+		packets = netSort.ProcPackets(self.sampleFile)
+		first = packets.processPerMode(self.mode)
+		packets.processPerMode(netSort.GROUP_BY_PROTO)
+		second = packets.processPerMode(self.mode)
+		self.assertEqual(resultTuples(second), resultTuples(first))
+		self.assertIs(second[0], first[0])
+		self.assertEqual(resultTuples(packets.recallResults(self.mode)), resultTuples(first))
+
+	def testCache_invalidate(
+			self
+		) :
+		"""
+		Description: Test that appending packets and clearing invalidate cached results.
+		"""
+		for stream in (False, True) :
+			netSort.config["mode"] = self.mode
+			packets = netSort.ProcPackets(self.sampleFile, stream=stream)
+			first = packets.processPerMode(self.mode)
+			packets.appendPackets(self.sampleFile)
+			self.assertIsNone(packets.recallResults(self.mode))
+			second = packets.processPerMode(self.mode)
+			self.assertEqual([procPacket.count for procPacket in second], [2 * procPacket.count for procPacket in first])
+			packets.clear()
+			self.assertIsNone(packets.recallResults(self.mode))
+			self.assertEqual(packets.processPerMode(self.mode), [])
+
+	def testCache_evict(
+			self
+		) :
+		"""
+		Description: Test that the least recently used results are evicted beyond cache size.
+		"""
+		packets = netSort.ProcPackets(self.sampleFile, cacheSize=2)
+		packets.processPerMode(self.mode)
+		packets.processPerMode(netSort.GROUP_BY_PROTO)
+		packets.processPerMode(netSort.GROUP_BY_DEST_ADDR)
+		self.assertIsNone(packets.recallResults(self.mode))
+		self.assertIsNotNone(packets.recallResults(netSort.GROUP_BY_PROTO))
+
+class ProcPacketsIncrementalTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: ProcPackets results after append equal results of processing all packets at once.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		sampleLines = SAMPLE_CSV.splitlines(keepends=True)
+		self.sampleFiles = [writeSampleFile("".join(sampleLines[:4])), writeSampleFile("".join(sampleLines[4:]))]
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		for sampleFile in self.sampleFiles :
+			removeSampleFile(sampleFile)
+		netSort.configureDefaults()
+
+	def testResults_allModes(
+			self
+		) :
+		"""
+		Description: Test that re-sorting after append equals processing from scratch for every mode, retained and streamed.
+		"""
+		for stream in (False, True) :
+			for groupMode in ALL_GROUP_MODES :
+				for sortMode in ALL_SORT_MODES :
+					for orderMode in ALL_ORDER_MODES :
+						mode = groupMode | sortMode | orderMode
+						netSort.config["mode"] = mode
+						appended = netSort.ProcPackets(self.sampleFiles[0], stream=stream)
+						appended.processPerMode(mode)
+						appended.appendPackets(self.sampleFiles[1])
+						expected = netSort.ProcPackets(self.sampleFiles[0], stream=stream)
+						expected.appendPackets(self.sampleFiles[1])
+						self.assertEqual(resultTuples(appended.processPerMode(mode)), resultTuples(expected.processPerMode(mode)))
+						self.assertEqual(resultTuples(appended.processPerMode(mode, 2)), resultTuples(expected.processPerMode(mode))[:2])
+
+class SnapshotTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Snapshot sidecars are written on first parse, loaded when valid, and ignored when stale.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+		self.mode = netSort.GROUP_BY_CONNECT | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def testSnapshot_roundTrip(
+			self
+		) :
+		"""
+		Description: Test that first parse writes a snapshot which loads to the same packets.
+		"""
+		expected = netSort.ProcPackets(self.sampleFile)
+		self.assertTrue(os.path.exists(netSort.snapshotName(self.sampleFile)))
+		snapshot = netSort.readSnapshot(self.sampleFile)
+		self.assertIsNotNone(snapshot)
+		self.assertEqual([str(packet) for packet in netSort.ProcPackets(self.sampleFile).recallRawPackets()], [str(packet) for packet in expected.recallRawPackets()])
+		for stream in (False, True) :
+			netSort.config["mode"] = self.mode
+			self.assertEqual(resultTuples(netSort.ProcPackets(self.sampleFile, stream=stream).processPerMode(self.mode)), resultTuples(expected.processPerMode(self.mode)))
+
+	def testSnapshot_stale(
+			self
+		) :
+		"""
+		Description: Test that a snapshot is ignored after its input file changes.
+		"""
+		netSort.ProcPackets(self.sampleFile)
+		with open(self.sampleFile, mode="at") as sampleFile :
+			sampleFile.write(SAMPLE_CSV.splitlines(keepends=True)[0])
+		self.assertIsNone(netSort.readSnapshot(self.sampleFile))
+		self.assertEqual(len(netSort.ProcPackets(self.sampleFile).recallRawPackets()), len(SAMPLE_CSV.splitlines()) + 1)
+
+	def testSnapshot_build(
+			self
+		) :
+		"""
+		Description: Test that the 'snapshot' command line flag only writes snapshots.
+		"""
+		netSort.main(["netSort", "snapshot", self.sampleFile])
+		self.assertIsNotNone(netSort.readSnapshot(self.sampleFile))
+
+class CaptureInputTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Packet capture input decodes to the same groups as equivalent CSV input.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		netSort.config["snapshot"] = False
+		self.csvFile = writeSampleFile(CAPTURE_CSV)
+		self.pcapFile = writeSampleFile(pcapBytes(captureFrames()))
+		self.pcapngFile = writeSampleFile(pcapngBytes(captureFrames()))
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		for fileName in (self.csvFile, self.pcapFile, self.pcapngFile) :
+			removeSampleFile(fileName)
+		netSort.configureDefaults()
+
+	def testCapture_detect(
+			self
+		) :
+		"""
+		Description: Test that capture formats are detected by magic bytes.
+		"""
+		self.assertEqual(netSort.detectFormat(self.pcapFile), netSort.IN_FORMAT_PCAP)
+		self.assertEqual(netSort.detectFormat(self.pcapngFile), netSort.IN_FORMAT_PCAPNG)
+		self.assertEqual(netSort.detectFormat(self.csvFile), netSort.IN_FORMAT_USE_DEFAULT)
+
+	def testCapture_records(
+			self
+		) :
+		"""
+		Description: Test that decoded records match the CSV fields.
+		"""
+		expected = [tuple(line.replace('"', "").split(",")[:8]) for line in CAPTURE_CSV.splitlines()]
+		for fileName, formatIn in ((self.pcapFile, netSort.IN_FORMAT_PCAP), (self.pcapngFile, netSort.IN_FORMAT_PCAPNG)) :
+			records = [(str(frame), "%.6f" % relTime, srcAddr, destAddr, srcPort, destPort, proto, str(length)) for frame, relTime, srcAddr, destAddr, srcPort, destPort, proto, length in netSort.readPacketRecords(fileName, formatIn)]
+			self.assertEqual(records, expected)
+
+	def testCapture_results(
+			self
+		) :
+		"""
+		Description: Test that every mode returns the same results for capture and CSV input, stored and streamed.
+		"""
+		for modeGroup in ALL_GROUP_MODES :
+			for modeSort in ALL_SORT_MODES :
+				for modeOrder in ALL_ORDER_MODES :
+					mode = modeGroup | modeSort | modeOrder
+					netSort.config["mode"] = mode
+					expected = resultTuples(netSort.ProcPackets(self.csvFile).processPerMode(mode))
+					for fileName in (self.pcapFile, self.pcapngFile) :
+						for stream in (False, True) :
+							self.assertEqual(resultTuples(netSort.ProcPackets(fileName, stream=stream).processPerMode(mode)), expected)
+
+	def testCapture_parallel(
+			self
+		) :
+		"""
+		Description: Test that parallel ingestion aggregates capture files whole.
+		"""
+		mode = netSort.GROUP_BY_ALL | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = mode
+		expected = netSort.ProcPackets(self.csvFile).processAllGroups(mode)
+		procPackets = netSort.ProcPackets(stream=True)
+		procPackets.appendPacketsParallel([self.pcapFile, self.pcapngFile], jobs=2)
+		for modeGroup, results in procPackets.processAllGroups(mode).items() :
+			self.assertEqual([(group, count // 2, packetBytes // 2) for group, count, packetBytes in resultTuples(results)], resultTuples(expected[modeGroup]))
+
+	def testCapture_commandLine(
+			self
+		) :
+		"""
+		Description: Test the 'input' command line sub-command.
+		"""
+		netSort.processCommandLine(["netSort", "input", "pcapng", self.pcapngFile])
+		self.assertEqual(netSort.config["mode"] & netSort.IN_FORMAT_MASK, netSort.IN_FORMAT_PCAPNG)
+		with self.assertRaises(SystemExit) :
+			netSort.processCommandLine(["netSort", "input", "xml", self.pcapngFile])
+
+class CompressedInputTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Compressed inputs are detected by magic bytes and read as their decompressed content.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+		self.compressedFiles = [writeSampleFile(compression.compress(SAMPLE_CSV.encode())) for compression in (gzip, bz2, lzma)]
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		for fileName in [self.sampleFile] + self.compressedFiles :
+			removeSampleFile(fileName)
+		netSort.configureDefaults()
+
+	def testCompressed_detect(
+			self
+		) :
+		"""
+		Description: Test that each compression is detected, plain files are not.
+		"""
+		self.assertEqual([netSort.compressionOf(fileName) for fileName in self.compressedFiles], [gzip, bz2, lzma])
+		self.assertIsNone(netSort.compressionOf(self.sampleFile))
+
+	def testCompressed_results(
+			self
+		) :
+		"""
+		Description: Test that compressed input returns the same results stored, streamed, and in parallel.
+		"""
+		mode = netSort.GROUP_BY_CONNECT | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = mode
+		expected = resultTuples(netSort.ProcPackets(self.sampleFile).processPerMode(mode))
+		for fileName in self.compressedFiles :
+			for stream in (False, True) :
+				self.assertEqual(resultTuples(netSort.ProcPackets(fileName, stream=stream).processPerMode(mode)), expected)
+			procPackets = netSort.ProcPackets(stream=True)
+			procPackets.appendPacketsParallel([fileName], jobs=2)
+			self.assertEqual(resultTuples(procPackets.processPerMode(mode)), expected)
+
+	def testCompressed_capture(
+			self
+		) :
+		"""
+		Description: Test that compressed captures are detected and decoded.
+		"""
+		captureFile = writeSampleFile(gzip.compress(pcapngBytes(captureFrames())))
+		try :
+			self.assertEqual(netSort.detectFormat(captureFile), netSort.IN_FORMAT_PCAPNG)
+			self.assertEqual(len(netSort.ProcPackets(captureFile).recallRawPackets()), len(CAPTURE_CSV.splitlines()))
+		finally :
+			removeSampleFile(captureFile)
+
+class FollowTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Followed input is aggregated as it arrives and reported periodically.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+		self.mode = netSort.GROUP_BY_CONNECT | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def testFollow_growingFile(
+			self
+		) :
+		"""
+		Description: Test that lines appended to a followed file are generated after idle polls.
+		"""
+		sampleLines = SAMPLE_CSV.encode().splitlines()
+		packetChunks = netSort.followPacketLines(self.sampleFile)
+		try :
+			self.assertEqual(next(packetChunks), sampleLines)
+			self.assertEqual(next(packetChunks), [])
+			with open(self.sampleFile, mode="ab") as sampleFile :
+				sampleFile.write(sampleLines[0] + b"\n" + sampleLines[1])
+			self.assertEqual(next(packetChunks), [sampleLines[0]])
+			with open(self.sampleFile, mode="ab") as sampleFile :
+				sampleFile.write(b"\n")
+			self.assertEqual(next(packetChunks), [sampleLines[1]])
+		finally :
+			packetChunks.close()
+
+	def testFollow_appendPacketLines(
+			self
+		) :
+		"""
+		Description: Test that appended packet lines update results stored and streamed.
+		"""
+		netSort.config["mode"] = self.mode
+		expected = resultTuples(netSort.ProcPackets(self.sampleFile).processPerMode(self.mode))
+		for stream in (False, True) :
+			procPackets = netSort.ProcPackets(stream=stream)
+			for packetLine in SAMPLE_CSV.encode().splitlines() :
+				procPackets.appendPacketLines([packetLine])
+				procPackets.processPerMode(self.mode)
+			self.assertEqual(resultTuples(procPackets.processPerMode(self.mode)), expected)
+
+	def testFollow_stdinReports(
+			self
+		) :
+		"""
+		Description: Test that standard input is reported every batch and at its end.
+		"""
+		netSort.config["mode"] = self.mode
+		expected = io.StringIO()
+		netSort.outputResults(netSort.ProcPackets(self.sampleFile).processPerMode(self.mode), expected)
+		output = io.StringIO()
+		saveStdin = sys.stdin
+		try :
+			with open(self.sampleFile, mode="rt") as sys.stdin :
+				netSort.followReports("-", batch=3, output=output)
+		finally :
+			sys.stdin = saveStdin
+		reports = output.getvalue().split("\n\n")
+		self.assertEqual([report.splitlines()[0] for report in reports], ["# report 1, 3 packets", "# report 2, 6 packets", "# report 3, 7 packets"])
+		self.assertEqual(reports[-1].split("\n", 1)[1], expected.getvalue())
+
+	def testFollow_csvReports(
+			self
+		) :
+		"""
+		Description: Test that CSV rows name their report instead of comment lines, under one header row.
+		"""
+		netSort.config["mode"] = self.mode | netSort.OUT_FORMAT_CSV
+		output = io.StringIO()
+		saveStdin = sys.stdin
+		try :
+			with open(self.sampleFile, mode="rt") as sys.stdin :
+				netSort.followReports("-", batch=3, output=output)
+		finally :
+			sys.stdin = saveStdin
+		outputLines = output.getvalue().splitlines()
+		self.assertEqual(outputLines[0], "report,group,bytes")
+		self.assertEqual(sorted({line.split(",", 1)[0] for line in outputLines[1:]}), ["1", "2", "3"])
+		self.assertNotIn("report,group,bytes", outputLines[1:])
+
+	def testFollow_approx(
+			self
+		) :
+		"""
+		Description: Test that followed groups are approximate per 'approx', and 'approx' with 'window' is a usage error.
+		"""
+		netSort.config["mode"] = self.mode
+		netSort.config["approx"] = 0.5
+		output = io.StringIO()
+		saveStdin = sys.stdin
+		try :
+			with open(self.sampleFile, mode="rt") as sys.stdin :
+				netSort.followReports("-", output=output)
+		finally :
+			sys.stdin = saveStdin
+		reportLines = output.getvalue().splitlines()
+		self.assertEqual(reportLines[0], "# report 1, 7 packets")
+		for reportLine in reportLines[1:] :
+			self.assertEqual(len(reportLine.split("\t")), 3)  # Group, bytes, error
+		netSort.configureDefaults()
+		with self.assertRaises(SystemExit) :
+			netSort.processCommandLine(["netSort", "approx", "0.1", "window", "10"])
+
+class WindowReportsTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Time windows on relTime report the packets of each window as it closes.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.mode = netSort.GROUP_BY_SRC_ADDR | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = self.mode
+		self.sampleLines = SAMPLE_CSV.encode().splitlines()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		netSort.configureDefaults()
+
+	def windowTuples(
+			self
+			, windows
+		) :
+		"""
+		Description: Convert windows to comparable list of (start, end, results) tuples.
+		"""
+		return [(windowStart, windowEnd, resultTuples(procPackets.processPerMode(self.mode))) for windowStart, windowEnd, procPackets in windows]
+
+	def linesTuples(
+			self
+			, packetLines
+		) :
+		"""
+		Description: Results of packet lines as a single report.
+		"""
+		procPackets = netSort.ProcPackets(stream=True)
+		procPackets.appendPacketLines(packetLines)
+		return resultTuples(procPackets.processPerMode(self.mode))
+
+	def testWindow_tumbling(
+			self
+		) :
+		"""
+		Description: Test that tumbling windows partition packets and skip empty windows.
+		"""
+		self.assertEqual(self.windowTuples(netSort.windowReports(self.sampleLines, 1.0)), [
+			(0.0, 1.0, self.linesTuples(self.sampleLines[0:5]))
+			, (1.0, 2.0, self.linesTuples(self.sampleLines[5:6]))
+			, (2.0, 3.0, self.linesTuples(self.sampleLines[6:7]))
+		])
+
+	def testWindow_sliding(
+			self
+		) :
+		"""
+		Description: Test that sliding windows overlap by their panes.
+		"""
+		self.assertEqual(self.windowTuples(netSort.windowReports(self.sampleLines, 2.0, 1.0)), [
+			(0.0, 2.0, self.linesTuples(self.sampleLines[0:6]))
+			, (1.0, 3.0, self.linesTuples(self.sampleLines[5:7]))
+			, (2.0, 4.0, self.linesTuples(self.sampleLines[6:7]))
+		])
+
+	def testWindow_closesWhileStreaming(
+			self
+		) :
+		"""
+		Description: Test that a window is generated before later packets are read.
+		"""
+		readLines = []
+		def packetLines(
+			) :
+			"""
+			Description: Generate sample lines, recording each line read.
+			"""
+			for packetLine in self.sampleLines :
+				readLines.append(packetLine)
+				yield packetLine
+		windows = netSort.windowReports(packetLines(), 1.0)
+		next(windows)
+		self.assertEqual(len(readLines), 6)
+
+	def testWindow_commandLine(
+			self
+		) :
+		"""
+		Description: Test the 'window' and 'slide' command line sub-commands.
+		"""
+		netSort.processCommandLine(["netSort", "window", "10", "slide", "2.5"])
+		self.assertEqual((netSort.config["window"], netSort.config["slide"]), (10.0, 2.5))
+		for argv in (["netSort", "window", "0"], ["netSort", "slide", "1"], ["netSort", "window", "10", "slide", "3"]) :
+			with self.assertRaises(SystemExit) :
+				netSort.processCommandLine(argv)
+
+	def testWindow_jsonRows(
+			self
+		) :
+		"""
+		Description: Test that JSON lines rows carry the start and end of their window instead of comment lines.
+		"""
+		netSort.config["mode"] = self.mode | netSort.OUT_FORMAT_JSON_LINES
+		output = io.StringIO()
+		netSort.outputWindows(netSort.windowReports(self.sampleLines, 1.0), output)
+		rows = [json.loads(line) for line in output.getvalue().splitlines()]
+		expected = [(windowStart, windowEnd, group) for windowStart, windowEnd, results in self.windowTuples(netSort.windowReports(self.sampleLines, 1.0)) for group, count, packetBytes in results]
+		self.assertEqual([(row["start"], row["end"], row["group"]) for row in rows], expected)
+
+class ProcPacketsApproxTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Approximate stream mode finds heavy hitter groups in fixed memory within its error bound.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.mode = netSort.GROUP_BY_SRC_ADDR | netSort.SORT_PACKETS | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = self.mode
+		# Three heavy sources among many single packet sources
+		self.packetLines = []
+		for i in range(3000) :
+			if i % 4 == 0 :
+				srcAddr = "10.0.0." + str(i % 3)
+			else :
+				srcAddr = "172.16." + str(i // 256) + "." + str(i % 256)
+			self.packetLines.append( ('"%d","0.0","%s","10.1.1.1","1","2","UDP","100",""' % (i + 1, srcAddr)).encode() )
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		netSort.configureDefaults()
+
+	def testApprox_heavyHitters(
+			self
+		) :
+		"""
+		Description: Test that heavy hitters are found with counts within the error bound, in batches smaller than the input.
+		"""
+		exact = netSort.ProcPackets(stream=True)
+		exact.appendPacketLines(self.packetLines)
+		exactCounts = {group : count for group, count, packetBytes in resultTuples(exact.processPerMode(self.mode))}
+		approx = netSort.ProcPackets(stream=True, approx=0.05)
+		for start in range(0, len(self.packetLines), 100) :
+			approx.appendPacketLines(self.packetLines[start:start+100])
+		results = approx.processPerMode(self.mode)
+		self.assertLessEqual(len(results), 20)
+		self.assertEqual(sorted(procPacket.group for procPacket in results[:3]), ["10.0.0.0", "10.0.0.1", "10.0.0.2"])
+		for procPacket in results :
+			self.assertLessEqual(procPacket.error, 0.05 * len(self.packetLines))
+			self.assertGreaterEqual(procPacket.count, exactCounts[procPacket.group])
+			self.assertLessEqual(procPacket.count - procPacket.error, exactCounts[procPacket.group])
+
+	def testApprox_exactWhileSmall(
+			self
+		) :
+		"""
+		Description: Test that a summary which never dropped groups is exact.
+		"""
+		approx = netSort.ProcPackets(stream=True, approx=0.1)
+		approx.appendPacketLines(SAMPLE_CSV.encode().splitlines())
+		exact = netSort.ProcPackets(stream=True)
+		exact.appendPacketLines(SAMPLE_CSV.encode().splitlines())
+		self.assertEqual(resultTuples(approx.processPerMode(self.mode)), resultTuples(exact.processPerMode(self.mode)))
+		self.assertEqual({procPacket.error for procPacket in approx.processPerMode(self.mode)}, {0})
+
+	def testApprox_misuse(
+			self
+		) :
+		"""
+		Description: Test that approximation requires stream mode and results sorted as ranked.
+		"""
+		with self.assertRaises(ValueError) :
+			netSort.ProcPackets(approx=0.1)
+		approx = netSort.ProcPackets(stream=True, approx=0.1)
+		approx.appendPacketLines(self.packetLines)
+		with self.assertRaises(ValueError) :
+			approx.processPerMode(netSort.GROUP_BY_SRC_ADDR | netSort.SORT_BYTES | netSort.ORDER_NUM_HIGH)
+
+	def testApprox_output(
+			self
+		) :
+		"""
+		Description: Test that approximate results are output with an error column.
+		"""
+		approx = netSort.ProcPackets(stream=True, approx=0.05)
+		approx.appendPacketLines(self.packetLines)
+		output = io.StringIO()
+		netSort.outputResults(approx.processPerMode(self.mode, 1), output)
+		group, count, error = output.getvalue().rstrip("\n").split("\t")
+		self.assertTrue(group.startswith("10.0.0."))
+		self.assertGreaterEqual(int(count), 250)
+		self.assertLessEqual(int(error), 150)
+
+class HyperLogLogTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: HyperLogLog sketches estimate distinct values in fixed memory and merge as unions.
+	"""
+
+	def testHyperLogLog_estimate(
+			self
+		) :
+		"""
+		Description: Test estimates of small and large cardinalities and fixed register size.
+		"""
+		sketch = netSort.HyperLogLog()
+		for value in ("a", "b", "c", "a", "b") :
+			sketch.add(value)
+		self.assertEqual(sketch.count(), 3)
+		for i in range(20000) :
+			sketch.add("10.0." + str(i // 256) + "." + str(i % 256))
+		self.assertLess(abs(sketch.count() - 20003) / 20003, 0.1)
+		self.assertEqual(len(sketch.registers), netSort.HLL_REGISTERS)
+
+	def testHyperLogLog_merge(
+			self
+		) :
+		"""
+		Description: Test that merged sketches equal the sketch of the union, sparse or dense.
+		"""
+		for size in (3, 3000) :
+			first = netSort.HyperLogLog()
+			second = netSort.HyperLogLog()
+			union = netSort.HyperLogLog()
+			for i in range(size) :
+				first.add("first" + str(i))
+				second.add("second" + str(i))
+				union.add("first" + str(i))
+				union.add("second" + str(i))
+			first.merge(second)
+			self.assertEqual(first.registers, union.registers)
+
+class ProcPacketsPeersTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Distinct peers per group are sorted and output like packets and bytes, stored, streamed, or in parallel.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def peerTuples(
+			self
+			, results
+		) :
+		"""
+		Description: Convert list of ProcPacket to comparable list of (group, peers) tuples.
+		"""
+		return [(procPacket.group, procPacket.peers) for procPacket in results]
+
+	def testPeers_exactForFewPeers(
+			self
+		) :
+		"""
+		Description: Test distinct peers of each group mode against exact sets, for every engine.
+		"""
+		expected = {
+			netSort.GROUP_BY_SRC_ADDR : [("10.0.0.2", 1), ("10.0.0.3", 1), ("10.0.0.1", 2)]
+			, netSort.GROUP_BY_DEST_ADDR : [("10.0.0.2", 1), ("10.0.0.3", 1), ("10.0.0.1", 2)]
+			, netSort.GROUP_BY_PROTO : [("DNS", 2), ("HTTP", 2), ("TCP", 2)]
+		}
+		for modeGroup, expectedPeers in expected.items() :
+			mode = modeGroup | netSort.SORT_PEERS | netSort.ORDER_NUM_LOW
+			netSort.config["mode"] = mode
+			self.assertEqual(self.peerTuples(netSort.ProcPackets(self.sampleFile).processPerMode(mode)), expectedPeers)
+			self.assertEqual(self.peerTuples(netSort.ProcPackets(self.sampleFile, stream=True).processPerMode(mode)), expectedPeers)
+			procPackets = netSort.ProcPackets(stream=True)
+			procPackets.appendPacketsParallel([self.sampleFile, self.sampleFile], jobs=2)
+			self.assertEqual(self.peerTuples(procPackets.processPerMode(mode)), expectedPeers)
+
+	def testPeers_append(
+			self
+		) :
+		"""
+		Description: Test that peers stay current when packets are appended after processing.
+		"""
+		mode = netSort.GROUP_BY_DEST_ADDR | netSort.SORT_PEERS | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = mode
+		for stream in (False, True) :
+			procPackets = netSort.ProcPackets(stream=stream)
+			procPackets.appendPacketLines(SAMPLE_CSV.encode().splitlines())
+			procPackets.processPerMode(mode)
+			procPackets.appendPacketLines([b'"8","3.0","10.0.0.9","10.0.0.2","1","2","UDP","60",""'])
+			self.assertEqual(self.peerTuples(procPackets.processPerMode(mode))[0], ("10.0.0.2", 2))
+
+	def testPeers_cachedWithout(
+			self
+		) :
+		"""
+		Description: Test that results cached or retained without peers are not served once peers are output.
+		"""
+		mode = netSort.GROUP_BY_SRC_ADDR | netSort.SORT_PACKETS | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = mode | netSort.OUT_DATA_PEERS
+		expected = self.peerTuples(netSort.ProcPackets(self.sampleFile).processPerMode())
+		for append in (False, True) :
+			netSort.config["mode"] = mode
+			procPackets = netSort.ProcPackets(self.sampleFile)
+			procPackets.processPerMode()
+			if append :  # Retained as stale results
+				procPackets.appendPacketLines([])
+			netSort.config["mode"] |= netSort.OUT_DATA_PEERS
+			self.assertEqual(self.peerTuples(procPackets.processPerMode()), expected)
+			self.assertIsNotNone( procPackets.recallResults(mode | netSort.OUT_DATA_PEERS) )
+
+	def testPeers_output(
+			self
+		) :
+		"""
+		Description: Test that sorting per peers outputs peers, and connect groups have none.
+		"""
+		mode = netSort.GROUP_BY_SRC_ADDR | netSort.SORT_PEERS | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = mode
+		output = io.StringIO()
+		netSort.outputResults(netSort.ProcPackets(self.sampleFile).processPerMode(mode, 1), output)
+		self.assertEqual(output.getvalue(), "10.0.0.1\t2\n")
+		with self.assertRaises(ValueError) :
+			netSort.ProcPackets(self.sampleFile).processPerMode(netSort.GROUP_BY_CONNECT | netSort.SORT_PEERS)
+		with self.assertRaises(SystemExit) :
+			netSort.processCommandLine(["netSort", "group", "connect", "sort", "peers"])
+
+	def testPeers_unsupportedModes(
+			self
+		) :
+		"""
+		Description: Test that peers with time windows, and sorting approximate groups per peers, are usage errors.
+		"""
+		for argv in (["netSort", "window", "10", "sort", "peers"], ["netSort", "window", "10", "data", "peers"], ["netSort", "approx", "0.1", "sort", "peers"]) :
+			netSort.configureDefaults()
+			with self.assertRaises(SystemExit) :
+				netSort.processCommandLine(argv)
+		netSort.configureDefaults()
+		netSort.processCommandLine(["netSort", "approx", "0.1", "data", "peers"])
+		self.assertTrue(netSort.config["mode"] & netSort.OUT_DATA_PEERS)
+
+class AddressKeysTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Group keys are parsed from raw fields and rendered once per group.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		netSort.configureDefaults()
+
+	def testKeys_quotedAndUnquoted(
+			self
+		) :
+		"""
+		Description: Test that quoted and unquoted fields of a group fold into one group, per group mode and single pass.
+		"""
+		packetLines = [b'"1","0.0","10.0.0.1","10.0.0.2","1","2","TCP","60",""', b'2,0.1,10.0.0.1,10.0.0.2,1,2,TCP,40,']
+		for modeGroup in ALL_GROUP_MODES :
+			self.assertEqual(len(netSort.aggregateMappedLines(packetLines, modeGroup)), 1)
+			self.assertEqual(list(netSort.aggregateMappedLines(packetLines, modeGroup).values()), [[2, 100]])
+		for aggregate in netSort.aggregateAllLines(packetLines, binary=True).values() :
+			self.assertEqual(list(aggregate.values()), [[2, 100]])
+		self.assertEqual(list(netSort.aggregateMappedLines(packetLines, netSort.GROUP_BY_CONNECT)), ["10.0.0.1 -> 10.0.0.2"])
+
+class SubnetGroupsTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Prefix and subnet groups roll up address groups, subnets matched by longest prefix.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+		self.subnetsFile = writeSampleFile("10.0.0.2/32 two\n# comment\n\n10.0.0.0/31\n")
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		removeSampleFile(self.subnetsFile)
+		netSort.configureDefaults()
+
+	def testSubnets_longestPrefixMatch(
+			self
+		) :
+		"""
+		Description: Test trie matches against brute force longest prefix match over random networks of both IP versions.
+		"""
+		randomness = random.Random(21)
+		networks = {}
+		for networkNumber in range(400) :
+			version = randomness.choice( (4, 6) )
+			addressBits = 32 if version == 4 else 128
+			prefixLength = randomness.randint(0, addressBits)
+			addressValue = randomness.getrandbits(addressBits) & ~((1 << (addressBits - prefixLength)) - 1)
+			networks[ipaddress.IPv4Network( (addressValue, prefixLength) ) if version == 4 else ipaddress.IPv6Network( (addressValue, prefixLength) )] = "net" + str(networkNumber)
+		subnets = netSort.PrefixTrie()
+		for network, label in networks.items() :
+			subnets.insert(network, label)
+		self.assertEqual(len(subnets), len(networks))
+		for network in list(networks)[:200] :
+			for address in (network.network_address, network.broadcast_address) :
+				containing = [candidate for candidate in networks if (candidate.version == address.version) and (address in candidate)]
+				expected = networks[max(containing, key=lambda candidate : candidate.prefixlen)]
+				self.assertEqual(subnets.match(address), expected)
+		self.assertIsNone(netSort.PrefixTrie().match(ipaddress.ip_address("10.0.0.1")))
+
+	def testSubnets_prefixGroups(
+			self
+		) :
+		"""
+		Description: Test prefix groups of stored, streamed, and parallel packets, and that cached results follow prefix length.
+		"""
+		mode = netSort.GROUP_BY_SRC_PREFIX | netSort.SORT_PACKETS | netSort.ORDER_NUM_LOW
+		netSort.config["mode"] = mode
+		netSort.config["prefix"] = (31, 64)
+		expected = [("10.0.0.2/31", 3, 1650), ("10.0.0.0/31", 4, 634)]
+		parallelPackets = netSort.ProcPackets(stream=True)
+		parallelPackets.appendPacketsParallel([self.sampleFile], jobs=2)
+		for procPackets in (netSort.ProcPackets(self.sampleFile), netSort.ProcPackets(self.sampleFile, stream=True), parallelPackets) :
+			netSort.config["prefix"] = (31, 64)
+			self.assertEqual(resultTuples(procPackets.processPerMode(mode)), expected)
+			netSort.config["prefix"] = (24, 64)
+			self.assertEqual(resultTuples(procPackets.processPerMode(mode)), [("10.0.0.0/24", 7, 2284)])
+		netSort.config["prefix"] = (64, 64)
+		self.assertEqual(netSort.rollupLabel(netSort.GROUP_BY_DEST_PREFIX, "fe80::1:2"), "fe80::/64")
+		self.assertEqual(netSort.rollupLabel(netSort.GROUP_BY_DEST_PREFIX, "00:00:00:00:00:01"), "00:00:00:00:00:01")
+
+	def testSubnets_subnetGroups(
+			self
+		) :
+		"""
+		Description: Test subnet groups read from file, stored and streamed, with peers merged per subnet.
+		"""
+		filenames = netSort.processCommandLine(["netSort", "group", "dest-subnet", self.subnetsFile, "order", "high", self.sampleFile])
+		self.assertEqual(filenames, [self.sampleFile])
+		mode = netSort.config["mode"]
+		self.assertEqual(mode & netSort.GROUP_BY_MASK, netSort.GROUP_BY_DEST_SUBNET)
+		expected = [("two", 3, 514), ("10.0.0.0/31", 3, 1650), (netSort.SUBNET_UNMATCHED, 1, 120)]
+		for stream in (False, True) :
+			procPackets = netSort.ProcPackets(self.sampleFile, stream=stream)
+			self.assertEqual(resultTuples(procPackets.processPerMode(mode)), expected)
+		peersMode = netSort.GROUP_BY_SRC_SUBNET | netSort.SORT_PEERS | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = peersMode
+		results = netSort.ProcPackets(self.sampleFile).processPerMode(peersMode)
+		self.assertEqual([(procPacket.group, procPacket.peers) for procPacket in results], [("10.0.0.0/31", 2), (netSort.SUBNET_UNMATCHED, 1), ("two", 1)])
+
+	def testSubnets_commandLine(
+			self
+		) :
+		"""
+		Description: Test prefix and subnet group sub-commands, and their improper usage.
+		"""
+		self.assertEqual(netSort.processCommandLine(["netSort", "group", "src-prefix", "24/48", "sort", "bytes", "file"]), ["file"])
+		self.assertEqual(netSort.config["prefix"], (24, 48))
+		self.assertEqual(netSort.config["mode"] & (netSort.GROUP_BY_MASK | netSort.SORT_MASK), netSort.GROUP_BY_SRC_PREFIX | netSort.SORT_BYTES)
+		netSort.processCommandLine(["netSort", "group", "dest-prefix", "48"])
+		self.assertEqual(netSort.config["prefix"], (32, 48))
+		for argv in (["group", "src-prefix"], ["group", "src-prefix", "33/64"], ["group", "dest-prefix", "x"], ["group", "subnet", self.subnetsFile + ".missing"]) :
+			with self.assertRaises(SystemExit) :
+				netSort.processCommandLine(["netSort"] + argv)
+		for groupArgv in (["src-prefix", "24"], ["dest-prefix", "24"], ["subnet", self.subnetsFile], ["dest-subnet", self.subnetsFile]) :
+			netSort.configureDefaults()
+			with self.assertRaises(SystemExit) :
+				netSort.processCommandLine(["netSort", "approx", "0.1", "group"] + groupArgv)
+		badSubnetsFile = writeSampleFile("10.0.0.0/33 bad\n")
+		try :
+			with self.assertRaises(ValueError) :
+				netSort.readSubnets(badSubnetsFile)
+		finally :
+			removeSampleFile(badSubnetsFile)
+
+class FlowGroupsTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Port and flow groups are the same for every engine and input format, bidirectional flows fold both directions.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.sampleFile = writeSampleFile()
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		netSort.configureDefaults()
+
+	def engineResults(
+			self
+			, mode
+		) :
+		"""
+		Description: Return results of mode per engine, stored with and without NumPy, streamed, parallel, and from snapshot.
+		"""
+		netSort.config["mode"] = mode
+		results = []
+		for numpyEngine in (False, True) :
+			netSort.config["numpy"] = numpyEngine
+			results.append( resultTuples(netSort.ProcPackets(self.sampleFile).processPerMode(mode)) )  # Second parse loads snapshot
+		results.append( resultTuples(netSort.ProcPackets(self.sampleFile, stream=True).processPerMode(mode)) )
+		procPackets = netSort.ProcPackets(stream=True)
+		procPackets.appendPacketsParallel([self.sampleFile], jobs=2)
+		results.append( resultTuples(procPackets.processPerMode(mode)) )
+		return results
+
+	def testFlows_renderFlow(
+			self
+		) :
+		"""
+		Description: Test flow rendering of IPv4, IPv6, and portless flows, and bidirectional canonical order.
+		"""
+		self.assertEqual(netSort.renderFlow( ("10.0.0.1", "10.0.0.2", "1025", "80", "TCP") ), "10.0.0.1:1025 -> 10.0.0.2:80 TCP")
+		self.assertEqual(netSort.renderFlow( ("fe80::1", "ff02::fb", "5353", "5353", "UDP") ), "[fe80::1]:5353 -> [ff02::fb]:5353 UDP")
+		self.assertEqual(netSort.renderFlow( ("00:00:00:00:00:01", "ff:ff:ff:ff:ff:ff", "", "", "ARP") ), "00:00:00:00:00:01 -> ff:ff:ff:ff:ff:ff ARP")
+		self.assertEqual(netSort.renderFlow( ("10.0.0.2", "10.0.0.1", "80", "1025", "TCP"), True ), "10.0.0.1:1025 <-> 10.0.0.2:80 TCP")
+		self.assertEqual(netSort.renderFlow( ("10.0.0.1", "10.0.0.2", "1025", "80", "TCP"), True ), "10.0.0.1:1025 <-> 10.0.0.2:80 TCP")
+		self.assertEqual(netSort.renderFlow( ("00:00:00:00:00:01", "ff:ff:ff:ff:ff:ff", "1", "2", "LLC") ), "00:00:00:00:00:01:1 -> ff:ff:ff:ff:ff:ff:2 LLC")
+
+	def testFlows_tableKeys(
+			self
+		) :
+		"""
+		Description: Test that flow tables are keyed by field tuples sharing strings, both directions of a bidirectional flow keyed alike.
+		"""
+		packetLines = ['"1","0.0","10.0.0.1","10.0.0.2","1025","80","TCP","60",""', '"2","0.1","10.0.0.2","10.0.0.1","80","1025","TCP","40",""']
+		flowTable = netSort.aggregateLines(packetLines, netSort.GROUP_BY_FLOW)
+		self.assertEqual(list(flowTable), [("10.0.0.1", "10.0.0.2", "1025", "80", "TCP"), ("10.0.0.2", "10.0.0.1", "80", "1025", "TCP")])
+		first, second = flowTable
+		self.assertIs(first[0], second[1])
+		self.assertIs(first[4], second[4])
+		for biflowTable in (netSort.aggregateLines(packetLines, netSort.GROUP_BY_BIFLOW), netSort.aggregateMappedLines([line.encode() for line in packetLines], netSort.GROUP_BY_BIFLOW)) :
+			self.assertEqual(biflowTable, {("10.0.0.1", "10.0.0.2", "1025", "80", "TCP") : [2, 100]})
+		self.assertEqual(netSort.renderGroup(netSort.GROUP_BY_BIFLOW, *biflowTable), "10.0.0.1:1025 <-> 10.0.0.2:80 TCP")
+
+	def testFlows_groups(
+			self
+		) :
+		"""
+		Description: Test port, flow, and bidirectional flow groups against expected groups, for every engine.
+		"""
+		expected = {
+			netSort.GROUP_BY_DEST_PORT : [("53", 1, 90), ("5353", 1, 120), ("80", 3, 514), ("1025", 2, 1560)]
+			, netSort.GROUP_BY_SRC_PORT : [("5353", 1, 90), ("53", 1, 120), ("1025", 3, 514), ("80", 2, 1560)]
+			, netSort.GROUP_BY_FLOW : [
+				("10.0.0.2:80 -> 10.0.0.1:1025 TCP", 1, 60), ("10.0.0.3:5353 -> 10.0.0.1:53 DNS", 1, 90), ("10.0.0.1:1025 -> 10.0.0.2:80 TCP", 2, 114)
+				, ("10.0.0.1:53 -> 10.0.0.3:5353 DNS", 1, 120), ("10.0.0.1:1025 -> 10.0.0.2:80 HTTP", 1, 400), ("10.0.0.2:80 -> 10.0.0.1:1025 HTTP", 1, 1500)
+			]
+			, netSort.GROUP_BY_BIFLOW : [("10.0.0.1:1025 <-> 10.0.0.2:80 TCP", 3, 174), ("10.0.0.1:53 <-> 10.0.0.3:5353 DNS", 2, 210), ("10.0.0.1:1025 <-> 10.0.0.2:80 HTTP", 2, 1900)]
+		}
+		for modeGroup, expectedResults in expected.items() :
+			for results in self.engineResults(modeGroup | netSort.SORT_BYTES | netSort.ORDER_NUM_LOW) :
+				self.assertEqual(results, expectedResults)
+
+	def testFlows_capture(
+			self
+		) :
+		"""
+		Description: Test that flow groups of packet capture input match equivalent CSV input.
+		"""
+		csvFile = writeSampleFile(CAPTURE_CSV)
+		pcapFile = writeSampleFile(pcapBytes(captureFrames()))
+		try :
+			for modeGroup in (netSort.GROUP_BY_FLOW, netSort.GROUP_BY_BIFLOW, netSort.GROUP_BY_SRC_PORT) :
+				mode = modeGroup | netSort.SORT_PACKETS | netSort.ORDER_NUM_HIGH
+				netSort.config["mode"] = mode
+				expected = resultTuples(netSort.ProcPackets(csvFile).processPerMode(mode))
+				self.assertEqual(resultTuples(netSort.ProcPackets(pcapFile, stream=True).processPerMode(mode)), expected)
+				self.assertEqual(resultTuples(netSort.ProcPackets(pcapFile).processPerMode(mode)), expected)
+			self.assertIn( ("[fe80::1]:5353 -> [ff02::fb]:5353 UDP", 1, 120), resultTuples(netSort.ProcPackets(pcapFile).processPerMode(netSort.GROUP_BY_FLOW)) )
+		finally :
+			removeSampleFile(csvFile)
+			removeSampleFile(pcapFile)
+
+	def testFlows_peersAndCommandLine(
+			self
+		) :
+		"""
+		Description: Test peers of port groups, and port and flow group sub-commands.
+		"""
+		mode = netSort.GROUP_BY_DEST_PORT | netSort.SORT_PEERS | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = mode
+		results = netSort.ProcPackets(self.sampleFile).processPerMode(mode, 1)
+		self.assertEqual([(procPacket.group, procPacket.peers) for procPacket in results], [("80", 1)])
+		for groupStr, modeGroup in (("srcport", netSort.GROUP_BY_SRC_PORT), ("destport", netSort.GROUP_BY_DEST_PORT), ("flow", netSort.GROUP_BY_FLOW), ("biflow", netSort.GROUP_BY_BIFLOW)) :
+			netSort.configureDefaults()
+			netSort.processCommandLine(["netSort", "group", groupStr])
+			self.assertEqual(netSort.config["mode"] & netSort.GROUP_BY_MASK, modeGroup)
+		with self.assertRaises(SystemExit) :
+			netSort.processCommandLine(["netSort", "group", "flow", "sort", "peers"])
+
+class OutputWriterTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Results are output in batches per output format, with the output data columns requested.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		self.results = []
+		for group, count, packetBytes in (("10.0.0.1", 4, 634), ('odd, "quoted"\tgroup', 1, 90)) :
+			procPacket = netSort.ProcPacket(None)
+			procPacket.group = group
+			procPacket.count = count
+			procPacket.bytes = packetBytes
+			self.results.append(procPacket)
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		netSort.configureDefaults()
+
+	def output(
+			self
+			, mode
+			, results = None
+		) :
+		"""
+		Description: Return output of results, or test case results if None, per mode.
+		"""
+		output = io.StringIO()
+		netSort.outputResults(self.results if results is None else results, output, mode)
+		return output.getvalue()
+
+	def testOutput_formats(
+			self
+		) :
+		"""
+		Description: Test each output format of packets and bytes together.
+		"""
+		dataMode = netSort.OUT_DATA_PACKETS | netSort.OUT_DATA_BYTES
+		self.assertEqual(self.output(netSort.SORT_BYTES), "10.0.0.1\t634\nodd, \"quoted\"\tgroup\t90\n")
+		self.assertEqual(self.output(dataMode | netSort.OUT_FORMAT_TSV_HUMAN), "10.0.0.1\t4\t634\nodd, \"quoted\"\tgroup\t1\t90\n")
+		self.assertEqual(self.output(dataMode | netSort.OUT_FORMAT_TSV_SIMPLE).splitlines()[0], "group\tpackets\tbytes")
+		self.assertEqual(self.output(dataMode | netSort.OUT_FORMAT_CSV), 'group,packets,bytes\n10.0.0.1,4,634\n"odd, ""quoted""\tgroup",1,90\n')
+		jsonLines = [json.loads(jsonLine) for jsonLine in self.output(dataMode | netSort.OUT_FORMAT_JSON_LINES).splitlines()]
+		self.assertEqual(jsonLines, [{"group" : "10.0.0.1", "packets" : 4, "bytes" : 634}, {"group" : 'odd, "quoted"\tgroup', "packets" : 1, "bytes" : 90}])
+
+	def testOutput_trackSortAndErrors(
+			self
+		) :
+		"""
+		Description: Test that tracking the sort adds its column once, and approximate errors are the last column.
+		"""
+		self.assertEqual(self.output(netSort.SORT_BYTES | netSort.OUT_DATA_TRACK_SORT | netSort.OUT_DATA_PACKETS | netSort.OUT_FORMAT_TSV_SIMPLE).splitlines()[0], "group\tpackets\tbytes")
+		self.assertEqual(self.output(netSort.SORT_PACKETS | netSort.OUT_DATA_TRACK_SORT | netSort.OUT_DATA_PACKETS | netSort.OUT_FORMAT_TSV_SIMPLE).splitlines()[0], "group\tpackets")
+		for procPacket in self.results :
+			procPacket.error = 2
+		self.assertEqual(self.output(netSort.SORT_PACKETS | netSort.OUT_FORMAT_CSV).splitlines()[:2], ["group,packets,error", "10.0.0.1,4,2"])
+		self.assertEqual(json.loads(self.output(netSort.SORT_PACKETS | netSort.OUT_FORMAT_JSON_LINES).splitlines()[0]), {"group" : "10.0.0.1", "packets" : 4, "error" : 2})
+
+	def testOutput_batches(
+			self
+		) :
+		"""
+		Description: Test that output spanning several batches has one header and every row in order.
+		"""
+		results = []
+		for index in range(netSort.OUTPUT_BATCH_ROWS * 2 + 1) :
+			procPacket = netSort.ProcPacket(None)
+			procPacket.group = str(index)
+			procPacket.count = index
+			results.append(procPacket)
+		batches = list( netSort.renderResults(results, netSort.SORT_PACKETS | netSort.OUT_FORMAT_CSV) )
+		self.assertEqual(len(batches), 3)
+		outputLines = "".join(batches).splitlines()
+		self.assertEqual(outputLines[0], "group,packets")
+		self.assertEqual(outputLines[1:], [str(index) + "," + str(index) for index in range(len(results))])
+
+	def testOutput_commandLine(
+			self
+		) :
+		"""
+		Description: Test output and data sub-commands, and their improper usage.
+		"""
+		netSort.processCommandLine(["netSort", "output", "json", "data", "sort,bytes,peers"])
+		self.assertEqual(netSort.config["mode"] & netSort.OUT_FORMAT_MASK, netSort.OUT_FORMAT_JSON_LINES)
+		self.assertEqual(netSort.config["mode"] & netSort.OUT_DATA_MASK, netSort.OUT_DATA_TRACK_SORT | netSort.OUT_DATA_BYTES | netSort.OUT_DATA_PEERS)
+		self.assertTrue( netSort.needsPeers(netSort.config["mode"]) )
+		for argv in (["output", "xml"], ["data", "packets,flows"], ["data"], ["group", "connect", "data", "peers"]) :
+			netSort.configureDefaults()
+			with self.assertRaises(SystemExit) :
+				netSort.processCommandLine(["netSort"] + argv)
+
+	def testOutput_dataBits(
+			self
+		) :
+		"""
+		Description: Test that output data flags have bits of their own, within OUT_DATA_MASK and outside every other mode field.
+		"""
+		dataFlags = (netSort.OUT_DATA_TRACK_SORT, netSort.OUT_DATA_PACKETS, netSort.OUT_DATA_BYTES, netSort.OUT_DATA_EXTEND_01, netSort.OUT_DATA_PEERS)
+		self.assertEqual(len(set(dataFlags)), len(dataFlags))
+		for dataFlag in dataFlags :
+			self.assertEqual(bin(dataFlag).count("1"), 1)
+			self.assertEqual(dataFlag & netSort.OUT_DATA_MASK, dataFlag)
+			for mask in (netSort.GROUP_BY_MASK, netSort.SORT_MASK, netSort.ORDER_MASK, netSort.IN_FORMAT_MASK, netSort.OUT_FORMAT_MASK) :
+				self.assertEqual(dataFlag & mask, 0)
+
+class BenchmarkTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Benchmark captures are deterministic and shaped per arguments, results compare per stage.
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		netSortBench.configureDefaults()
+		self.captureFile = writeSampleFile("")
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.captureFile)
+		netSort.configureDefaults()
+		netSortBench.configureDefaults()
+
+	def testBench_generateCapture(
+			self
+		) :
+		"""
+		Description: Test that captures repeat per seed, have the requested packets and groups, and skew concentrates packets.
+		"""
+		netSortBench.generateCapture(self.captureFile, 5000, 50, 1.5, 7)
+		with open(self.captureFile) as captureFile :
+			capture = captureFile.read()
+		netSortBench.generateCapture(self.captureFile, 5000, 50, 1.5, 7)
+		with open(self.captureFile) as captureFile :
+			self.assertEqual(captureFile.read(), capture)
+		mode = netSort.GROUP_BY_SRC_ADDR | netSort.SORT_PACKETS | netSort.ORDER_NUM_HIGH
+		netSort.config["mode"] = mode
+		results = netSort.ProcPackets(self.captureFile).processPerMode(mode)
+		self.assertEqual(sum(procPacket.count for procPacket in results), 5000)
+		self.assertLessEqual(len(results), 50)
+		self.assertGreater(results[0].count, 5000 // 50 * 5)  # Uniform would be 100 per group
+		netSortBench.generateCapture(self.captureFile, 5000, 50, 0, 7)
+		results = netSort.ProcPackets(self.captureFile).processPerMode(mode)
+		self.assertLess(results[0].count, 5000 // 50 * 2)
+
+	def testBench_runAndCompare(
+			self
+		) :
+		"""
+		Description: Test that every stage is timed, and comparison flags only stages slower than threshold.
+		"""
+		netSortBench.processCommandLine(["netSortBench", "count", "2000", "groups", "20", "group", "dest", "sort", "packets", "top", "5"])
+		self.assertEqual(netSortBench.config["packets"], 2000)
+		self.assertEqual(netSortBench.config["netSortArgv"], ["group", "dest", "sort", "packets", "top", "5"])
+		self.assertEqual(netSort.config["limit"], 5)
+		netSortBench.generateCapture(self.captureFile, netSortBench.config["packets"], netSortBench.config["groups"])
+		results = netSortBench.runBenchmark(self.captureFile)
+		self.assertEqual(set(results["stages"]), set(netSortBench.STAGES + ("total",)))
+		self.assertLessEqual(results["groups"], 20)
+		slower = json.loads( json.dumps(results) )
+		slower["stages"]["sort"]["seconds"] = results["stages"]["sort"]["seconds"] * 2 + 1
+		comparison = {stage : regressed for stage, baselineSeconds, seconds, change, regressed in netSortBench.compareResults(results, slower, 10.0)}
+		self.assertTrue(comparison["sort"])
+		self.assertFalse(comparison["parse"])
+		with self.assertRaises(SystemExit) :
+			netSortBench.processCommandLine(["netSortBench", "count", "0"])
+		with self.assertRaises(SystemExit) :
+			netSortBench.processCommandLine(["netSortBench", "capture.csv"])
+
+class RunStatsTestCase(
+		unittest.TestCase
+	) :
+	"""
+	Description: Run statistics are recorded per stage only when requested, and written with the profile by main().
+	"""
+
+	def setUp(
+			self
+		) :
+		"""
+		Description: Common test case setup.
+		"""
+		netSort.configureDefaults()
+		netSort.config["snapshot"] = False
+		self.sampleFile = writeSampleFile()
+		self.outputFiles = []
+
+	def tearDown(
+			self
+		) :
+		"""
+		Description: Common test case clean up.
+		"""
+		removeSampleFile(self.sampleFile)
+		for outputFile in self.outputFiles :
+			os.remove(outputFile)
+		netSort.configureDefaults()
+
+	def testStats_stages(
+			self
+		) :
+		"""
+		Description: Test that lines, packets, groups, and stage times are recorded, and nothing without stats.
+		"""
+		self.assertIsNone(netSort.ProcPackets(self.sampleFile).recallStats())
+		netSort.config["numpy"] = False
+		stats = netSort.RunStats()
+		procPackets = netSort.ProcPackets(self.sampleFile, stats=stats)
+		self.assertIs(procPackets.recallStats(), stats)
+		results = procPackets.processPerMode(netSort.GROUP_BY_CONNECT | netSort.SORT_BYTES)
+		netSort.outputReport(procPackets, io.StringIO())
+		statistics = stats.toDict()
+		self.assertEqual(statistics["lines"], len(SAMPLE_CSV.splitlines()))
+		self.assertEqual(statistics["packets"], len(SAMPLE_CSV.splitlines()))
+		self.assertEqual(statistics["groups"], len(results))  # Second processing served from cache
+		for stage in netSort.STATS_STAGES :
+			self.assertGreater(statistics[stage + "Seconds"], 0)
+
+	def testStats_packets(
+			self
+		) :
+		"""
+		Description: Test that packets are counted once parsed by every ingest path, snapshot packets are not lines.
+		"""
+		packets = len(SAMPLE_CSV.splitlines())
+		for options in ({}, {"stream" : True}, {"stream" : True, "approx" : 0.1}) :
+			for mode in (netSort.GROUP_BY_SRC_ADDR, netSort.GROUP_BY_ALL, netSort.GROUP_BY_DEST_ADDR | netSort.OUT_DATA_PEERS) :
+				netSort.config["mode"] = mode
+				stats = netSort.RunStats()
+				netSort.ProcPackets(self.sampleFile, stats=stats, **options)
+				self.assertEqual((stats.lines, stats.packets), (packets, packets))
+		netSort.config["mode"] = netSort.GROUP_BY_SRC_ADDR
+		stats = netSort.RunStats()
+		netSort.ProcPackets(stream=True, stats=stats).appendPacketsParallel([self.sampleFile, self.sampleFile], jobs=2)
+		self.assertEqual((stats.lines, stats.packets), (2 * packets, 2 * packets))
+		netSort.config["snapshot"] = True
+		netSort.ProcPackets(self.sampleFile)
+		stats = netSort.RunStats()
+		netSort.ProcPackets(self.sampleFile, stats=stats)
+		self.assertEqual((stats.lines, stats.packets), (0, packets))
+		netSort.config["snapshot"] = False
+
+	def testStats_malformed(
+			self
+		) :
+		"""
+		Description: Test that malformed lines are counted and skipped by every ingest path while recording, and abort parsing otherwise.
+		"""
+		packets = len(SAMPLE_CSV.splitlines())
+		netSort.config["snapshot"] = False
+		badLines = ['"8","2.700000","10.0.0.1","10.0.0.2","1025","80","TCP"', '"9","soon","10.0.0.1","10.0.0.2","1025","80","TCP","60",""', '"10","2.9","10.0.0.1","10.0.0.2","1025","80","TCP","many",""']
+		expected = resultTuples(netSort.ProcPackets(self.sampleFile).processPerMode(netSort.GROUP_BY_SRC_ADDR | netSort.SORT_BYTES))
+		with open(self.sampleFile, mode="at") as sampleFile :
+			sampleFile.write("\n".join(badLines) + "\n")
+		for mode in (netSort.GROUP_BY_SRC_ADDR | netSort.SORT_BYTES, netSort.GROUP_BY_ALL | netSort.SORT_BYTES, netSort.GROUP_BY_DEST_ADDR | netSort.OUT_DATA_PEERS | netSort.SORT_BYTES) :
+			netSort.config["mode"] = mode
+			for options in ({}, {"stream" : True}, {"jobs" : 2}) :
+				stats = netSort.RunStats()
+				if "jobs" in options :
+					procPackets = netSort.ProcPackets(stream=True, stats=stats)
+					procPackets.appendPacketsParallel([self.sampleFile], jobs=options["jobs"])
+				else :
+					procPackets = netSort.ProcPackets(self.sampleFile, stats=stats, **options)
+				self.assertEqual((stats.lines, stats.malformedLines, stats.packets), (packets, len(badLines), packets))
+				if mode == netSort.GROUP_BY_SRC_ADDR | netSort.SORT_BYTES :
+					self.assertEqual(resultTuples(procPackets.processPerMode()), expected)
+		stats = netSort.RunStats()
+		procPackets = netSort.ProcPackets(stats=stats)
+		procPackets.appendPacketLines([line.encode() for line in badLines])
+		self.assertEqual((stats.packets, stats.malformedLines), (0, len(badLines)))
+		for options in ({}, {"stream" : True}) :
+			with self.assertRaises((ValueError, IndexError)) :
+				netSort.ProcPackets(self.sampleFile, **options)
+
+	def testStats_main(
+			self
+		) :
+		"""
+		Description: Test that 'stats' writes statistics as JSON and 'profile' writes a readable profile.
+		"""
+		for suffix in (".json", ".prof") :
+			fileDescriptor, fileName = tempfile.mkstemp(suffix=suffix)
+			os.close(fileDescriptor)
+			self.outputFiles.append(fileName)
+		statsFile, profileFile = self.outputFiles
+		netSort.main(["netSort", "stats", statsFile, "profile", profileFile, "snapshot", self.sampleFile])
+		with open(statsFile) as statsJSON :
+			statistics = json.load(statsJSON)
+		self.assertEqual(set(statistics), {stage + "Seconds" for stage in netSort.STATS_STAGES + ("total",)} | {"lines", "malformedLines", "packets", "groups", "peakMemoryBytes"})
+		self.assertGreater(statistics["totalSeconds"], 0)
+		profiledFunctions = [function for filename, line, function in pstats.Stats(profileFile).stats]
+		self.assertIn("writeSnapshot", profiledFunctions)
+		with self.assertRaises(SystemExit) :
+			netSort.processCommandLine(["netSort", "stats"])
+
+def main(
+		cmdArgv = None
+	) :
+	"""
+	Description: Main program control flow and logic.
+	Arguments:
+		cmdArgv : Command line arguments, expect same format as sys.argv.
+	Return:
+		...
+	"""
+	# Set Up Environment
+	if cmdArgv is None :
+		argv = sys.argv.copy()
+	else :
+		argv = cmdArgv
+	# Test Components
+	unittest.main()
+	...
+
+# Function Definitions
+
+def captureFrames(
+	) :
+	"""
+	Description: Build Ethernet frames of CAPTURE_CSV packets.
+	Return:
+		[list] : List of (timestamp, frame bytes, original length) tuples.
+	"""
+	def ethernet(
+			dest
+			, src
+			, etherType
+		) :
+		return dest + src + struct.pack(">H", etherType)
+	def ipv4(
+			src
+			, dest
+			, protocol
+		) :
+		return struct.pack(">BBHHHBBH4s4s", 0x45, 0, 0, 0, 0, 64, protocol, 0, bytes(src), bytes(dest))
+	macA = bytes.fromhex("000000000001")
+	macB = bytes.fromhex("000000000002")
+	broadcast = b"\xff" * 6
+	frames = []
+	frames.append( (1000.0, ethernet(macB, macA, 0x0800) + ipv4((10, 0, 0, 1), (10, 0, 0, 2), 6) + struct.pack(">HH", 1025, 80) + bytes(16), 60) )
+	frames.append( (1000.25, ethernet(macA, macB, 0x0800) + ipv4((10, 0, 0, 2), (10, 0, 0, 1), 6) + struct.pack(">HH", 80, 1025) + bytes(16), 1514) )  # Truncated capture
+	vlanTag = struct.pack(">HH", 0x8100, 7)
+	frames.append( (1000.5, macA + macB + vlanTag + struct.pack(">H", 0x0800) + ipv4((10, 0, 0, 3), (10, 0, 0, 1), 17) + struct.pack(">HHHH", 5353, 53, 8, 0), 90) )
+	ipv6 = struct.pack(">IHBB", 0x60000000, 16, 0, 64) + bytes.fromhex("fe800000000000000000000000000001") + bytes.fromhex("ff0200000000000000000000000000fb")
+	hopByHop = struct.pack(">BB6x", 17, 0)
+	frames.append( (1001.0, ethernet(macB, macA, 0x86dd) + ipv6 + hopByHop + struct.pack(">HHHH", 5353, 5353, 8, 0), 120) )
+	frames.append( (1001.5, ethernet(broadcast, macA, 0x0806) + bytes(28), 42) )
+	return frames
+
+def pcapBytes(
+		frames
+	) :
+	"""
+	Description: Encode frames as little endian microsecond pcap file.
+	Arguments:
+		frames : List of (timestamp, frame bytes, original length) tuples
+	Return:
+		[bytes] : pcap file content.
+	"""
+	content = struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)
+	for timestamp, frame, length in frames :
+		content += struct.pack("<IIII", int(timestamp), round((timestamp % 1) * 1000000), len(frame), length) + frame
+	return content
+
+def pcapngBytes(
+		frames
+	) :
+	"""
+	Description: Encode frames as big endian nanosecond pcapng file.
+	Arguments:
+		frames : List of (timestamp, frame bytes, original length) tuples
+	Return:
+		[bytes] : pcapng file content.
+	"""
+	def block(
+			blockType
+			, body
+		) :
+		body += bytes(-len(body) % 4)
+		return struct.pack(">II", blockType, len(body) + 12) + body + struct.pack(">I", len(body) + 12)
+	content = block(0x0a0d0d0a, struct.pack(">IHHq", 0x1a2b3c4d, 1, 0, -1))
+	content += block(1, struct.pack(">HHI", 1, 0, 0) + struct.pack(">HHB3x", 9, 1, 9) + struct.pack(">HH", 0, 0))
+	for timestamp, frame, length in frames :
+		units = round(timestamp * 1000000000)
+		content += block(6, struct.pack(">IIIII", 0, units >> 32, units & 0xffffffff, len(frame), length) + frame)
+	return content
+
+def resultTuples(
+		results
+	) :
+	"""
+	Description: Convert list of ProcPacket to comparable list of tuples.
+	Arguments:
+		results : List of ProcPacket objects
+	Return:
+		[list] : List of (group, count, bytes) tuples in result order.
+	"""
+	return [(procPacket.group, procPacket.count, procPacket.bytes) for procPacket in results]
+
+def removeSampleFile(
+		fileName
+	) :
+	"""
+	Description: Remove temporary sample file and its snapshot sidecar, if any.
+	Arguments:
+		fileName : Name of temporary file
+	"""
+	os.remove(fileName)
+	if os.path.exists(netSort.snapshotName(fileName)) :
+		os.remove(netSort.snapshotName(fileName))
+
+def writeSampleFile(
+		content = SAMPLE_CSV
+	) :
+	"""
+	Description: Write sample packet metadata to a new temporary file.
+	Arguments:
+		content : File content, bytes are written as binary capture
+	Return:
+		[str] : Name of temporary file, caller removes with removeSampleFile().
+	"""
+	if isinstance(content, bytes) :
+		fileDescriptor, fileName = tempfile.mkstemp(suffix=".pcap")
+		fileMode = "wb"
+	else :
+		fileDescriptor, fileName = tempfile.mkstemp(suffix=".csv")
+		fileMode = "wt"
+	with os.fdopen(fileDescriptor, fileMode) as sampleFile :
+		sampleFile.write(content)
+	return fileName
 
 if __name__ == "__main__" :  # Called as standalone program
 	main()